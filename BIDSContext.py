@@ -0,0 +1,295 @@
+"""
+Dataset-level facts shared by every path of a BIDS dataset.
+
+A ``BIDSContext`` is created once per BIDS root and referenced by
+the ``BIDSPath`` objects of that dataset. It computes the dataset's
+roots, name, description, '.bidsignore' patterns, participants table
+and sidecar metadata
+on first access, instead of walking up each path's parents
+for every path on every access.
+
+"""
+
+import json
+import os
+import warnings
+import weakref
+from types import MappingProxyType
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Text, Tuple, Union
+
+import pandas as pd
+
+from .constants.bidspathlib_docs import BVE_MESSAGE, DD_FILE
+from .DatasetWatcher import register_invalidator
+from .functions.BIDSFileFunctions import GetSidecar
+from .functions.BIDSPathCoreFunctions import split_components
+from .functions.BIDSPathFunctions import (
+    BidsignoreMatcher, GetBidsignore, GitAttributesMatcher
+)
+from .general_methods import GitIgnoreMatcher
+
+__path__ = [os.path.join('..', '__init__.py')]
+
+# Maps each visited directory within a dataset to its BIDS root
+# (directories outside datasets are not memoized, as one may be created)
+_ROOTS: Dict = {}
+
+# Contexts referenced by at least one path, keyed by BIDS root
+_CONTEXTS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def _bids_root(directory: Text) -> Optional[Text]:
+    """
+    Returns the nearest directory containing a 'dataset_description.json'.
+
+    Looks from ``directory`` up to the file system's root.
+    Each visited directory is memoized once a root is found,
+    so paths sharing ancestors are only walked up once.
+    """
+    walked, root = [], None
+    while directory not in _ROOTS:
+        walked.append(directory)
+        if os.path.isfile(os.path.join(directory, DD_FILE)):
+            root = directory
+            break
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    else:
+        root = _ROOTS[directory]
+    if root is not None:
+        _ROOTS.update(dict.fromkeys(walked, root))
+    return root
+
+
+class BIDSContext:
+    """
+    Facts about a BIDS dataset, shared by the paths it contains.
+
+    Contexts are weakly registered by BIDS root: one exists per
+    dataset as long as a path references it.
+    Values are computed on first access and cached until
+    ``invalidate`` is called, which happens automatically when a
+    ``DatasetWatcher`` reports a change to the files they are read from.
+
+    Args:
+        root: str
+            Absolute path of the dataset's BIDS root.
+
+    Example:
+        >>> context = BIDSContext.for_path('/data/ds/sub-01/anat')
+        >>> context.bids_root
+        PosixPath('/data/ds')
+    """
+    __slots__ = ('root', '_cache', '__weakref__')
+
+    def __init__(self, root: Text):
+        self.root, self._cache = root, {}
+
+    def __repr__(self) -> Text:
+        return f"{type(self).__name__}({self.root})"
+
+    @classmethod
+    def for_path(cls, src: Union[Text, PathLike]):
+        """
+        Returns the context of the dataset containing ``src``, if any.
+
+        """
+        src = os.path.abspath(os.fspath(src))
+        if src in _ROOTS:
+            root = _ROOTS[src]
+        else:
+            root = src if os.path.isfile(os.path.join(src, DD_FILE)) \
+                else _bids_root(os.path.dirname(src))
+        if root is None:
+            return None
+        context = _CONTEXTS.get(root)
+        if context is None:
+            context = _CONTEXTS.setdefault(root, cls(root))
+        return context
+
+    def invalidate(self, *names: Text) -> None:
+        """
+        Drops cached values ``names`` (all by default).
+
+        """
+        for name in names or tuple(self._cache):
+            self._cache.pop(name, None)
+
+    def _cached(self, name: Text, func):
+        try:
+            return self._cache[name]
+        except KeyError:
+            return self._cache.setdefault(name, func())
+
+    @property
+    def bids_root(self) -> PathLike:
+        """
+        The dataset's top-level directory.
+
+        Derivatives datasets being BIDS datasets, their own
+        top-level directory is returned.
+        """
+        return Path(self.root)
+
+    @property
+    def dataset_root(self) -> PathLike:
+        """
+        The topmost-level directory (derivatives notwithstanding).
+
+        """
+        def _dataset_root() -> PathLike:
+            root = self.root
+            while root is not None and 'derivatives' in root:
+                root = _bids_root(os.path.dirname(root))
+            if root is None:
+                raise FileNotFoundError
+            return Path(root)
+        return self._cached('dataset_root', _dataset_root)
+
+    @property
+    def derivatives_root(self) -> Union[Text, PathLike]:
+        """
+        The root directory of derived datasets, or '' if absent.
+
+        """
+        def _derivatives_root() -> Union[Text, PathLike]:
+            _d_dir = self.dataset_root.joinpath('derivatives')
+            return _d_dir if _d_dir.exists() else ''
+        return self._cached('derivatives_root', _derivatives_root)
+
+    @property
+    def name(self) -> Text:
+        """
+        The name of the dataset's top-level directory.
+
+        """
+        return os.path.basename(self.root)
+
+    @property
+    def description(self) -> Dict:
+        """
+        Contents of the 'dataset_description.json' file.
+
+        """
+        def _description() -> Dict:
+            try:
+                return json.loads(
+                    Path(self.root).joinpath(DD_FILE).read_text())
+            except FileNotFoundError:
+                warnings.warn(UserWarning(BVE_MESSAGE))
+        return self._cached('description', _description)
+
+    @property
+    def bidsignore(self) -> Tuple:
+        """
+        Paths matching patterns defined in the '.bidsignore' file.
+
+        """
+        return self._cached('bidsignore',
+                            lambda: tuple(GetBidsignore(self.bids_root)))
+
+    @property
+    def bidsignore_matcher(self) -> GitIgnoreMatcher:
+        """
+        Patterns of the '.bidsignore' file, compiled once per dataset.
+
+        """
+        return self._cached('bidsignore_matcher',
+                            lambda: BidsignoreMatcher(self.dataset_root))
+
+    @property
+    def gitattributes_matcher(self) -> GitIgnoreMatcher:
+        """
+        Patterns of the '.gitattributes' file, compiled once per dataset.
+
+        """
+        return self._cached('gitattributes_matcher',
+                            lambda: GitAttributesMatcher(self.dataset_root))
+
+    def is_ignored(self, src: Union[Text, PathLike],
+                   is_dir: bool = False) -> bool:
+        """
+        Returns True if ``src`` matches a '.bidsignore' pattern.
+
+        Args:
+            src: str or PathLike
+                Absolute path within the dataset.
+
+            is_dir: bool (Default = False)
+                Whether ``src`` is a directory.
+        """
+        matcher = self.bidsignore_matcher
+        if not matcher:
+            return False
+        try:
+            rel_path = os.path.relpath(os.fspath(src), self.dataset_root)
+        except ValueError:
+            return False
+        return not rel_path.startswith(os.pardir) and \
+            matcher(rel_path, is_dir=is_dir)
+
+    @property
+    def participants(self) -> pd.DataFrame:
+        """
+        Contents of the 'participants.tsv' file, indexed by participant.
+
+        The same ``DataFrame`` is returned on each access.
+        """
+        def _participants() -> pd.DataFrame:
+            meta_path = self.dataset_root.joinpath('participants.tsv')
+            if meta_path.exists():
+                return pd.read_csv(str(meta_path), sep='\t',
+                                   index_col='participant_id')
+            return pd.DataFrame(dtype='string')
+        return self._cached('participants', _participants)
+
+    def sidecar(self, src: Union[Text, PathLike]) -> Mapping:
+        """
+        Metadata of file ``src`` merged along the inheritance principle.
+
+        Merged metadata is cached per directory, suffix and entities,
+        so files sharing them (e.g. a scan and its own sidecar)
+        share the same read-only mapping. See ``GetSidecar``.
+        """
+        src = os.path.abspath(os.fspath(src))
+        _parsed = split_components(src)
+        key = (os.path.dirname(src), _parsed.bids_suffix, _parsed.entities)
+        sidecars = self._cached('sidecars', dict)
+        try:
+            return sidecars[key]
+        except KeyError:
+            return sidecars.setdefault(
+                key, MappingProxyType(GetSidecar(src, root=self.root)))
+
+
+@register_invalidator
+def _invalidate(src: Text) -> None:
+    """
+    Drops cached values read from file ``src``.
+
+    """
+    if os.path.basename(src) == DD_FILE:
+        # Dataset roots may have been created or removed
+        _ROOTS.clear()
+        tuple(_context.invalidate() for _context in _CONTEXTS.values())
+        return
+    if src.endswith('.json'):
+        # Sidecars apply to the files below their directory
+        for context in tuple(_CONTEXTS.values()):
+            if src.startswith(context.root + os.sep):
+                context.invalidate('sidecars')
+    if os.path.basename(src) not in ('participants.tsv', '.bidsignore',
+                                     '.gitattributes'):
+        return
+    _dir = os.path.dirname(src)
+    for context in tuple(_CONTEXTS.values()):
+        if _dir == context.root or \
+                _dir == str(context._cache.get('dataset_root')):
+            context.invalidate()
+
+
+__all__: List = ["BIDSContext"]
@@ -1,7 +1,8 @@
 
 import os
-from typing import Union, Text
+from typing import Any, List, Optional, Union, Text
 
+from .constants.bidspathlib_docs import ENTITY_STRINGS
 from .core.BIDSPathAbstract import BIDSPathAbstract
 from .core.bids_file.BIDSFile import BIDSFile
 from .core.bids_dir.BIDSDir import BIDSDir
@@ -20,16 +21,87 @@ class BIDSPath(BIDSPathAbstract):
         return self.__new__(*args, **kwargs)
 
     @classmethod
-    def __prepare__(cls, src: Union[Text, os.PathLike]):
+    def __prepare__(cls, src: Union[Text, os.PathLike],
+                    root: Optional[Union[Text, os.PathLike]] = None,
+                    lazy: bool = False):
+        if lazy:
+            return LazyBIDSPath(src, root=root)
         _mapper = (
-            (cls.isfile(src), BIDSFile),
-            (cls.isdir(src), BIDSDir)
+            (cls.isfile(src, root=root), BIDSFile),
+            (cls.isdir(src, root=root), BIDSDir)
         )
         _cls = next(filter(lambda item: bool(item[0]), _mapper))
         keywords = super().__get_entities__(src)._asdict()
-        subclass = _cls[1](src)
+        subclass = _cls[1](src, root=root)
         subclass.__set_from_dict__(keywords)
         return subclass
 
     def __init__(self, src: Union[Text, os.PathLike], **kwargs):
         super().__init__(src, **kwargs)
+
+
+class LazyBIDSPath(BIDSPathAbstract):
+    """
+    Unclassified ``BIDSPath`` holding only its path string.
+
+    Returned by ``BIDSPath(src, lazy=True)``. Components, entities
+    and other string-based attributes are computed from the path
+    without accessing the file system. The concrete ``BIDSPath``
+    (e.g. ``FMRIFile``, ``EventsFile``, ``Session``) is only
+    instantiated when one of its specific members
+    (e.g. ``img``, ``table``, ``datatypes``) is accessed.
+
+    Example:
+        >>> paths = [BIDSPath(p, lazy=True) for p in listing]
+        >>> bold = [p for p in paths if p.bids_suffix == 'bold']
+        >>> bold[0].t_r  # Classified and read here
+        2.0
+    """
+    __slots__ = ('_concrete',)
+
+    def __type__(self): return type(self)
+
+    def __init__(self, src: Union[Text, os.PathLike], **kwargs):
+        super().__init__(src, **kwargs)
+
+    def __getattr__(self, name: Text) -> Any:
+        # Only called for members ``BIDSPathAbstract`` does not define
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in ENTITY_STRINGS:
+            return getattr(self.__get_entities__(), name)
+        return getattr(self.concrete, name)
+
+    @property
+    def concrete(self) -> BIDSPathAbstract:
+        """
+        The classified ``BIDSPath`` object, instantiated on first access.
+
+        Raises:
+            FileNotFoundError: if the path is neither a file nor a directory.
+        """
+        try:
+            return object.__getattribute__(self, '_concrete')
+        except AttributeError:
+            try:
+                _concrete = BIDSPath(self.__fspath__(),
+                                     root=self.declared_root)
+            except StopIteration:
+                raise FileNotFoundError(self.__fspath__()) from None
+            object.__setattr__(self, '_concrete', _concrete)
+            return _concrete
+
+    @property
+    def is_classified(self) -> bool:
+        """
+        Returns True if the concrete ``BIDSPath`` was instantiated.
+
+        """
+        try:
+            object.__getattribute__(self, '_concrete')
+            return True
+        except AttributeError:
+            return False
+
+
+__all__: List = ["BIDSPath", "LazyBIDSPath"]
@@ -0,0 +1,579 @@
+"""
+Persistent index of the files and directories in a BIDS dataset.
+
+The index is a SQLite database holding one row per path,
+along with its parsed BIDS components, size, modification time
+and inode key. It is built from a single ``os.scandir`` walk
+starting at the dataset's root, then queried instead of
+re-globbing the dataset's directory tree.
+
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from itertools import islice
+from os import PathLike
+from typing import (
+    Dict, Generator, Iterator, List,
+    Optional, Text, Tuple, Union
+)
+
+from .constants.bidspathlib_docs import ENTITY_STRINGS, NO_EXTENSION_FILES
+from .functions.BIDSPathCoreFunctions import _split_components
+from .functions.BIDSPathFunctions import BIDSRoot
+from .general_methods import glob_to_regex, is_hidden, scandir_walk
+
+__path__ = [os.path.join('..', '__init__.py')]
+
+INDEX_DIRNAME: Text = '.bidspathlib'
+INDEX_FILENAME: Text = 'index.sqlite'
+INDEX_CACHE_DIR: Text = os.path.join(
+    os.environ.get('XDG_CACHE_HOME',
+                   os.path.join(os.path.expanduser('~'), '.cache')),
+    'bidspathlib'
+)
+INDEX_STAT_FIELDS: Tuple = ('path', 'dirname', 'name', 'is_dir',
+                            'size', 'mtime_ns', 'inode')
+INDEX_COMPONENTS: Tuple = ENTITY_STRINGS + NO_EXTENSION_FILES
+INDEX_COLUMNS: Tuple = INDEX_STAT_FIELDS + INDEX_COMPONENTS
+
+_COLUMNS_SQL: Text = ', '.join(f'"{_col}"' for _col in INDEX_COLUMNS)
+_PLACEHOLDERS: Text = ', '.join('?' * len(INDEX_COLUMNS))
+_INDEXED_COLUMNS: Tuple = ('dirname', 'sub', 'ses', 'task',
+                           'bids_suffix', 'datatype')
+
+# Size recorded for broken symbolic links (e.g. git-annex files without content)
+MISSING_SIZE: int = -1
+
+# Rows inserted per ``executemany`` call while building an index
+_BATCH_ROWS: int = 2 ** 12
+
+# Indexes opened in this process, keyed by dataset root
+_OPENED: Dict = {}
+
+
+def _to_posix(src: Text) -> Text:
+    return src.replace(os.sep, '/') if os.sep != '/' else src
+
+
+def _component_value(key: Text, value: Text) -> Text:
+    """
+    Returns the value of component ``key`` without its '<key>-' prefix.
+
+    """
+    value = str(value)
+    if key in ENTITY_STRINGS and value.startswith(f'{key}-'):
+        return value[len(key) + 1:]
+    return value
+
+
+def IndexLocation(root: Union[Text, PathLike]) -> Text:
+    """
+    Returns the path of the index database of the dataset at ``root``.
+
+    Defaults to '<root>/.bidspathlib/index.sqlite'.
+    If the dataset is read-only, the index is kept in the
+    user's cache directory instead, named after a hash of ``root``.
+    """
+    root = os.path.abspath(str(root))
+    _dir = os.path.join(root, INDEX_DIRNAME)
+    if os.access(_dir if os.path.isdir(_dir) else root, os.W_OK):
+        return os.path.join(_dir, INDEX_FILENAME)
+    _hash = hashlib.sha1(root.encode()).hexdigest()
+    return os.path.join(INDEX_CACHE_DIR, f'{_hash}.sqlite')
+
+
+def _subtree(column: Text, rel_dir: Text) -> Tuple:
+    """
+    Returns a SQL clause and its parameters selecting ``rel_dir``'s subtree.
+
+    """
+    _escaped = rel_dir.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+    return (f'({column} = ? OR {column} LIKE ? ESCAPE ?)',
+            [rel_dir, _escaped + os.sep + '%', '!'])
+
+
+def _row(root: Text, rel_path: Text, is_dir: bool,
+         _stat: os.stat_result, missing: bool = False) -> Tuple:
+    """
+    Returns the index row of ``rel_path`` from its ``stat`` result.
+
+    Rows of ``missing`` targets have a size of ``MISSING_SIZE``.
+    """
+    rel_dir, name = os.path.split(rel_path)
+    _parsed = _split_components(os.path.join(root, rel_path))
+    return (rel_path, rel_dir, name, int(is_dir),
+            MISSING_SIZE if missing else _stat.st_size,
+            _stat.st_mtime_ns, f'{_stat.st_dev}:{_stat.st_ino}',
+            *_parsed.entities, _parsed.bids_suffix,
+            _parsed.datatype, _parsed.extension)
+
+
+def _entry_row(root: Text, rel_path: Text,
+               entry: os.DirEntry) -> Optional[Tuple]:
+    """
+    Returns the index row of ``entry``, or None if it vanished.
+
+    Broken symbolic links (e.g. git-annex files whose content
+    is not present) are indexed from ``lstat`` as missing files.
+    """
+    try:
+        return _row(root, rel_path, entry.is_dir(), entry.stat())
+    except OSError:
+        pass
+    try:
+        _stat = entry.stat(follow_symlinks=False)
+    except OSError:
+        return None
+    return _row(root, rel_path, False, _stat, missing=True)
+
+
+def _path_row(root: Text, rel_path: Text, is_dir: bool) -> Optional[Tuple]:
+    """
+    Returns the index row of ``rel_path``, or None if it does not exist.
+
+    Same as ``_entry_row``, for paths not obtained from ``os.scandir``.
+    """
+    path = os.path.join(root, rel_path)
+    try:
+        return _row(root, rel_path, is_dir, os.stat(path))
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    try:
+        return _row(root, rel_path, False, os.lstat(path), missing=True)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _scan(root: Text, rel_dir: Text) -> Generator:
+    """
+    Yields an index row for each entry of directory ``rel_dir``.
+
+    Each row comes with a boolean telling if the entry should be descended,
+    which excludes hidden and symbolically linked directories.
+    """
+    try:
+        entries = os.scandir(os.path.join(root, rel_dir))
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return
+    with entries:
+        for entry in entries:
+            row = _entry_row(root, os.path.join(rel_dir, entry.name), entry)
+            if row is None:
+                continue
+            descend = all((row[3], not is_hidden(entry.name),
+                           not entry.is_symlink()))
+            yield row, descend
+
+
+def IndexRows(root: Union[Text, PathLike], rel_dir: Text = '',
+              **kwargs) -> Generator:
+    """
+    Yields one index row per path found under directory ``root``.
+
+    The walk is a single pass of ``os.scandir`` calls, spread over
+    a pool of threads (see ``general_methods.scandir_walk``).
+    Hidden directories (e.g. '.git', '.bidspathlib') and symbolic
+    links to directories are not descended, as in ``refresh``.
+    Broken symbolic links are indexed with a size of ``MISSING_SIZE``.
+    Rows follow the ``INDEX_COLUMNS`` order.
+
+    Args:
+        root: str or PathLike
+            Root directory of the dataset.
+
+        rel_dir: str (Default = '')
+            Directory (relative to ``root``) where the walk starts.
+
+        kwargs: Dict
+            Passed to ``scandir_walk`` (e.g. ``workers``, ``sort``).
+    """
+    root = os.path.abspath(str(root))
+    _start = len(root) + 1
+    for entry in scandir_walk(os.path.join(root, rel_dir).rstrip(os.sep),
+                              descend=lambda _e: not (is_hidden(_e.name)
+                                                      or _e.is_symlink()),
+                              stat=True, **kwargs):
+        row = _entry_row(root, entry.path[_start:], entry)
+        if row is not None:
+            yield row
+
+
+class DatasetIndex:
+    """
+    Persistent SQLite index of the files in a BIDS dataset.
+
+    Besides one row per path, the index records the modification time
+    of each directory when it was scanned, so ``refresh`` only
+    re-scans directories that changed since.
+    Opening an index registers it for the current process:
+    ``MatchComponents`` and the ``glob``/``rglob`` methods of
+    ``BIDSDir`` objects then answer from it for paths within
+    the indexed dataset instead of walking the file system.
+
+    Args:
+        src: str or PathLike
+            Any path within the dataset.
+            The index covers the whole tree below ``BIDSRoot(src)``.
+
+        location: str or PathLike, optional
+            Path of the database file.
+            Defaults to ``IndexLocation(BIDSRoot(src))``.
+
+        build: bool (Default = True)
+            Whether to build the index if it is empty.
+
+    Notes:
+        Each thread uses its own database connection, in write-ahead
+        logging mode, so queries (e.g. from ``MatchComponents``) never
+        see a ``refresh`` running in another thread (e.g. that of
+        a ``DatasetWatcher``) until it is committed.
+
+    Example:
+        >>> index = DatasetIndex('/data/ds/sub-01')
+        >>> tuple(index.query(sub='01', bids_suffix='T1w'))
+        ('/data/ds/sub-01/anat/sub-01_T1w.nii.gz',)
+    """
+    __slots__ = ('root', 'location', '_local', '_connections', '_lock')
+
+    def __init__(self, src: Union[Text, PathLike],
+                 location: Optional[Union[Text, PathLike]] = None,
+                 build: bool = True):
+        self.root = os.path.abspath(str(BIDSRoot(str(src))))
+        self.location = str(location) if location \
+            else IndexLocation(self.root)
+        os.makedirs(os.path.dirname(self.location), exist_ok=True)
+        self._local, self._connections = threading.local(), []
+        self._lock = threading.Lock()
+        _columns = ', '.join(f'"{_col}" TEXT' for _col in INDEX_COMPONENTS)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS files ('
+                'path TEXT PRIMARY KEY, dirname TEXT, name TEXT, '
+                'is_dir INTEGER, size INTEGER, mtime_ns INTEGER, '
+                f'inode TEXT, {_columns})'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS dirs ('
+                'path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER)'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent)'
+            )
+            for _col in _INDEXED_COLUMNS:
+                self._connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "files_{_col}" '
+                    f'ON files ("{_col}")'
+                )
+        if build and not len(self):
+            self.build()
+        _OPENED[self.root] = self
+
+    def __repr__(self) -> Text:
+        return f"{type(self).__name__}({self.root})"
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def __iter__(self) -> Iterator:
+        yield from self.query()
+
+    def __contains__(self, item: Union[Text, PathLike]) -> bool:
+        rel_path = self.relative(item)
+        return rel_path is not None and self._connection.execute(
+            'SELECT 1 FROM files WHERE path = ?', (rel_path,)
+        ).fetchone() is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Database connection of the calling thread, opened on first use.
+
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.location,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @classmethod
+    def for_path(cls, src: Union[Text, PathLike]):
+        """
+        Returns the opened index covering path ``src``, if any.
+
+        Only indexes already opened in this process are considered,
+        so no file system access is made.
+        The deepest indexed root wins (e.g. a derivatives dataset).
+        """
+        src = os.path.abspath(str(src))
+        roots = (_root for _root in _OPENED
+                 if src == _root or src.startswith(_root + os.sep))
+        try:
+            return _OPENED[max(roots, key=len)]
+        except ValueError:
+            return None
+
+    def close(self) -> None:
+        """
+        Closes the database connections and unregisters the index.
+
+        """
+        if _OPENED.get(self.root) is self:
+            del _OPENED[self.root]
+        with self._lock:
+            connections, self._connections = self._connections, []
+        self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def _forget(self, rel_dir: Text) -> None:
+        """
+        Removes directory ``rel_dir`` and everything below it from the index.
+
+        """
+        if not rel_dir:
+            self._connection.execute('DELETE FROM files')
+            self._connection.execute('DELETE FROM dirs')
+            return
+        _clause, _params = _subtree('dirname', rel_dir)
+        self._connection.execute(
+            f'DELETE FROM files WHERE path = ? OR {_clause}',
+            [rel_dir, *_params])
+        _clause, _params = _subtree('path', rel_dir)
+        self._connection.execute(f'DELETE FROM dirs WHERE {_clause}', _params)
+
+    def build(self) -> None:
+        """
+        (Re)builds the index from a single walk of the dataset.
+
+        Directory mtimes are recorded from the same walk, before
+        each directory is listed, for later calls to ``refresh``.
+        Rows are inserted ``_BATCH_ROWS`` at a time.
+        """
+        root_mtime = os.stat(self.root).st_mtime_ns
+        rows, connection = iter(IndexRows(self.root)), self._connection
+        with connection:
+            self._forget('')
+            connection.execute('INSERT INTO dirs VALUES (?, ?, ?)',
+                               ('', None, root_mtime))
+            for batch in iter(lambda: tuple(islice(rows, _BATCH_ROWS)), ()):
+                connection.executemany(
+                    f'INSERT INTO files ({_COLUMNS_SQL}) '
+                    f'VALUES ({_PLACEHOLDERS})', batch)
+                connection.executemany(
+                    'INSERT INTO dirs VALUES (?, ?, ?)',
+                    ((_row[0], _row[1], _row[5]) for _row in batch
+                     if _row[3] and not is_hidden(_row[2])
+                     and not os.path.islink(
+                         os.path.join(self.root, _row[0]))))
+
+    def refresh(self, *rel_dirs: Text) -> int:
+        """
+        Updates the index, re-scanning only directories that changed.
+
+        Creating, deleting or renaming an entry bumps the modification
+        time of its parent directory on POSIX file systems.
+        Directories whose mtime matches the one recorded when they were
+        last scanned keep their rows as-is and only their known
+        subdirectories are visited. Changed directories are re-scanned,
+        new subdirectories are indexed and vanished ones are dropped.
+
+        Args:
+            rel_dirs: str
+                Directories (relative to ``root``) known to have changed,
+                e.g. from file system events. Only these and their new
+                subdirectories are re-scanned. Defaults to checking the
+                whole directory tree.
+
+        Notes:
+            In-place modifications of a file's contents do not change
+            its directory's mtime, so its size and mtime rows may lag.
+
+        Returns: int
+            The number of directories re-scanned.
+        """
+        execute = self._connection.execute
+        known = dict(execute('SELECT path, mtime_ns FROM dirs'))
+        forced = frozenset(rel_dirs)
+        stack, rescanned = list(forced) or [''], 0
+        with self._connection:
+            while stack:
+                rel_dir = stack.pop()
+                subdirs = set(_row[0] for _row in execute(
+                    'SELECT path FROM dirs WHERE parent = ?', (rel_dir,)))
+                try:
+                    mtime_ns = os.stat(
+                        os.path.join(self.root, rel_dir)).st_mtime_ns
+                except (FileNotFoundError, NotADirectoryError):
+                    self._forget(rel_dir)
+                    continue
+                if known.get(rel_dir) == mtime_ns and rel_dir not in forced:
+                    if not forced:
+                        stack.extend(subdirs)
+                    continue
+                rows, found = [], []
+                for row, descend in _scan(self.root, rel_dir):
+                    rows.append(row)
+                    if descend:
+                        found.append(row[0])
+                # Vanished subdirectories go first: a file may now
+                # have the same name as one of them
+                for _gone in subdirs.difference(found):
+                    self._forget(_gone)
+                execute('DELETE FROM files WHERE dirname = ?', (rel_dir,))
+                self._connection.executemany(
+                    f'INSERT INTO files ({_COLUMNS_SQL}) '
+                    f'VALUES ({_PLACEHOLDERS})', rows)
+                execute('UPDATE files SET mtime_ns = ? WHERE path = ?',
+                        (mtime_ns, rel_dir))
+                execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)',
+                        (rel_dir, os.path.dirname(rel_dir) if rel_dir
+                         else None, mtime_ns))
+                stack.extend(found)
+                rescanned += 1
+        return rescanned
+
+    def rows(self, *columns: Text) -> Generator:
+        """
+        Yields the values of ``columns`` for every indexed path.
+
+        Args:
+            columns: str
+                Names from ``INDEX_COLUMNS``. Defaults to all columns.
+
+        Returns: Generator[Tuple]
+        """
+        columns = columns if columns else INDEX_COLUMNS
+        if not set(columns).issubset(INDEX_COLUMNS):
+            raise KeyError(set(columns).difference(INDEX_COLUMNS))
+        _columns = ', '.join(f'"{_col}"' for _col in columns)
+        yield from self._connection.execute(
+            f'SELECT {_columns} FROM files ORDER BY path')
+
+    def missing(self) -> Generator:
+        """
+        Yields the indexed paths of broken symbolic links.
+
+        In a git-annex dataset, these are the files whose
+        content has not been retrieved (e.g. with 'datalad get').
+        """
+        for (rel_path,) in self._connection.execute(
+                'SELECT path FROM files WHERE size = ? ORDER BY path',
+                (MISSING_SIZE,)):
+            yield os.path.join(self.root, rel_path)
+
+    def relative(self, src: Union[Text, PathLike]) -> Optional[Text]:
+        """
+        Returns path ``src`` relative to the indexed root, if inside it.
+
+        """
+        src = os.path.abspath(str(src))
+        if src == self.root:
+            return ''
+        if src.startswith(self.root + os.sep):
+            return src[len(self.root) + 1:]
+        return None
+
+    def stat(self, src: Union[Text, PathLike]) -> Dict:
+        """
+        Returns the indexed size, mtime and inode key of path ``src``.
+
+        """
+        row = self._connection.execute(
+            'SELECT is_dir, size, mtime_ns, inode FROM files WHERE path = ?',
+            (self.relative(src),)
+        ).fetchone()
+        return dict(zip(('is_dir', 'size', 'mtime_ns', 'inode'), row)) \
+            if row else {}
+
+    def query(self, dst: Optional[Union[Text, PathLike]] = None,
+              recursive: bool = True,
+              **components) -> Generator:
+        """
+        Yields indexed paths matching the given components exactly.
+
+        Args:
+            dst: str or PathLike, optional
+                Directory in which to look for matches.
+                Defaults to the indexed root.
+
+            recursive: bool (Default=True)
+                Whether to include paths in subdirectories of ``dst``.
+
+            components: Dict
+                BIDS entity strings (e.g. "sub", "ses") and
+                "bids_suffix", "extension", "datatype" keywords.
+                Entity values may include their key ('sub-01' or '01').
+                Keywords assigned an empty string are ignored.
+
+        Returns: Generator[str]
+            Absolute paths, sorted.
+        """
+        clauses, params = [], []
+        rel_dst = self.relative(dst) if dst is not None else ''
+        if rel_dst is None:
+            return
+        if rel_dst and recursive:
+            _clause, _params = _subtree('dirname', rel_dst)
+            clauses.append(_clause)
+            params.extend(_params)
+        elif not recursive:
+            clauses.append('dirname = ?')
+            params.append(rel_dst)
+        for key, value in components.items():
+            if key not in INDEX_COMPONENTS or not value:
+                continue
+            clauses.append(f'"{key}" = ?')
+            params.append(_component_value(key, value))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        cursor = self._connection.execute(
+            f'SELECT path FROM files{where} ORDER BY path', params)
+        yield from (os.path.join(self.root, _row[0]) for _row in cursor)
+
+    def glob(self, dst: Union[Text, PathLike],
+             pattern: Text = '**/**',
+             recursive: bool = True,
+             **components) -> Generator:
+        """
+        Yields indexed paths below ``dst`` matching glob ``pattern``.
+
+        Mirrors ``glob.iglob(os.path.join(dst, pattern), recursive=recursive)``
+        without walking the file system.
+        Hidden paths are only yielded if ``pattern`` explicitly targets them.
+        Paths can be further restricted to ``components``
+        (see ``query``).
+        """
+        rel_dst = self.relative(dst)
+        if rel_dst is None:
+            return
+        regex = glob_to_regex(pattern if recursive
+                              else pattern.replace('**', '*'))
+        _start = len(rel_dst) + 1 if rel_dst else 0
+        deep = '/' in pattern.strip('/') or '**' in pattern
+        hidden = pattern.startswith('.') or '/.' in pattern
+        for path in self.query(dst, recursive=deep, **components):
+            rel_path = _to_posix(path[len(self.root) + 1:][_start:])
+            if not hidden and (rel_path.startswith('.') or '/.' in rel_path):
+                continue
+            if regex.fullmatch(rel_path):
+                yield path
+
+
+__all__: List = [
+    "DatasetIndex", "IndexLocation", "IndexRows",
+    "INDEX_COLUMNS", "INDEX_COMPONENTS", "INDEX_DIRNAME", "INDEX_FILENAME",
+    "MISSING_SIZE"
+]
@@ -0,0 +1,469 @@
+"""
+Live watcher keeping the indexes of a BIDS dataset current.
+
+Uses the Linux ``inotify`` API through ``ctypes``.
+Every non-hidden directory below the dataset's root is watched.
+Created, deleted and moved paths are applied to the in-memory
+``EntityIndex`` (and to the opened ``DatasetIndex``, if any)
+as they happen, instead of re-scanning the dataset.
+Cached file system metadata of changed paths is dropped.
+
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from collections import deque, namedtuple
+from os import PathLike
+from typing import (
+    Callable, Dict, Generator, Iterable, List, Optional, Text, Tuple, Union
+)
+
+from .DatasetIndex import (
+    DatasetIndex, _component_value, _path_row, IndexRows
+)
+from .EntityIndex import EntityIndex, ENTITY_INDEX_ROW, _ALIASES
+from .functions.BIDSPathCoreFunctions import split_components
+from .functions.BIDSPathFunctions import DatasetRoot
+from .general_methods import get_stat_cache, is_hidden
+
+__path__ = [os.path.join('..', '__init__.py')]
+
+WATCH_EVENTS: Tuple = ('created', 'deleted', 'moved', 'modified')
+WatchEvent = namedtuple('WatchEvent', ('event', 'path', 'src_path'))
+
+# Names of the files whose contents are cached by the library
+CACHED_FILES: Tuple = ('participants.tsv', 'participants.json',
+                       'dataset_description.json', '.bidsignore',
+                       '.gitattributes')
+
+# inotify(7) event flags
+_IN_CLOSE_WRITE, _IN_MOVED_FROM, _IN_MOVED_TO = 0x8, 0x40, 0x80
+_IN_CREATE, _IN_DELETE = 0x100, 0x200
+_IN_DELETE_SELF, _IN_MOVE_SELF = 0x400, 0x800
+_IN_Q_OVERFLOW, _IN_IGNORED = 0x4000, 0x8000
+_IN_ONLYDIR, _IN_ISDIR = 0x1000000, 0x40000000
+_IN_NONBLOCK, _IN_CLOEXEC = os.O_NONBLOCK, 0o2000000
+_WATCH_MASK: int = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO |
+                    _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF |
+                    _IN_MOVE_SELF | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Functions called with the absolute path of changed ``CACHED_FILES``
+# and JSON sidecars, so caches fed by these files can be invalidated
+_INVALIDATORS: List = []
+
+
+def register_invalidator(func: Callable) -> Callable:
+    """
+    Registers ``func`` to be called when a cached file changes.
+
+    ``func`` is called with the absolute path of any created, deleted,
+    moved or rewritten file named in ``CACHED_FILES`` or ending in
+    '.json' (sidecars). Can be used as a decorator.
+    """
+    if func not in _INVALIDATORS:
+        _INVALIDATORS.append(func)
+    return func
+
+
+def _feeds_cache(name: Text) -> bool:
+    return name in CACHED_FILES or name.endswith('.json')
+
+
+def _libc() -> ctypes.CDLL:
+    """
+    Returns the C library, if it provides the ``inotify`` API.
+
+    """
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise OSError('inotify is not available on this platform')
+    libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p,
+                                       ctypes.c_uint32)
+    libc.inotify_rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+    return libc
+
+
+def _matches(path: Text, components: Dict) -> bool:
+    """
+    Returns True if ``path``'s BIDS components equal ``components``.
+
+    """
+    _parsed = split_components(path)
+    found = dict(zip(ENTITY_INDEX_ROW[3:],
+                     (*_parsed.entities, _parsed.bids_suffix,
+                      _parsed.datatype, _parsed.extension)))
+    for key, value in components.items():
+        key = _ALIASES.get(key, key)
+        if value in ('', None):
+            continue
+        values = value if isinstance(value, (list, tuple, set, frozenset)) \
+            else (value,)
+        if found.get(key) not in {_component_value(key, _v)
+                                  for _v in values}:
+            return False
+    return True
+
+
+class DatasetWatcher:
+    """
+    Applies file system events below a dataset's root to its indexes.
+
+    Events are read either by a background thread (``start``/``stop``)
+    or on demand with ``poll``. Each batch of events updates the
+    ``EntityIndex``, then refreshes the directories it touched in the
+    opened ``DatasetIndex`` of the dataset, if any. Changes to files
+    feeding cached data (sidecars, participants, '.bidsignore')
+    are passed to the functions registered with ``register_invalidator``.
+
+    Args:
+        src: str or PathLike
+            Any path within the dataset.
+
+        index: EntityIndex, optional
+            In-memory index to keep current. Built from the walk
+            setting up the watches if omitted.
+
+    Notes:
+        Linux only. Each watched directory uses one inotify watch,
+        bounded by '/proc/sys/fs/inotify/max_user_watches'.
+        If the kernel's event queue overflows, indexes are re-synced
+        from a walk of the dataset.
+        File system metadata is cached only once a ``StatCache``
+        is set with ``set_stat_cache``; watchers keep it current.
+
+    Example:
+        >>> watcher = DatasetWatcher('/data/ds').start()
+        >>> watcher.subscribe(print, 'created',
+        ...                   task='memory', bids_suffix='bold')
+        >>> watcher.stop()
+    """
+    __slots__ = ('root', 'index', '_libc', '_fd', '_watches',
+                 '_subscribers', '_lock', '_thread', '_wakeup')
+
+    def __init__(self, src: Union[Text, PathLike],
+                 index: Optional[EntityIndex] = None):
+        self.root = os.path.abspath(str(DatasetRoot(str(src))))
+        self._libc = _libc()
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._watches, self._subscribers = {}, []
+        self._lock, self._thread, self._wakeup = threading.RLock(), None, None
+        rows = self._watch_tree('')
+        if index is None:
+            index = EntityIndex.from_rows(self.root, (_row[1:4] + _row[7:]
+                                                      for _row in rows))
+        else:
+            deque(rows, maxlen=0)
+        self.index = index
+
+    def __repr__(self) -> Text:
+        return (f"{type(self).__name__}({self.root}, "
+                f"{len(self._watches)} directories)")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, callback: Callable, *events: Text,
+                  **components) -> Callable:
+        """
+        Calls ``callback`` for events on paths matching ``components``.
+
+        Args:
+            callback: Callable
+                Called with a ``WatchEvent(event, path, src_path)``.
+                ``src_path`` is the former path of moved paths.
+
+            events: str
+                Events of interest among ``WATCH_EVENTS``.
+                Defaults to all events.
+
+            components: Dict
+                Exact BIDS components of the (new) path, e.g.
+                ``task='memory', bids_suffix='bold'``.
+                See ``EntityIndex.mask`` for the keyword semantics.
+
+        Returns: Callable
+            Function cancelling the subscription.
+        """
+        unknown = set(events).difference(WATCH_EVENTS)
+        if unknown:
+            raise ValueError(f'unknown events: {sorted(unknown)}')
+        subscriber = (callback, frozenset(events or WATCH_EVENTS), components)
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscriber in self._subscribers:
+                    self._subscribers.remove(subscriber)
+        return unsubscribe
+
+    def start(self):
+        """
+        Starts reading events in a background (daemon) thread.
+
+        """
+        if not self.running:
+            self._wakeup = os.pipe()
+            self._thread = threading.Thread(
+                target=self._run, name=repr(self), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the background thread, if running.
+
+        """
+        if self.running:
+            os.write(self._wakeup[1], b'\0')
+            self._thread.join()
+        if self._wakeup is not None:
+            tuple(map(os.close, self._wakeup))
+        self._thread, self._wakeup = None, None
+
+    def close(self) -> None:
+        """
+        Stops watching the dataset and releases the inotify descriptor.
+
+        """
+        self.stop()
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = -1
+        self._watches.clear()
+
+    def poll(self, timeout: Optional[float] = 0) -> int:
+        """
+        Reads and applies pending events.
+
+        Args:
+            timeout: float, optional (Default = 0)
+                Seconds to wait for events. ``None`` waits indefinitely.
+
+        Returns: int
+            The number of events applied.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        return self._apply(self._read()) if readable else 0
+
+    def _run(self) -> None:
+        while True:
+            readable, _, _ = select.select([self._fd, self._wakeup[0]],
+                                           [], [])
+            if self._wakeup[0] in readable:
+                return
+            self._apply(self._read())
+
+    def _watch(self, rel_dir: Text) -> None:
+        _path = os.path.join(self.root, rel_dir)
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(_path),
+                                          _WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = rel_dir
+
+    def _unwatch(self, rel_dir: Text) -> None:
+        _prefix = rel_dir + os.sep
+        for wd, _dir in tuple(self._watches.items()):
+            if _dir == rel_dir or _dir.startswith(_prefix):
+                del self._watches[wd]
+                self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _watch_tree(self, rel_dir: Text) -> Generator:
+        """
+        Watches ``rel_dir`` and its subdirectories, yielding their rows.
+
+        Directories are watched before being listed, so entries created
+        meanwhile are reported either by the listing or by an event.
+        """
+        self._watch(rel_dir)
+        for row in IndexRows(self.root, rel_dir):
+            if row[3] and not is_hidden(row[2]) \
+                    and not os.path.islink(os.path.join(self.root, row[0])):
+                self._watch(row[0])
+            yield row
+
+    def _read(self) -> Generator:
+        """
+        Yields ``(wd, mask, cookie, name)`` tuples of pending events.
+
+        """
+        try:
+            buffer = os.read(self._fd, 2 ** 16)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+            yield wd, mask, cookie, os.fsdecode(name)
+
+    def _apply(self, raw_events: Generator) -> int:
+        """
+        Applies a batch of events to the indexes, then notifies listeners.
+
+        """
+        with self._lock:
+            events, changed, moved_from, overflow = [], {}, {}, False
+            for wd, mask, cookie, name in raw_events:
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & _IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                if wd not in self._watches or not name:
+                    continue
+                rel_path = os.path.join(self._watches[wd], name)
+                is_dir = bool(mask & _IN_ISDIR)
+                if mask & _IN_MOVED_FROM:
+                    moved_from[cookie] = rel_path
+                    changed[rel_path] = None
+                    if is_dir:
+                        self._unwatch(rel_path)
+                elif mask & _IN_DELETE:
+                    changed[rel_path] = None
+                    events.append(('deleted', rel_path, None))
+                elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changed[rel_path] = is_dir
+                    _src = moved_from.pop(cookie, None) \
+                        if mask & _IN_MOVED_TO else None
+                    events.append(('moved' if _src else 'created',
+                                   rel_path, _src))
+                elif mask & _IN_CLOSE_WRITE:
+                    changed.setdefault(rel_path, False)
+                    events.append(('modified', rel_path, None))
+            # Paths moved out of the dataset are deleted
+            events.extend(('deleted', _src, None)
+                          for _src in moved_from.values())
+            stat_cache = get_stat_cache()
+            if stat_cache is not None:
+                if overflow:
+                    stat_cache.clear()
+                elif changed:
+                    _changed = tuple(os.path.join(self.root, _rel)
+                                     for _rel in changed)
+                    stat_cache.invalidate(*_changed, recursive=True)
+                    stat_cache.invalidate(*set(map(os.path.dirname,
+                                                   _changed)))
+            if overflow:
+                self._resync()
+            elif changed:
+                # Entries of new directories are reported as well
+                walked = self._update(changed)
+                for event, rel_path, _src in tuple(events):
+                    events.extend(
+                        (event, _child, _src and _src + _child[len(rel_path):])
+                        for _child in walked.get(rel_path, ()))
+            subscribers = tuple(self._subscribers)
+        for event, rel_path, _src in events:
+            _path = os.path.join(self.root, rel_path)
+            _src = os.path.join(self.root, _src) if _src else None
+            for _changed in (_path, _src):
+                if _changed and _feeds_cache(os.path.basename(_changed)):
+                    for invalidate in tuple(_INVALIDATORS):
+                        invalidate(_changed)
+            for callback, _events, components in subscribers:
+                if event in _events and _matches(_path, components):
+                    callback(WatchEvent(event, _path, _src))
+        return len(events)
+
+    def _update(self, changed: Dict) -> Dict:
+        """
+        Replaces the rows of ``changed`` paths with their current state.
+
+        Args:
+            changed: Dict
+                Maps paths relative to the dataset's root to None when
+                removed, or to True for directories to index recursively.
+
+        Returns: Dict
+            Maps each directory indexed recursively to the paths found
+            below it.
+        """
+        rows, walked = [], {}
+        for rel_path, is_dir in changed.items():
+            if is_dir is None:
+                continue
+            row = _path_row(self.root, rel_path, is_dir)
+            if row is None:
+                continue
+            rows.append(row)
+            if is_dir and not is_hidden(os.path.basename(rel_path)):
+                _found = tuple(self._watch_tree(rel_path))
+                walked[rel_path] = tuple(_row[0] for _row in _found)
+                rows.extend(_found)
+        self._apply_rows(changed, rows)
+        dataset_index = DatasetIndex.for_path(self.root)
+        if dataset_index is not None:
+            rel_dirs = set()
+            for rel_path in changed:
+                _parent = os.path.relpath(
+                    os.path.join(self.root, os.path.dirname(rel_path)),
+                    dataset_index.root)
+                if not _parent.startswith(os.pardir):
+                    rel_dirs.add('' if _parent == os.curdir else _parent)
+            if rel_dirs:
+                dataset_index.refresh(*rel_dirs)
+        return walked
+
+    def _apply_rows(self, changed: Dict, rows: Iterable,
+                    clear: bool = False) -> None:
+        """
+        Replaces ``changed`` paths in the ``EntityIndex`` by ``rows``.
+
+        Paths outside the index's root (e.g. a derivatives dataset
+        with its own index) are skipped. If ``clear`` is True,
+        all the rows of the index are replaced.
+        """
+        index_root = self.index.root
+        _offset = os.path.relpath(index_root, self.root)
+        _prefix = '' if _offset == os.curdir else _offset + os.sep
+
+        def _inside(rel_path: Text) -> bool:
+            return (rel_path + os.sep).startswith(_prefix) \
+                and rel_path + os.sep != _prefix
+
+        def _relative(rel_path: Text) -> Text:
+            return rel_path[len(_prefix):]
+
+        self.index.replace(
+            (index_root,) if clear else
+            tuple(os.path.join(index_root, _relative(_rel))
+                  for _rel in changed if _inside(_rel)),
+            ((_relative(_row[1]), *_row[2:4], *_row[7:])
+             for _row in rows if _inside(_row[0])))
+
+    def _resync(self) -> None:
+        """
+        Rebuilds the watches and indexes from a walk of the dataset.
+
+        """
+        for wd in tuple(self._watches):
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._watches.clear()
+        self._apply_rows({}, self._watch_tree(''), clear=True)
+        dataset_index = DatasetIndex.for_path(self.root)
+        if dataset_index is not None:
+            dataset_index.refresh()
+
+
+__all__: List = [
+    "DatasetWatcher", "WatchEvent", "WATCH_EVENTS", "CACHED_FILES",
+    "register_invalidator"
+]
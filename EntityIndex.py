@@ -0,0 +1,590 @@
+"""
+In-memory columnar index of the paths in a BIDS dataset.
+
+Paths and BIDS components are held as dictionary-encoded
+integer columns (``pandas.Categorical``) instead of one
+Python object per path. Equality queries are vectorized
+boolean masks and groupbys are single ``pandas`` operations.
+
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice, repeat
+from os import PathLike
+from typing import (
+    Any, Dict, Generator, Iterable, List, Optional, Text, Tuple, Union
+)
+
+import numpy as np
+from pandas import DataFrame, Index
+from pandas.api.types import union_categoricals
+
+from .constants.bidspathlib_docs import (
+    ENTITIES_ORDER, ENTITY_STRINGS, NIFTI_EXTENSIONS
+)
+from .DatasetIndex import (
+    DatasetIndex, IndexRows, INDEX_COMPONENTS, _component_value, _scan
+)
+from .functions.BIDSFileFunctions import SidecarChain, _read_json
+from .functions.BIDSPathCoreFunctions import _encode_columns, parse_many
+from .functions.BIDSPathFunctions import BIDSRoot
+
+__path__ = [os.path.join('..', '__init__.py')]
+
+ENTITY_INDEX_COLUMNS: Tuple = ('dirname', 'is_dir') + INDEX_COMPONENTS
+ENTITY_INDEX_ROW: Tuple = ('dirname', 'name', 'is_dir') + INDEX_COMPONENTS
+
+# Long entity names (e.g. "subject") are accepted as column aliases
+_ALIASES: Dict = dict(zip(ENTITIES_ORDER, ENTITY_STRINGS))
+
+CompanionRule = namedtuple('CompanionRule', ('components', 'keys', 'scope'),
+                           defaults=((),))
+CompanionRule.__doc__ = """
+Companion files of a run (e.g. its events or anatomical scan).
+
+Args:
+    components: Dict
+        Components every companion has, as in ``EntityIndex.mask``.
+
+    keys: Tuple
+        Alternative join keys, tried in order for runs left unmatched
+        (e.g. with, then without the session). Each is a tuple of
+        column names that companions share with their run, or None
+        for the run's own non-empty entities (other than ``components``).
+
+    scope: Tuple
+        Columns companions must leave empty unless the key in use
+        includes them (e.g. an events file with a run entity only
+        applies to that run). Defaults to none.
+"""
+
+# Rows of an ``EntityIndex``, replaced as a whole by updates
+_IndexState = namedtuple('_IndexState', ('frame', 'names', 'offsets'))
+
+# Sidecars are merged along the inheritance principle (see ``SidecarChain``)
+# rather than joined as per a ``CompanionRule``
+SIDECAR_KIND: Text = 'sidecar'
+
+_TASK_KEYS: Tuple = (('sub', 'ses', 'task', 'acq', 'run'),
+                     ('sub', 'ses', 'task', 'run'),
+                     ('sub', 'ses', 'task', 'acq'),
+                     ('sub', 'ses', 'task'))
+
+COMPANION_RULES: Dict = {
+    'events': CompanionRule({'bids_suffix': 'events', 'extension': '.tsv'},
+                            _TASK_KEYS, ('acq', 'run')),
+    'beh': CompanionRule({'bids_suffix': 'beh', 'extension': '.tsv'},
+                         _TASK_KEYS, ('acq', 'run')),
+    'anat': CompanionRule({'datatype': 'anat', 'bids_suffix': 'T1w',
+                           'extension': tuple(NIFTI_EXTENSIONS)},
+                          (('sub', 'ses'), ('sub',)), ()),
+    'mask': CompanionRule({'desc': 'brain', 'bids_suffix': 'mask',
+                           'extension': tuple(NIFTI_EXTENSIONS)},
+                          (None,)),
+}
+
+
+class EntityIndex:
+    """
+    In-memory columnar index of the paths in a BIDS dataset.
+
+    Each path is stored as a dictionary-encoded parent directory
+    (relative to ``root``) and a file name packed in a single
+    ``bytes`` buffer. Components follow ``INDEX_COMPONENTS``
+    and missing ones are encoded as empty strings.
+
+    Args:
+        root: str or PathLike
+            Root directory of the indexed dataset.
+
+        frame: DataFrame
+            Columns from ``ENTITY_INDEX_COLUMNS``.
+
+        names: bytes
+            Concatenated UTF-8 encoded file names.
+
+        offsets: ndarray
+            Start offset of each name in ``names``, plus the end offset.
+
+    Notes:
+        Updates (``discard``, ``extend``, ``clear``) replace the columns,
+        names and offsets in a single assignment, and queries read them
+        from one snapshot, so an index can be queried while
+        a ``DatasetWatcher`` updates it.
+
+    Example:
+        >>> index = EntityIndex.build('/data/ds')
+        >>> index.select(sub='01', task='rest', bids_suffix='bold')
+        ('/data/ds/sub-01/func/sub-01_task-rest_bold.nii.gz',)
+        >>> runs = index.groupby('sub', 'ses', bids_suffix='bold')
+    """
+    __slots__ = ('root', '_state')
+
+    def __init__(self, root: Union[Text, PathLike], frame: DataFrame,
+                 names: bytes, offsets: np.ndarray):
+        self.root = os.path.abspath(str(root))
+        self._state = _IndexState(frame, names, offsets)
+
+    def __repr__(self) -> Text:
+        return f"{type(self).__name__}({self.root}, {len(self)} paths)"
+
+    def __len__(self) -> int:
+        return len(self._state.frame)
+
+    def __iter__(self) -> Generator:
+        yield from self.paths()
+
+    @property
+    def frame(self) -> DataFrame:
+        return self._state.frame
+
+    def _view(self):
+        """
+        Returns an index sharing the current rows, unaffected by updates.
+
+        """
+        return type(self)(self.root, *self._state)
+
+    def __getitem__(self, item: int) -> Text:
+        return self.path(item)
+
+    @classmethod
+    def from_rows(cls, root: Union[Text, PathLike],
+                  rows: Iterable[Tuple],
+                  chunksize: int = 2 ** 16):
+        """
+        Returns an ``EntityIndex`` encoded from ``rows``.
+
+        Args:
+            root: str or PathLike
+                Root directory of the indexed dataset.
+
+            rows: Iterable[Tuple]
+                Values following ``ENTITY_INDEX_ROW``, with
+                directory names relative to ``root``.
+
+            chunksize: int (Default = 65536)
+                Number of rows encoded at once.
+        """
+        rows, names, lengths, is_dir = iter(rows), [], [], []
+
+        def _chunks() -> Generator:
+            while True:
+                chunk = list(islice(rows, chunksize))
+                if not chunk:
+                    return
+                _dirnames, _names, _is_dir, *_components = zip(*chunk)
+                _encoded = tuple(map(str.encode, _names))
+                names.append(b''.join(_encoded))
+                lengths.append(np.fromiter(map(len, _encoded), dtype=np.int64,
+                                           count=len(_encoded)))
+                is_dir.append(np.asarray(_is_dir, dtype=bool))
+                yield (_dirnames, *_components)
+
+        columns = _encode_columns(_chunks(), len(ENTITY_INDEX_COLUMNS) - 1)
+        lengths = np.concatenate(lengths) if lengths \
+            else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        is_dir = np.concatenate(is_dir) if is_dir else np.zeros(0, dtype=bool)
+        frame = DataFrame({'dirname': columns[0], 'is_dir': is_dir,
+                           **dict(zip(INDEX_COMPONENTS, columns[1:]))})
+        return cls(root, frame, b''.join(names), offsets)
+
+    @classmethod
+    def concat(cls, root: Union[Text, PathLike], indexes: Iterable):
+        """
+        Returns the concatenation of ``EntityIndex`` objects sharing ``root``.
+
+        Columns are merged with ``union_categoricals`` and file names
+        as raw buffers, without creating an object per path.
+        """
+        indexes = tuple(indexes)
+        if not indexes:
+            return cls.from_rows(root, ())
+        states = tuple(_i._state for _i in indexes)
+        frame = {_col: union_categoricals([_s.frame[_col] for _s in states])
+                 for _col in ENTITY_INDEX_COLUMNS if _col != 'is_dir'}
+        frame['is_dir'] = np.concatenate([_s.frame['is_dir'].to_numpy()
+                                          for _s in states])
+        lengths = np.concatenate([np.diff(_s.offsets) for _s in states])
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(root, DataFrame(frame)[list(ENTITY_INDEX_COLUMNS)],
+                   b''.join(_s.names for _s in states), offsets)
+
+    @classmethod
+    def build(cls, src: Union[Text, PathLike], processes: int = 1):
+        """
+        Returns an ``EntityIndex`` of the dataset containing ``src``.
+
+        Rows are read from the opened ``DatasetIndex`` of the dataset,
+        if any. Otherwise, the dataset is walked once with ``os.scandir``.
+
+        Args:
+            src: str or PathLike
+                Any path within the dataset.
+
+            processes: int (Default = 1)
+                Number of worker processes. If greater than 1, each
+                top-level directory (i.e. 'sub-*', 'derivatives') is
+                walked, parsed and encoded by a ``ProcessPoolExecutor``
+                worker, and the encoded shards are merged with
+                ``EntityIndex.concat``. Ignored when reading rows
+                from an opened ``DatasetIndex``.
+        """
+        root = os.path.abspath(str(BIDSRoot(str(src))))
+        index = DatasetIndex.for_path(root)
+        if index is not None and index.root == root:
+            return cls.from_rows(root, index.rows(*ENTITY_INDEX_ROW))
+        if processes > 1:
+            return cls._build_sharded(root, processes)
+        return cls.from_rows(root, (_row[1:4] + _row[7:]
+                                    for _row in IndexRows(root)))
+
+    @classmethod
+    def _build_sharded(cls, root: Text, processes: int):
+        """
+        Builds the index with one process pool task per top-level directory.
+
+        Shards are returned by workers as encoded columns
+        (``Categorical`` codes and categories, names buffer and offsets)
+        and merged in the order of the sorted top-level listing.
+        """
+        top_rows, shards = [], []
+        for row, descend in sorted(_scan(root, ''), key=lambda _r: _r[0][0]):
+            top_rows.append(row[1:4] + row[7:])
+            if descend:
+                shards.append(row[0])
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            encoded = tuple(executor.map(_build_shard, repeat(root), shards))
+        return cls.concat(root, (cls.from_rows(root, top_rows),
+                                 *(cls(root, *_shard) for _shard in encoded)))
+
+    def clear(self) -> None:
+        """
+        Removes every row from the index.
+
+        """
+        self._state = type(self).from_rows(self.root, ())._state
+
+    def discard(self, *paths: Union[Text, PathLike]) -> int:
+        """
+        Removes ``paths`` from the index, along with paths below them.
+
+        Args:
+            paths: str or PathLike
+                Paths, absolute or relative to ``root``.
+
+        Returns: int
+            The number of rows removed.
+        """
+        state = self._state
+        view = type(self)(self.root, *state)
+        dirnames = state.frame['dirname'].cat
+        categories = dirnames.categories.astype(str)
+        codes = dirnames.codes.to_numpy()
+        drop = np.zeros(len(view), dtype=bool)
+        for _path in paths:
+            _rel = os.path.relpath(os.path.join(self.root, str(_path)),
+                                   self.root)
+            if _rel == os.curdir:
+                drop[:] = True
+                break
+            _dirname, _name = os.path.split(_rel)
+            _code = categories.get_indexer([_dirname])[0]
+            for _pos in np.flatnonzero(codes == _code) if _code >= 0 else ():
+                drop[_pos] |= view.name(_pos) == _name
+            _below = np.flatnonzero((categories == _rel) |
+                                    categories.str.startswith(_rel + os.sep))
+            drop |= np.isin(codes, _below)
+        if not drop.any():
+            return 0
+        lengths = np.diff(state.offsets)
+        names = np.frombuffer(state.names, dtype=np.uint8)
+        offsets = np.zeros(len(view) - drop.sum() + 1, dtype=np.int64)
+        np.cumsum(lengths[~drop], out=offsets[1:])
+        self._state = _IndexState(
+            state.frame.loc[~drop].reset_index(drop=True),
+            names[np.repeat(~drop, lengths)].tobytes(), offsets)
+        return int(drop.sum())
+
+    def extend(self, rows: Iterable[Tuple]) -> int:
+        """
+        Appends ``rows`` to the index.
+
+        Args:
+            rows: Iterable[Tuple]
+                Values following ``ENTITY_INDEX_ROW``, as in ``from_rows``.
+
+        Returns: int
+            The number of rows added.
+        """
+        other = type(self).from_rows(self.root, rows)
+        if not len(other):
+            return 0
+        self._state = type(self).concat(self.root,
+                                        (self._view(), other))._state
+        return len(other)
+
+    def replace(self, paths: Iterable[Union[Text, PathLike]],
+                rows: Iterable[Tuple]) -> Tuple:
+        """
+        Removes ``paths`` and appends ``rows`` in a single update.
+
+        Args:
+            paths: Iterable[str or PathLike]
+                Paths to remove, as in ``discard``.
+
+            rows: Iterable[Tuple]
+                Rows to append, as in ``extend``.
+
+        Returns: Tuple[int, int]
+            The numbers of rows removed and added.
+        """
+        view = self._view()
+        counts = view.discard(*paths), view.extend(rows)
+        self._state = view._state
+        return counts
+
+    def name(self, row: int) -> Text:
+        """
+        Returns the file name at position ``row``.
+
+        """
+        _, names, offsets = self._state
+        return names[offsets[row]:offsets[row + 1]].decode()
+
+    def path(self, row: int) -> Text:
+        """
+        Returns the absolute path at position ``row``.
+
+        """
+        view = self._view()
+        _dirname = view.frame['dirname'].iat[row]
+        return os.path.join(self.root, _dirname, view.name(row))
+
+    def positions(self, rows: Optional[Any] = None) -> np.ndarray:
+        """
+        Returns row positions from a boolean mask or positions, if any.
+
+        """
+        if rows is None:
+            return np.arange(len(self))
+        rows = np.asarray(rows)
+        return np.flatnonzero(rows) if rows.dtype == bool else rows
+
+    def paths(self, rows: Optional[Any] = None) -> Generator:
+        """
+        Yields absolute paths of the selected rows (all by default).
+
+        Args:
+            rows: ndarray, optional
+                Boolean mask (e.g. from ``mask``) or row positions.
+        """
+        view = self._view()
+        dirnames = view.frame['dirname'].cat
+        categories = tuple(os.path.join(self.root, _d)
+                           for _d in dirnames.categories)
+        codes = dirnames.codes.to_numpy()
+        for row in view.positions(rows):
+            yield os.path.join(categories[codes[row]], view.name(row))
+
+    def mask(self, **components) -> np.ndarray:
+        """
+        Returns a boolean mask of the rows matching ``components`` exactly.
+
+        Args:
+            components: Dict
+                Column names from ``ENTITY_INDEX_COLUMNS`` (long entity
+                names accepted) mapped to a value or a collection of
+                accepted values. Entity values may include their key
+                ('sub-01' or '01'). Empty values are ignored.
+
+        Returns: ndarray[bool]
+        """
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        for key, value in components.items():
+            key = _ALIASES.get(key, key)
+            if key == 'is_dir':
+                mask &= frame['is_dir'].to_numpy() == bool(value)
+                continue
+            if value in ('', None):
+                continue
+            values = value if isinstance(value, (list, tuple, set, frozenset)) \
+                else (value,)
+            column = frame[key].cat
+            wanted = column.categories.get_indexer(
+                [_component_value(key, _v) for _v in values])
+            mask &= np.isin(column.codes.to_numpy(), wanted[wanted >= 0])
+        return mask
+
+    def select(self, **components) -> Tuple:
+        """
+        Returns the paths matching ``components`` exactly.
+
+        See ``EntityIndex.mask`` for the keyword semantics.
+        """
+        view = self._view()
+        return tuple(view.paths(view.mask(**components)))
+
+    def groupby(self, *keys: Text, **components) -> Dict:
+        """
+        Returns row positions grouped by the values of columns ``keys``.
+
+        Args:
+            keys: str
+                Column names (e.g. "sub", "ses").
+
+            components: Dict
+                Filters applied beforehand, as in ``EntityIndex.mask``.
+
+        Returns: Dict[Tuple[str], ndarray]
+            Maps each observed combination of values to row positions,
+            to be passed to ``EntityIndex.paths``.
+
+        Example:
+            >>> runs = index.groupby('sub', 'ses', bids_suffix='bold')
+            >>> tuple(index.paths(runs[('01', '1')]))
+        """
+        view = self._view()
+        keys = [_ALIASES.get(_key, _key) for _key in keys]
+        rows = np.flatnonzero(view.mask(**components))
+        groups = view.frame[keys].iloc[rows].groupby(
+            keys, observed=True, sort=True).indices
+        return {(_key if isinstance(_key, tuple) else (_key,)): rows[_pos]
+                for _key, _pos in groups.items()}
+
+    def companions(self, paths: Iterable[Union[Text, PathLike]],
+                   kinds: Optional[Iterable[Text]] = None) -> DataFrame:
+        """
+        Returns the companion files of many runs as a table.
+
+        Each kind of companion (see ``COMPANION_RULES``) is found by
+        joining the parsed components of ``paths`` with the indexed
+        files having the rule's components, on the rule's keys.
+        Runs left unmatched by a key are joined again on the next one
+        (e.g. anatomical scans are looked up without the session).
+        When several files match a run, the one with the fewest
+        entities wins (e.g. the raw scan over derived ones).
+        The "sidecar" kind is the run's metadata merged along its
+        sidecars (see ``GetSidecar``), listed from the index.
+
+        Args:
+            paths: Iterable[str or PathLike]
+                Paths of runs (e.g. BOLD scans) within the dataset.
+
+            kinds: Iterable[str], optional
+                "sidecar" or keys of ``COMPANION_RULES``.
+                Defaults to all of them.
+
+        Returns: DataFrame
+            One column per kind, indexed by run path: a metadata
+            dictionary for "sidecar", absolute paths for the others.
+            Companions not found are empty (strings or dictionaries).
+
+        Example:
+            >>> index = EntityIndex.build('/data/ds')
+            >>> runs = index.select(bids_suffix='bold', extension='.nii.gz')
+            >>> index.companions(runs)[['events', 'anat']]
+        """
+        kinds = tuple(kinds) if kinds else \
+            (SIDECAR_KIND,) + tuple(COMPANION_RULES)
+        paths = tuple(map(str, paths))
+        runs = parse_many(paths).rename(columns=_ALIASES)
+        runs = runs[list(INDEX_COMPONENTS)].astype(str).reset_index(drop=True)
+        table = DataFrame({_kind: np.full(len(paths), '', dtype=object)
+                           for _kind in kinds},
+                          index=Index(paths, name='path'))
+        view = self._view()
+        for kind in kinds:
+            table[kind] = view._sidecars(paths) if kind == SIDECAR_KIND \
+                else view._join(runs, COMPANION_RULES[kind])
+        return table
+
+    def _sidecars(self, paths: Tuple) -> np.ndarray:
+        """
+        Returns the merged sidecar metadata of each path in ``paths``.
+
+        JSON files are listed from the index and each is read once.
+        """
+        listed = {}
+        rows = self.mask(is_dir=False, extension='.json')
+        for _path in self.paths(rows):
+            _dirname, _name = os.path.split(_path)
+            listed.setdefault(_dirname, []).append(_name)
+        listed = {_dirname: tuple(sorted(_names))
+                  for _dirname, _names in listed.items()}
+        contents, merged = {}, {}
+        found = np.empty(len(paths), dtype=object)
+        for _pos, _path in enumerate(paths):
+            chain = SidecarChain(_path, root=self.root,
+                                 listing=lambda _d: listed.get(_d, ()))
+            if chain not in merged:
+                merged[chain] = {}
+                for _json in chain:
+                    if _json not in contents:
+                        contents[_json] = _read_json(_json)
+                    merged[chain].update(contents[_json])
+            found[_pos] = dict(merged[chain])
+        return found
+
+    def _join(self, runs: DataFrame, rule: CompanionRule) -> np.ndarray:
+        """
+        Returns the companion path of each run in ``runs`` as per ``rule``.
+
+        """
+        found = np.full(len(runs), '', dtype=object)
+        rows = self.positions(self.mask(is_dir=False, **rule.components))
+        if not len(rows) or not len(runs):
+            return found
+        candidates = self.frame.iloc[rows][list(INDEX_COMPONENTS)].astype(str)
+        candidates['path'] = tuple(self.paths(rows))
+        candidates['n_entities'] = (
+            candidates[list(ENTITY_STRINGS)] != '').sum(axis=1)
+        candidates = candidates.sort_values(['n_entities', 'path'])
+        free = [_e for _e in ENTITY_STRINGS if _e not in rule.components]
+        unscoped = {_key: (candidates[[_c for _c in rule.scope
+                                       if _c not in _key]] == ''
+                           ).all(axis=1)
+                    for _key in rule.keys if _key is not None}
+        for keys in rule.keys:
+            pending = runs.loc[found == '']
+            if keys is not None:
+                groups = ((tuple(keys), pending),)
+            else:
+                own = (pending[free] != '').apply(
+                    lambda _row: tuple(compress(free, _row)), axis=1)
+                groups = pending.groupby(own, sort=False) if len(pending) \
+                    else ()
+            for key, group in groups:
+                if not key:
+                    continue
+                _pool = candidates.loc[unscoped[key]] if key in unscoped \
+                    else candidates
+                key = list(key)
+                joined = group[key].merge(
+                    _pool.drop_duplicates(key)[key + ['path']],
+                    on=key, how='left')['path'].fillna('').to_numpy()
+                found[group.index.to_numpy()] = joined
+        return found
+
+
+def _build_shard(root: Text, rel_dir: Text) -> Tuple:
+    """
+    Returns the encoded columns of the paths below ``rel_dir``.
+
+    Runs in ``EntityIndex.build`` worker processes.
+    """
+    shard = EntityIndex.from_rows(root, (_row[1:4] + _row[7:] for _row
+                                         in IndexRows(root, rel_dir)))
+    return tuple(shard._state)
+
+
+__all__: List = [
+    "EntityIndex", "ENTITY_INDEX_COLUMNS", "ENTITY_INDEX_ROW",
+    "CompanionRule", "COMPANION_RULES", "SIDECAR_KIND"
+]
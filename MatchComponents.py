@@ -4,21 +4,147 @@ Path matching based on BIDS entity and non-entity components.
 
 """
 
+import heapq
 import os
 import re
-from glob import iglob
+from operator import eq
 from os import PathLike
-from typing import Generator, Iterable, Optional, Text, Union
+from typing import (
+    AsyncGenerator, Callable, Dict, FrozenSet, Generator, Iterable, List,
+    Optional, Text, Tuple, Union
+)
 
-from .functions.BIDSPathCoreFunctions import ComponentsGen
+from .constants.bidspathlib_docs import (
+    DATATYPE_STRINGS, ENTITY_STRINGS, NIFTI_EXTENSIONS
+)
+from .DatasetIndex import DatasetIndex, INDEX_COMPONENTS, _component_value
+from .functions.BIDSPathCoreFunctions import ComponentsGen, split_components
+from .general_methods import aiter_thread, scandir_glob
 
 __path__ = [os.path.join('..', '__init__.py')]
 
+# Position of each component in the tuples returned by ``_flat_components``
+_POSITIONS: Dict = {_key: _i for _i, _key in enumerate(
+    ENTITY_STRINGS + ('bids_suffix', 'extension', 'datatype'))}
+
+
+# Nifti extensions are interchangeable when matching components
+_NIFTI_CLASS: FrozenSet = frozenset(NIFTI_EXTENSIONS)
+
+
+def _accepted(key: Text, value: Text) -> FrozenSet:
+    """
+    Returns the parsed values accepted for component ``key``.
+
+    """
+    value = _component_value(key, value)
+    return _NIFTI_CLASS if key == 'extension' and value in _NIFTI_CLASS \
+        else frozenset((value,))
+
+
+class _Descending(str):
+    """
+    String ordered in reverse, so that a min-heap pops the greatest first.
+
+    """
+    __slots__ = ()
+
+    def __lt__(self, other) -> bool:
+        return str.__gt__(self, other)
+
+
+def _flat_components(src: Union[Text, PathLike]) -> Tuple:
+    """
+    Returns the parsed entity values, suffix, extension and datatype of ``src``.
+
+    """
+    _parsed = split_components(src)
+    return (*_parsed.entities, _parsed.bids_suffix,
+            _parsed.extension, _parsed.datatype)
+
 
 def score_matches(path0: Union[Text, PathLike],
                   path1: Union[Text, PathLike]) -> int:
-    set0, set1 = set(ComponentsGen(path0)), set(ComponentsGen(path1))
-    return len(set0.intersection(set1))
+    """
+    Returns the number of components shared by two paths.
+
+    Components missing from both paths count as shared.
+    """
+    return sum(map(eq, _flat_components(path0), _flat_components(path1)))
+
+
+def ComponentsFilter(components: Dict) -> Callable:
+    """
+    Returns a predicate telling if a path has all the given components.
+
+    BIDS components are compared exactly to the path's parsed
+    components (i.e. 'sub-1' does not match 'sub-10'), except that
+    Nifti extensions match each other ('.nii' matches '.nii.gz').
+    Other keys are looked up as substrings of the path.
+    Components assigned an empty string are not compared.
+
+    Args:
+        components: Dict
+            Components as yielded by ``ComponentsGen``.
+            Entity values may include their key ('sub-01' or '01').
+
+    Returns: Callable[[str], bool]
+    """
+    fixed = tuple((_POSITIONS[_key], _accepted(_key, _value))
+                  for _key, _value in components.items()
+                  if _value and _key in _POSITIONS)
+    loose = tuple(str(_value) for _key, _value in components.items()
+                  if _value and _key not in _POSITIONS)
+
+    def _match(path: Text) -> bool:
+        if fixed:
+            _flat = _flat_components(path)
+            if any(_flat[_i] not in _values for _i, _values in fixed):
+                return False
+        return all(_value in path for _value in loose)
+
+    return _match
+
+
+def TraversalPlan(components: Dict) -> Callable:
+    """
+    Returns a predicate telling if a directory may contain matches.
+
+    Turns the 'sub', 'ses' and 'datatype' components of a search
+    into a directory-level plan: subject and session directories
+    named differently, and datatype directories (within a subject
+    or session directory) other than ``datatype`` are pruned along
+    with their whole subtree. Other directories (e.g. 'derivatives',
+    'sourcedata') are always descended, as they may hold
+    matching subject directories.
+
+    Args:
+        components: Dict
+            Components as yielded by ``ComponentsGen``.
+            Components assigned an empty string are not fixed.
+
+    Returns: Callable[[os.DirEntry], bool]
+        Suitable as the ``descend`` argument of ``scandir_walk``.
+
+    Example:
+        >>> descend = TraversalPlan({'sub': 'sub-01', 'datatype': 'anat'})
+        >>> tuple(scandir_walk('/data/ds', descend=descend))
+    """
+    fixed = {f'{_key}-': f'{_key}-{_component_value(_key, components[_key])}'
+             for _key in ('sub', 'ses') if components.get(_key)}
+    datatype = components.get('datatype') or None
+
+    def _descend(entry: os.DirEntry) -> bool:
+        name = entry.name
+        for prefix, expected in fixed.items():
+            if name.startswith(prefix):
+                return name == expected
+        if datatype is None or name not in DATATYPE_STRINGS:
+            return True
+        parent = os.path.basename(os.path.dirname(entry.path))
+        return name == datatype or not parent.startswith(('sub-', 'ses-'))
+
+    return _descend
 
 
 def MatchComponents(dst: Union[Text, PathLike],
@@ -26,6 +152,7 @@ def MatchComponents(dst: Union[Text, PathLike],
                     src: Optional[Union[Text, PathLike]] = None,
                     exclude: Optional[Iterable[Text]] = None,
                     pattern: Optional[Text] = None,
+                    limit: Optional[int] = None,
                     **kwargs) -> Generator:
     """
     Returns matching filenames based on the BIDS specification.
@@ -64,6 +191,10 @@ def MatchComponents(dst: Union[Text, PathLike],
         pattern: Iterable[str], optional
             Should match the '.gitignore' syntax.
 
+        limit: int, optional
+            Maximum number of paths yielded.
+            Only the best ``limit`` candidates are kept while ranking.
+
         kwargs: Dict
             Used to overwrite or add different components than
             those found within path ``src``.
@@ -71,17 +202,70 @@ def MatchComponents(dst: Union[Text, PathLike],
             by assigning an empty string ('') to a given key.
 
     Returns: Generator
-        Yields unique file or directory paths matching the criteria.
+        Yields unique file or directory paths matching the criteria,
+        the paths sharing most components with ``src`` first.
 
+    Notes:
+        If a ``DatasetIndex`` covering ``dst`` is opened,
+        candidates are listed from it instead of the file system.
+        Otherwise, directories are listed concurrently
+        (see ``general_methods.scandir_walk``), only descending
+        into those allowed by the ``TraversalPlan`` of the components.
+        Paths with the same score are yielded in descending order.
+        Ranked paths are popped from a heap, so the first ones
+        are yielded without sorting every candidate.
     """
     kwargs, src = kwargs if kwargs else {}, src if src else ''
-    components = dict((ComponentsGen(src, **kwargs))).values()
+    components = dict(ComponentsGen(src, **kwargs))
     pattern = pattern if pattern else '**/**'
-    paths = set(iglob(os.path.join(str(dst), pattern), recursive=recursive))
+    index = DatasetIndex.for_path(dst)
+    if index:
+        # Exact equality of BIDS components is answered by the index
+        _indexed = {_key: _value for _key, _value in components.items()
+                    if _key in INDEX_COMPONENTS
+                    and len(_accepted(_key, _value)) == 1}
+        paths = set(index.glob(dst, pattern, recursive=recursive,
+                               **_indexed))
+        _match = ComponentsFilter({_key: _value for _key, _value
+                                   in components.items()
+                                   if _key not in _indexed})
+    else:
+        paths = set(scandir_glob(str(dst), pattern, recursive=recursive,
+                                 descend=TraversalPlan(components)))
+        _match = ComponentsFilter(components)
     if exclude:
         ex = re.compile('|'.join(exclude))
         paths = set(filter(lambda p: not bool(ex.search(p)), paths))
-    paths = set(filter(lambda p: all((x in p for x in components)), paths))
-    paths = ((p, score_matches(src, p)) for p in paths)
-    yield from iter(p[0] for p in sorted(paths, key=lambda s: s[::-1],
-                                         reverse=True))
+    _src = _flat_components(src)
+    ranked = [(-sum(map(eq, _src, _flat_components(_p))),
+               _Descending(_p), _p) for _p in filter(_match, paths)]
+    if limit is not None:
+        yield from (_item[-1] for _item in heapq.nsmallest(limit, ranked))
+        return
+    heapq.heapify(ranked)
+    while ranked:
+        yield heapq.heappop(ranked)[-1]
+
+
+async def AMatchComponents(dst: Union[Text, PathLike],
+                           recursive: bool = False,
+                           src: Optional[Union[Text, PathLike]] = None,
+                           exclude: Optional[Iterable[Text]] = None,
+                           pattern: Optional[Text] = None,
+                           **kwargs) -> AsyncGenerator:
+    """
+    Asynchronous ``MatchComponents``.
+
+    The file system is searched in the running event loop's
+    default executor. Matches are yielded once ranked.
+    See ``help(MatchComponents)`` for parameters.
+    """
+    async for path in aiter_thread(MatchComponents, dst, recursive=recursive,
+                                   src=src, exclude=exclude, pattern=pattern,
+                                   **kwargs):
+        yield path
+
+
+__all__: List = [
+    "MatchComponents", "AMatchComponents", "ComponentsFilter", "TraversalPlan"
+]
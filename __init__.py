@@ -1,20 +1,26 @@
 
 import sys
 
-from .BIDSPath import BIDSPath
+from .BIDSContext import BIDSContext
+from .BIDSPath import BIDSPath, LazyBIDSPath
 from .BIDSPathLike import BIDSPathLike
+from .DatasetIndex import DatasetIndex
+from .DatasetWatcher import DatasetWatcher
+from .EntityIndex import EntityIndex
 from .constants import *
 from .core import *
 from .functions import core_functions, file_functions, bids_path_functions
 from .general_methods import *
-from .MatchComponents import MatchComponents
+from .MatchComponents import AMatchComponents, MatchComponents
 
 
 __all__ = [
     "bids_dir", "bids_file", "core_functions", "file_functions",
     "bids_path_functions", "general_methods", "BIDSDir", "BIDSFile",
     "BIDSPathAbstract", "BIDSDirAbstract", "BIDSFileAbstract",
-    "BIDSPathLike", "BIDSPath", "MatchComponents",
+    "BIDSPathLike", "BIDSPath", "LazyBIDSPath", "BIDSContext", "DatasetIndex", "DatasetWatcher",
+    "EntityIndex",
+    "MatchComponents", "AMatchComponents",
     "BIDSPathConstants", "BIDS_DATATYPES", "FMRIPrepEntities",
     "Modalities", "DataModality.py",
     "LCStrategyDocs", "BIDSDocs", "BidsDocs",
@@ -1,17 +1,27 @@
 
 import os
+import sys
+from collections import namedtuple
 from collections.abc import Collection
 from os import PathLike
-from os.path import isdir
-from typing import Any, Iterator, Text, Union
+from typing import (
+    Any, AsyncIterator, Callable, Iterable, Iterator, Optional, Text, Union
+)
 
+from ..DatasetIndex import DatasetIndex
 from ..core.BIDSPathAbstract import BIDSPathAbstract
 from ..core.bids_file.BIDSFile import BIDSFile
 from ..constants.bidspathlib_docs import ENTITY_STRINGS
-from ..general_methods import flatten, is_hidden
+from ..general_methods import (
+    aiter_thread, cached_isdir, cached_stat, get_stat_cache, is_hidden,
+    scandir_glob, GitIgnoreMatcher
+)
 
 _bases = (BIDSPathAbstract, Collection)
 
+# Children of a directory, as of its modification time ``mtime``
+_Listing = namedtuple('_Listing', ('mtime', 'children', 'positions'))
+
 __path__ = [os.path.join('..', '__init__.py')]
 
 
@@ -21,7 +31,7 @@ class BIDSDirAbstract(*_bases):
 
     """
 
-    __slots__, __bases__ = (), _bases
+    __slots__, __bases__ = ('_listed',), _bases
     def __type__(self): return type(self)
 
     def __subclasscheck__(self, subclass) -> bool:
@@ -30,50 +40,140 @@ class BIDSDirAbstract(*_bases):
 
     def __instancecheck__(self, instance) -> bool:
         return all((hasattr(instance, 'entities'),
-                    isdir(instance)))
+                    cached_isdir(instance)))
 
-    def __getitem__(self, i: int): return tuple(self.iterdir())[i]
+    def __getitem__(self, i: Union[int, slice]):
+        return self._listing().children[i]
 
     def __contains__(self, item: Any) -> bool:
-        as_cls = tuple(self.iterdir())
-        as_path_type = map(lambda p: p.path, as_cls)
-        as_str = map(lambda p: p.path.__fspath__(), as_cls)
-        return item in set(flatten((as_cls, as_path_type, as_str)))
+        try:
+            return os.path.normpath(os.fspath(item)) in \
+                self._listing().positions
+        except TypeError:
+            return False
 
     def __len__(self) -> int:
-        return len(os.listdir(self.path))
+        return len(self._listing().children)
 
     def __iter__(self) -> Iterator:
-        yield from self.iterdir()
+        return iter(self._listing().children)
 
     @classmethod
-    def __prepare__(cls, src: Union[Text, PathLike]):
+    def __prepare__(cls, src: Union[Text, PathLike],
+                    root: Optional[Union[Text, PathLike]] = None):
         subclass_dict = BIDSDirAbstract.subclass_dict()
         # if not cls.isdir(src):
         #     return src
         _mapper = (
-            (cls.is_datatype_dir(src), 'Datatype'),
-            (cls.is_session_dir(src), 'Session'),
-            (cls.is_subject_dir(src), 'Subject'),
-            (cls.is_bids_root_dir(src), 'Dataset'),
-            (cls.isderivatives(src), 'Derivatives')
+            (cls.is_datatype_dir(src, root=root), 'Datatype'),
+            (cls.is_session_dir(src, root=root), 'Session'),
+            (cls.is_subject_dir(src, root=root), 'Subject'),
+            (cls.is_bids_root_dir(src, root=root), 'Dataset'),
+            (cls.isderivatives(src, root=root), 'Derivatives')
         )
         try:
-            assert cls.isdir(src)
+            assert cls.isdir(src, root=root)
             _cls = next(filter(lambda item: bool(item[0]), _mapper))
             keywords = dict(zip(ENTITY_STRINGS, super().__get_entities__(src)))
-            subclass = subclass_dict[_cls[1]](src)
+            subclass = subclass_dict[_cls[1]](src, root=root)
             subclass.__set_from_dict__(keywords)
             return subclass
         except StopIteration:
             return src
 
+    def _listing(self) -> _Listing:
+        """
+        Returns the cached children of this directory.
+
+        Children are listed by ``iterdir`` on first access, and listed
+        again only once the directory's modification time has changed.
+        ``positions`` maps each child's path string to its position,
+        for constant-time membership and index lookups.
+        """
+        mtime = cached_stat(self.path).st_mtime_ns
+        try:
+            listed = object.__getattribute__(self, '_listed')
+            if listed.mtime == mtime:
+                return listed
+        except AttributeError:
+            pass
+        children = tuple(self.iterdir())
+        positions = {os.path.normpath(os.fspath(_child)): _i
+                     for _i, _child in enumerate(children)}
+        listed = _Listing(mtime, children, positions)
+        object.__setattr__(self, '_listed', listed)
+        return listed
+
+    def _position(self, item: Any, start: int = 0,
+                  stop: int = sys.maxsize) -> int:
+        """
+        Returns the position of child ``item`` in this directory.
+
+        Raises:
+            ValueError: if ``item`` is not a child within [start, stop).
+        """
+        try:
+            position = self._listing().positions[
+                os.path.normpath(os.fspath(item))]
+        except (KeyError, TypeError):
+            raise ValueError(f'{item} is not in {self}') from None
+        if not start <= position < stop:
+            raise ValueError(f'{item} is not in {self}')
+        return position
+
+    def _ignored(self) -> Callable:
+        """
+        Returns a predicate telling if a path is to be skipped.
+
+        The predicate is called with a path and whether it is a directory.
+        Hidden paths and those matching the '.bidsignore' patterns
+        are skipped. Patterns are compiled once per dataset.
+        """
+        context = self.context
+        if context is not None:
+            return lambda _path, is_dir: is_hidden(_path) or \
+                context.is_ignored(_path, is_dir=is_dir)
+        try:
+            _root = os.fspath(self.dataset_root)
+            matcher = GitIgnoreMatcher.from_file(
+                os.path.join(_root, '.bidsignore'))
+        except (FileNotFoundError, TypeError):
+            return lambda _path, is_dir: is_hidden(_path)
+        return lambda _path, is_dir: is_hidden(_path) or \
+            matcher(os.path.relpath(_path, _root), is_dir=is_dir)
+
+    def _child(self, path: Text, is_dir: bool) -> Any:
+        """
+        Instantiates the ``BIDSPath`` of path ``path`` below ``self``.
+
+        """
+        root = self.declared_root
+        return BIDSDirAbstract.__prepare__(path, root=root) if is_dir \
+            else BIDSFile(path, root=root)
+
+    def _children(self, paths: Iterable[Text]) -> Iterator:
+        """
+        Yields the ``BIDSPath`` of each path not ignored, in order.
+
+        """
+        ignored = self._ignored()
+        for path in map(os.fspath, paths):
+            is_dir = cached_isdir(path)
+            if ignored(path, is_dir):
+                continue
+            child = self._child(path, is_dir)
+            if child is not None:
+                yield child
+
     def glob(self, pattern: Text) -> Iterator:
         """
         Yields all existing paths matching a relative pattern in this subtree.
 
         Does not yield any result for the special paths
         '.' and '..'. and those defined in the '.bidsignore' file.
+        Answered from the opened ``DatasetIndex`` covering ``self``, if any.
+        Otherwise, directories are listed concurrently.
+        Paths are yielded as they are found.
 
         Args:
             pattern: str
@@ -82,12 +182,10 @@ class BIDSDirAbstract(*_bases):
         Returns: Iterator
 
         """
-        _cls = self.__bases__[0].__subclasses__()[1]  # BIDSDirAbstract
-        # Remove files defined in the ".bidsignore" file
-        _paths = set(self.path.glob(pattern)).difference(set(self.bidsignore))
-        # Remove hidden files
-        _paths = set(filter(lambda p: not is_hidden(p), _paths))
-        yield from map(_cls.__prepare__, set(map(BIDSFile, _paths)))
+        index = DatasetIndex.for_path(self.path)
+        yield from self._children(
+            index.glob(self.path, pattern) if index
+            else scandir_glob(self.path, pattern))
 
     def iterdir(self) -> Iterator:
         """
@@ -95,15 +193,22 @@ class BIDSDirAbstract(*_bases):
 
         Does not yield any result for the special paths
         '.' and '..'. and those defined in the '.bidsignore' file.
+        The directory is listed by a single ``os.scandir`` call
+        and paths are yielded lazily, in listing order.
 
         Returns: Iterator
         """
-        _cls = self.__bases__[0].__subclasses__()[1]  # BIDSDirAbstract
-        # Remove files defined in the ".bidsignore" file
-        _paths = set(self.path.iterdir()).difference(set(self.bidsignore))
-        # Remove hidden files
-        _paths = set(filter(lambda p: not is_hidden(p), _paths))
-        yield from map(_cls.__prepare__, set(map(BIDSFile, _paths)))
+        ignored, cache = self._ignored(), get_stat_cache()
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                is_dir = entry.is_dir()
+                if ignored(entry.path, is_dir):
+                    continue
+                if cache is not None:
+                    cache.feed(entry)
+                child = self._child(entry.path, is_dir)
+                if child is not None:
+                    yield child
 
     def rglob(self, pattern: Text) -> Iterator:
         """
@@ -111,6 +216,9 @@ class BIDSDirAbstract(*_bases):
 
         Does not yield any result for the special paths
         '.' and '..'. and those defined in the '.bidsignore' file.
+        Answered from the opened ``DatasetIndex`` covering ``self``, if any.
+        Otherwise, directories are listed concurrently.
+        Paths are yielded as they are found.
 
         Args:
             pattern: str
@@ -118,9 +226,35 @@ class BIDSDirAbstract(*_bases):
 
         Returns: Iterator
         """
-        _cls = self.__bases__[0].__subclasses__()[1]  # BIDSDirAbstract
-        # Remove files defined in the ".bidsignore" file
-        _paths = set(self.path.rglob(pattern)).difference(set(self.bidsignore))
-        # Remove hidden files
-        _paths = set(filter(lambda p: not is_hidden(p), _paths))
-        yield from map(_cls.__prepare__, set(map(BIDSFile, _paths)))
+        yield from self.glob(f'**/{pattern}')
+
+    # Asynchronous counterparts
+    async def aglob(self, pattern: Text) -> AsyncIterator:
+        """
+        Asynchronous ``glob``.
+
+        The file system is searched in the running event loop's
+        default executor and paths are yielded as they are found.
+        """
+        async for path in aiter_thread(self.glob, pattern):
+            yield path
+
+    async def aiterdir(self) -> AsyncIterator:
+        """
+        Asynchronous ``iterdir``.
+
+        The directory is listed in the running event loop's
+        default executor and paths are yielded as they are found.
+        """
+        async for path in aiter_thread(self.iterdir):
+            yield path
+
+    async def arglob(self, pattern: Text) -> AsyncIterator:
+        """
+        Asynchronous ``rglob``.
+
+        The file system is searched in the running event loop's
+        default executor and paths are yielded as they are found.
+        """
+        async for path in aiter_thread(self.rglob, pattern):
+            yield path
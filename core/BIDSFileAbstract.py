@@ -4,14 +4,16 @@ import os
 from io import BufferedIOBase, BytesIO
 from nibabel.nifti1 import Nifti1Image
 from os import PathLike
-from os.path import isfile
-from pathlib import Path
-from typing import Dict, Text, Union
+from typing import Dict, Optional, Text, Union
 
-from ..general_methods import docstring_parameter, GetHashCheckSum
+from ..general_methods import (
+    cached_isfile, docstring_parameter, GetHashCheckSum, to_thread
+)
 from ..constants.bidspathlib_docs import ENTITY_STRINGS
+from ..BIDSContext import BIDSContext
 from ..core.BIDSPathAbstract import BIDSPathAbstract
-from ..functions.BIDSFileFunctions import ShapeLength
+from ..functions.BIDSFileFunctions import GetSidecar, ShapeLength
+from ..functions.BIDSFileID import FileClassName
 from ..MatchComponents import MatchComponents
 
 __path__ = [os.path.join('..', '__init__.py')]
@@ -34,40 +36,29 @@ class BIDSFileAbstract(BIDSPathAbstract):
 
     def __subclasscheck__(self, subclass) -> bool:
         conditions = (hasattr(self, 'entities'),
-                      isfile(str(self.path)))
+                      cached_isfile(str(self.path)))
         return all(conditions)
 
     def __instancecheck__(self, instance) -> bool:
         conditions = (hasattr(instance, 'entities'),
-                      isfile(str(instance.path)))
+                      cached_isfile(str(instance.path)))
         return all(conditions)
 
     @classmethod
     def __prepare__(cls, /, src: Union[Text, PathLike], **kwargs):
         subclass_dict = BIDSFileAbstract.subclass_dict()
-        if not isfile(str(src)):
+        root = kwargs.get('root')
+        if not super().isfile(str(src), root=root):
             return src
-        try:
-            _mapper = (
-                (super().is_3d_file(src), 'MRIFile'),
-                (super().is_4d_file(src), 'FMRIFile'),
-                (super().is_event_file(src), 'EventsFile'),
-                (super().is_beh_file(src), 'BehFile'),
-                (super().is_physio_file(src), 'PhysioFile'),
-                (super().is_sidecar_file(src), 'SideCarFile'),
-                (Path(src).name == 'CHANGES', 'ChangesFile'),
-                (Path(src).name == 'README', 'ReadMeFile'),
-                (Path(src).name == 'LICENSE', 'LicenseFile'),
-                (Path(src).name == '.gitattributes', 'GitAttributesFile')
-            )
-            _cls = next(filter(lambda item: bool(item[0]), _mapper))
-            keywords = dict(zip(ENTITY_STRINGS,
-                                super().__get_entities__(src)))
-            subclass = subclass_dict[_cls[1]](src)
-            subclass.__set_from_dict__(keywords)
-            return subclass
-        except StopIteration:
+        _cls = FileClassName(src, root=root)
+        if not _cls:
             print(src)
+            return
+        keywords = dict(zip(ENTITY_STRINGS,
+                            super().__get_entities__(src)))
+        subclass = subclass_dict[_cls](src, root=root)
+        subclass.__set_from_dict__(keywords)
+        return subclass
 
     @property
     def buf(self) -> BufferedIOBase:
@@ -76,25 +67,24 @@ class BIDSFileAbstract(BIDSPathAbstract):
 
     # General
     @staticmethod
-    def get_sidecar(src: Union[Text, PathLike], **kwargs
-                    ) -> Union[Text, PathLike]:
-        """
-        Returns the associated sidecar of file ``src``, if any.
+    @docstring_parameter(FileClassName.__doc__)
+    def file_class_name(src: Union[Text, PathLike],
+                        root: Optional[Union[Text, PathLike]] = None
+                        ) -> Text:
+        """{0}\n"""
+        return FileClassName(src, root=root)
 
+    @staticmethod
+    @docstring_parameter(GetSidecar.__doc__)
+    def get_sidecar(src: Union[Text, PathLike],
+                    root: Optional[Union[Text, PathLike]] = None) -> Dict:
+        """{0}
+        Merged metadata is cached by the ``BIDSContext`` of the
+        dataset, unless ``root`` is provided; a copy is returned.
         """
-        kwargs = kwargs if kwargs else {}
-        _dst = BIDSRoot(src) if IsEvent(src) else dirname(src)
-        keywords = {**{'extension': '.json'}, **kwargs}
-        sc_path = filter(IsSidecar,
-                         MatchComponents(_dst, src=src, exclude=exclude,
-                                         recursive=True, **keywords))
-        try:
-            with open(next(sc_path), mode='r') as jfile:
-                sidecar = json.load(jfile)
-                jfile.close()
-                return sidecar
-        except (StopIteration, FileNotFoundError, TypeError):
-            return ''
+        context = BIDSContext.for_path(src) if root is None else None
+        return dict(context.sidecar(src)) if context is not None \
+            else GetSidecar(src, root=root)
 
     @staticmethod
     @docstring_parameter(GetHashCheckSum.__doc__)
@@ -238,6 +228,54 @@ class BIDSFileAbstract(BIDSPathAbstract):
         except NIFTI_ERRORS[:-1]:
             return Series([], dtype='string')
 
+    # Asynchronous companion lookups
+    # Run in the running event loop's default executor
+    @staticmethod
+    async def aget_sidecar(src: Union[Text, PathLike],
+                           root: Optional[Union[Text, PathLike]] = None
+                           ) -> Dict:
+        """
+        Asynchronous ``get_sidecar``.
+
+        """
+        return await to_thread(BIDSFileAbstract.get_sidecar, src, root=root)
+
+    @staticmethod
+    async def aget_anat_img(src: Union[Text, PathLike], **kwargs
+                           ) -> Union[Text, PathLike]:
+        """
+        Asynchronous ``get_anat_img``.
+
+        """
+        return await to_thread(BIDSFileAbstract.get_anat_img, src, **kwargs)
+
+    @staticmethod
+    async def aget_beh_file(src: Union[Text, PathLike], **kwargs
+                           ) -> Union[Text, PathLike]:
+        """
+        Asynchronous ``get_beh_file``.
+
+        """
+        return await to_thread(BIDSFileAbstract.get_beh_file, src, **kwargs)
+
+    @staticmethod
+    async def aget_brain_mask(src: Union[Text, PathLike], **kwargs
+                             ) -> Union[Text, PathLike]:
+        """
+        Asynchronous ``get_brain_mask``.
+
+        """
+        return await to_thread(BIDSFileAbstract.get_brain_mask, src, **kwargs)
+
+    @staticmethod
+    async def aget_events_file(src: Union[Text, PathLike], **kwargs
+                              ) -> Union[Text, PathLike]:
+        """
+        Asynchronous ``get_events_file``.
+
+        """
+        return await to_thread(BIDSFileAbstract.get_events_file, src, **kwargs)
+
     def view_sidecar(self, indent: int = 2, **kwargs):
         """
         Prints contents of the sidecar to stdout.
@@ -253,9 +291,16 @@ class BIDSFileAbstract(BIDSPathAbstract):
 
     # Read-only properties
     @property
-    def sidecar(self) -> Union[Text, PathLike, Dict]:
-        """{0}\n"""
-        return self.get_sidecar(self.path)
+    def sidecar(self) -> Dict:
+        """
+        Metadata of this file merged along the inheritance principle.
+
+        Read from the files once per dataset (see ``BIDSContext.sidecar``);
+        a copy is returned.
+        """
+        context = self.context
+        return dict(context.sidecar(self.path)) if context is not None \
+            else GetSidecar(self.path, root=self.declared_root)
 
     @staticmethod
     @docstring_parameter(ShapeLength.__doc__)
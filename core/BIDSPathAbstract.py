@@ -7,16 +7,20 @@ from abc import ABC
 from bids_validator import BIDSValidator
 from collections import UserString
 from os import PathLike, stat_result
-from os.path import isdir, isfile, samefile
+from os.path import samefile
 from pathlib2 import Path
 from typing import (
-    Any, Dict, Generator, Iterable, List,
+    Any, AsyncGenerator, Dict, Generator, Iterable, List,
     Optional, Text, Tuple, Type, Union
 )
 
-from ..general_methods import docstring_parameter, SetFromDict
+from ..general_methods import (
+    cached_exists, cached_isdir, cached_isfile, cached_stat,
+    docstring_parameter, get_stat_cache, SetFromDict
+)
+from ..BIDSContext import BIDSContext
 from ..BIDSPathLike import BIDSPathLike
-from ..MatchComponents import MatchComponents
+from ..MatchComponents import AMatchComponents, MatchComponents
 from ..constants import DataModality
 from ..functions.BIDSFileID import (
     IsNifti, Is4D, Is3D, IsEvent, IsBeh, IsPhysio, IsSidecar
@@ -26,7 +30,8 @@ from ..functions.BIDSDirID import (
     IsDerivatives, IsDerivativesRoot, IsFMRIPrepDerivatives
 )
 from ..functions.BIDSPathCoreFunctions import (
-    find_datatype, find_entity, find_extension, find_bids_suffix
+    find_datatype, find_entity, find_extension, find_bids_suffix,
+    pure_isdir, pure_isfile, split_components
 )
 from ..functions.BIDSPathFunctions import (
     DatasetName, GetBidsignore, FormattedCtime,
@@ -65,7 +70,7 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
         ``__getitem__``, ``__len__``,
         ``__fspath__`` and ``__get_entities__``.
     """
-    __slots__ = ()
+    __slots__ = ('_parsed', '_context', '_root')
 
     def __type__(self):
         return type(self)
@@ -75,6 +80,22 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     __reversed__, __getnewargs__, __weakref__ = [NotImplemented] * 3
     __dict__ = NotImplemented
 
+    def __init__(self, seq: Union[Text, PathLike],
+                 root: Optional[Union[Text, PathLike]] = None):
+        """
+        Args:
+            seq: str or PathLike
+                Path of the file or directory.
+
+            root: str or PathLike (optional)
+                Declared top-level directory of the dataset.
+                If provided, the path is classified from its
+                segments only, without accessing the file system.
+        """
+        super().__init__(seq)
+        if root is not None:
+            object.__setattr__(self, '_root', root)
+
     @property
     @docstring_parameter(Path.__doc__)
     def path(self):
@@ -95,6 +116,52 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
         """{0}\n"""
         return GetEntityStrings(self)
 
+    @docstring_parameter(split_components.__doc__)
+    def __get_components__(self) -> Tuple:
+        """
+        Returns the parsed components record of this path.
+
+        Paths being immutable, parsing happens once per instance.
+        Every component-based property reads from this record.
+
+        {0}\n"""
+        try:
+            return object.__getattribute__(self, '_parsed')
+        except AttributeError:
+            _parsed = split_components(super().__str__())
+            object.__setattr__(self, '_parsed', _parsed)
+            return _parsed
+
+    @property
+    def declared_root(self) -> Optional[Union[Text, PathLike]]:
+        """
+        Dataset's top-level directory declared at instantiation, if any.
+
+        Paths with a declared root are classified from their
+        segments only and never access the file system.
+        """
+        try:
+            return object.__getattribute__(self, '_root')
+        except AttributeError:
+            return None
+
+    @property
+    def context(self) -> Optional[BIDSContext]:
+        """
+        Shared ``BIDSContext`` of this path's dataset, if any.
+
+        Looked up once per instance. Dataset-level properties
+        (e.g. ``bids_root``, ``dataset_description``) read from it.
+        Paths with a ``declared_root`` have no context.
+        """
+        try:
+            return object.__getattribute__(self, '_context')
+        except AttributeError:
+            _context = None if self.declared_root is not None \
+                else BIDSContext.for_path(super().__str__())
+            object.__setattr__(self, '_context', _context)
+            return _context
+
     def __str__(self, /) -> Text:
         return super().__str__()
 
@@ -145,8 +212,17 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
         References:
             <https://bids-specification.readthedocs.io/en/stable/03-modality-agnostic-files.html#participants-file>
         """
+        if self.context is not None:
+            return self.context.participants
         meta_path = os.path.join(self.dataset_root, 'participants.tsv')
-        if os.path.exists(meta_path):
+        if self.declared_root is not None:
+            # Read without probing the file system beforehand
+            try:
+                return pd.read_csv(meta_path, sep='\t',
+                                   index_col='participant_id')
+            except FileNotFoundError:
+                return pd.DataFrame(dtype='string')
+        if cached_exists(meta_path):
             return pd.read_csv(str(meta_path), sep='\t',
                                index_col='participant_id')
         else:
@@ -156,7 +232,8 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(GetBidsignore.__doc__)
     def bidsignore(self) -> Generator:
         """{0}\n"""
-        yield from GetBidsignore(self.path)
+        yield from self.context.bidsignore if self.context is not None \
+            else GetBidsignore(self.path)
 
     # Dunder methods inherited from ``pathlib.Path``
     def __reduce__(self) -> Tuple:
@@ -219,20 +296,24 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
 
     # Pathlib and os bids_path_functions as static methods
     @staticmethod
-    def isdir(src: Union[Text, PathLike]) -> bool:
+    def isdir(src: Union[Text, PathLike],
+              root: Optional[Union[Text, PathLike]] = None) -> bool:
         """
         Returns True if ``src`` refers to an existing directory.
 
+        If ``root`` is provided, it is inferred from the name of ``src``.
         """
-        return isdir(src)
+        return cached_isdir(src) if root is None else pure_isdir(src)
 
     @staticmethod
-    def isfile(src: Union[Text, PathLike]) -> bool:
+    def isfile(src: Union[Text, PathLike],
+               root: Optional[Union[Text, PathLike]] = None) -> bool:
         """
         Returns True if a path is a regular file.
 
+        If ``root`` is provided, it is inferred from the name of ``src``.
         """
-        return isfile(src)
+        return cached_isfile(src) if root is None else pure_isfile(src)
 
     @staticmethod
     def isreserved(src: Union[Text, PathLike]) -> bool:
@@ -303,6 +384,16 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
         """{0}\n"""
         return Path.cwd()
 
+    def _invalidate_stat(self, *paths: Union[Text, PathLike],
+                         recursive: bool = False) -> None:
+        """
+        Drops cached metadata of ``self`` and ``paths`` after a change.
+
+        """
+        cache = get_stat_cache()
+        if cache is not None:
+            cache.invalidate(self.__fspath__(), *paths, recursive=recursive)
+
     # Pathlib instance methods
     @docstring_parameter(Path.match.__doc__)
     def match(self, path_pattern: Text) -> bool:
@@ -318,11 +409,13 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     def chmod(self, mode: int):
         """{0}\n"""
         self.path.chmod(mode)
+        self._invalidate_stat()
 
     @docstring_parameter(Path.lchmod.__doc__)
     def lchmod(self, mode: int):
         """{0}\n"""
         self.path.lchmod(mode)
+        self._invalidate_stat()
 
     @docstring_parameter(Path.symlink_to.__doc__)
     def symlink_to(self,
@@ -330,6 +423,7 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
                    target_is_directory: bool = False):
         """{0}\n"""
         self.path.symlink_to(target, target_is_directory)
+        self._invalidate_stat(self.path.parent)
 
     @docstring_parameter(samefile.__doc__)
     def samefile(self, other_path: Union[Text, PathLike]) -> bool:
@@ -343,11 +437,16 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
         """{0}\n"""
         self.path.mkdir(mode=mode, parents=parents,
                         exist_ok=exist_ok)
+        self._invalidate_stat(*self.path.parents if parents
+                              else (self.path.parent,))
 
     @docstring_parameter(Path.rename.__doc__)
     def rename(self, target: Union[Text, PathLike]):
         """{0}\n"""
         self.path.rename(target)
+        self._invalidate_stat(target, recursive=True)
+        self._invalidate_stat(self.path.parent,
+                              os.path.dirname(os.fspath(target)))
 
     @docstring_parameter(open.__doc__)
     def open(self,  mode: Text = 'r', buffering: int = -1,
@@ -363,6 +462,7 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     def rmdir(self):
         """{0}\n"""
         self.path.rmdir()
+        self._invalidate_stat(self.path.parent)
 
     @docstring_parameter(Path.read_bytes.__doc__)
     def read_bytes(self) -> bytes:
@@ -373,6 +473,7 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     def write_bytes(self, data: bytes):
         """{0}\n"""
         self.path.write_bytes(data)
+        self._invalidate_stat()
 
     @docstring_parameter(Path.read_text.__doc__)
     def read_text(self, encoding: Optional[Text] = None,
@@ -388,11 +489,13 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
         """{0}\n"""
         self.path.write_text(data, encoding=encoding,
                              errors=errors)
+        self._invalidate_stat()
 
     @docstring_parameter(Path.unlink.__doc__)
     def unlink(self):
         """{0}\n"""
         self.path.unlink()
+        self._invalidate_stat(self.path.parent)
 
     @docstring_parameter(Path.mkdir.__doc__)
     def mkdir(self, mode: int = 511,
@@ -401,6 +504,8 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
         """{0}\n"""
         self.path.mkdir(mode=mode, parents=parents,
                         exist_ok=exist_ok)
+        self._invalidate_stat(*self.path.parents if parents
+                              else (self.path.parent,))
 
     @docstring_parameter(Path.joinpath.__doc__)
     def joinpath(self, *args):
@@ -411,6 +516,7 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     def touch(self, mode: int = 438, exist_ok: bool = True):
         """{0}\n"""
         self.path.touch(mode, exist_ok)
+        self._invalidate_stat(self.path.parent)
 
     @docstring_parameter(Path.with_name.__doc__)
     def with_name(self, name: Text) -> Union[Text, PathLike]:
@@ -544,10 +650,11 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
 
     @staticmethod
     @docstring_parameter(RelativeToRoot.__doc__)
-    def relative_to_root(src: Union[Text, PathLike]
+    def relative_to_root(src: Union[Text, PathLike],
+                         root: Optional[Union[Text, PathLike]] = None
                          ) -> PathLike:
         """{0}\n"""
-        return RelativeToRoot(src)
+        return RelativeToRoot(src, root=root)
 
     @staticmethod
     @docstring_parameter(Validate.__doc__)
@@ -564,24 +671,27 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
 
     @staticmethod
     @docstring_parameter(BIDSRoot.__doc__)
-    def get_bids_root(src: Union[Text, PathLike]
+    def get_bids_root(src: Union[Text, PathLike],
+                      root: Optional[Union[Text, PathLike]] = None
                       ) -> PathLike:
         """{0}\n"""
-        return BIDSRoot(src)
+        return BIDSRoot(src, root=root)
 
     @staticmethod
     @docstring_parameter(SubDir.__doc__)
-    def get_subject_dir(src: Union[Text, PathLike]
+    def get_subject_dir(src: Union[Text, PathLike],
+                        root: Optional[Union[Text, PathLike]] = None
                         ) -> PathLike:
         """{0}\n"""
-        return SubDir(src)
+        return SubDir(src, root=root)
 
     @staticmethod
     @docstring_parameter(SesDir.__doc__)
-    def get_session_dir(src: Union[Text, PathLike]
+    def get_session_dir(src: Union[Text, PathLike],
+                        root: Optional[Union[Text, PathLike]] = None
                         ) -> PathLike:
         """{0}\n"""
-        return SesDir(src)
+        return SesDir(src, root=root)
 
     @staticmethod
     @docstring_parameter(MatchComponents.__doc__)
@@ -595,89 +705,121 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
                                src=src,
                                exclude=exclude, **kwargs)
 
+    @staticmethod
+    @docstring_parameter(AMatchComponents.__doc__)
+    def amatch_components(dst: Union[Text, PathLike],
+                          recursive: bool = False,
+                          src: Optional[Union[Text, PathLike]] = None,
+                          exclude: Optional[
+                              Union[Iterable[Text], Text]] = None,
+                          **kwargs) -> AsyncGenerator:
+        """{0}\n"""
+        return AMatchComponents(dst, recursive=recursive,
+                                src=src,
+                                exclude=exclude, **kwargs)
+
     @staticmethod
     @docstring_parameter(IsEvent.__doc__)
-    def is_event_file(src: Union[Text, PathLike]
+    def is_event_file(src: Union[Text, PathLike],
+                      root: Optional[Union[Text, PathLike]] = None
                       ) -> bool:
         """{0}\n"""
-        return IsEvent(src)
+        return IsEvent(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsBeh.__doc__)
-    def is_beh_file(src: Union[Text, PathLike]
+    def is_beh_file(src: Union[Text, PathLike],
+                    root: Optional[Union[Text, PathLike]] = None
                     ) -> bool:
         """{0}\n"""
-        return IsBeh(src)
+        return IsBeh(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsNifti.__doc__)
-    def is_nifti_file(src: Union[Text, PathLike]) -> bool:
+    def is_nifti_file(src: Union[Text, PathLike],
+                      root: Optional[Union[Text, PathLike]] = None
+                      ) -> bool:
         """{0}\n"""
-        return IsNifti(src)
+        return IsNifti(src, root=root)
 
     @staticmethod
     @docstring_parameter(Is4D.__doc__)
-    def is_4d_file(src: Union[Text, PathLike]) -> bool:
+    def is_4d_file(src: Union[Text, PathLike],
+                   root: Optional[Union[Text, PathLike]] = None
+                   ) -> bool:
         """{0}\n"""
-        return Is4D(src)
+        return Is4D(src, root=root)
 
     @staticmethod
     @docstring_parameter(Is3D.__doc__)
-    def is_3d_file(src: Union[Text, PathLike]) -> bool:
+    def is_3d_file(src: Union[Text, PathLike],
+                   root: Optional[Union[Text, PathLike]] = None
+                   ) -> bool:
         """{0}"""
-        return Is3D(src)
+        return Is3D(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsPhysio.__doc__)
-    def is_physio_file(src: Union[Text, PathLike]
+    def is_physio_file(src: Union[Text, PathLike],
+                       root: Optional[Union[Text, PathLike]] = None
                        ) -> bool:
         """{0}"""
-        return IsPhysio(src)
+        return IsPhysio(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsSidecar.__doc__)
-    def is_sidecar_file(src: Union[Text, PathLike]
+    def is_sidecar_file(src: Union[Text, PathLike],
+                        root: Optional[Union[Text, PathLike]] = None
                         ) -> bool:
         """{0}\n"""
-        return IsSidecar(src)
+        return IsSidecar(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsBIDSRoot.__doc__)
-    def is_fmriprep_derivative(src: Union[Text, PathLike]
+    def is_fmriprep_derivative(src: Union[Text, PathLike],
+                               root: Optional[Union[Text, PathLike]] = None
                                ) -> bool:
         """{0}\n"""
-        return IsFMRIPrepDerivatives(src)
+        return IsFMRIPrepDerivatives(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsSubjectDir.__doc__)
-    def is_subject_dir(src: Union[Text, PathLike]) -> bool:
+    def is_subject_dir(src: Union[Text, PathLike],
+                       root: Optional[Union[Text, PathLike]] = None
+                       ) -> bool:
         """{0}\n"""
-        return IsSubjectDir(src)
+        return IsSubjectDir(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsSessionDir.__doc__)
-    def is_session_dir(src: Union[Text, PathLike]) -> bool:
+    def is_session_dir(src: Union[Text, PathLike],
+                       root: Optional[Union[Text, PathLike]] = None
+                       ) -> bool:
         """{0}\n"""
-        return IsSessionDir(src)
+        return IsSessionDir(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsDatatypeDir.__doc__)
-    def is_datatype_dir(src: Union[Text, PathLike]
+    def is_datatype_dir(src: Union[Text, PathLike],
+                        root: Optional[Union[Text, PathLike]] = None
                         ) -> bool:
         """{0}\n"""
-        return IsDatatypeDir(src)
+        return IsDatatypeDir(src, root=root)
 
     @staticmethod
-    def is_derivatives_root_dir(src: Union[Text, PathLike]
+    def is_derivatives_root_dir(src: Union[Text, PathLike],
+                                root: Optional[Union[Text, PathLike]] = None
                                 ) -> bool:
         """
         Returns True if ``src`` points to a derived dataset's root directory.
 
         """
-        return IsDerivativesRoot(src)
+        return IsDerivativesRoot(src, root=root)
 
     @staticmethod
-    def isderivatives(src: Union[Text, PathLike]) -> bool:
+    def isderivatives(src: Union[Text, PathLike],
+                      root: Optional[Union[Text, PathLike]] = None
+                      ) -> bool:
         """
         Returns True if ``src`` points to a path in a derived dataset.
 
@@ -685,27 +827,31 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
             src: string or PathLike
                 The path to verify.
         """
-        return IsDerivatives(src)
+        return IsDerivatives(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsDatasetRoot.__doc__)
-    def is_dataset_root_dir(src: Union[Text, PathLike]
+    def is_dataset_root_dir(src: Union[Text, PathLike],
+                            root: Optional[Union[Text, PathLike]] = None
                             ) -> bool:
         """{0}\n"""
-        return IsDatasetRoot(src)
+        return IsDatasetRoot(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsBIDSRoot.__doc__)
-    def is_bids_root_dir(src: Union[Text, PathLike]) -> bool:
+    def is_bids_root_dir(src: Union[Text, PathLike],
+                         root: Optional[Union[Text, PathLike]] = None
+                         ) -> bool:
         """{0}\n"""
-        return IsBIDSRoot(src)
+        return IsBIDSRoot(src, root=root)
 
     @staticmethod
     @docstring_parameter(IsDerivatives.__doc__)
-    def isderivatives(src: Union[Text, PathLike]
+    def isderivatives(src: Union[Text, PathLike],
+                      root: Optional[Union[Text, PathLike]] = None
                       ) -> bool:
         """{0}\n"""
-        return IsDerivatives(src)
+        return IsDerivatives(src, root=root)
 
     @staticmethod
     @docstring_parameter(DatasetRoot.__doc__)
@@ -829,19 +975,19 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(Path.stat.__doc__)
     def stat(self) -> stat_result:
         """{0}\n"""
-        return self.path.stat()
+        return cached_stat(self.__fspath__())
 
     @property
     @docstring_parameter(Path.lstat.__doc__)
     def lstat(self) -> stat_result:
         """{0}\n"""
-        return self.path.lstat()
+        return cached_stat(self.__fspath__(), follow_symlinks=False)
 
     @property
     @docstring_parameter(Path.exists.__doc__)
     def exists(self) -> bool:
         """{0}\n"""
-        return self.path.exists()
+        return cached_exists(self.__fspath__())
 
     @property
     @docstring_parameter(Path.is_absolute.__doc__)
@@ -853,13 +999,13 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(Path.is_dir.__doc__)
     def is_dir(self) -> bool:
         """{0}\n"""
-        return self.path.is_dir()
+        return cached_isdir(self.__fspath__())
 
     @property
     @docstring_parameter(Path.is_file.__doc__)
     def is_file(self) -> bool:
         """{0}\n"""
-        return self.path.is_file()
+        return cached_isfile(self.__fspath__())
 
     @property
     @docstring_parameter(Path.is_mount.__doc__)
@@ -928,37 +1074,37 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(IsBIDSRoot.__doc__)
     def is_bids_root(self) -> bool:
         """{0}\n"""
-        return IsBIDSRoot(self)
+        return IsBIDSRoot(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsDatatypeDir.__doc__)
     def is_datatype(self) -> bool:
         """{0}\n"""
-        return IsDatatypeDir(self)
+        return IsDatatypeDir(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsDerivativesRoot.__doc__)
     def is_derivatives_root(self) -> bool:
         """{0}\n"""
-        return IsDerivativesRoot(self)
+        return IsDerivativesRoot(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsBeh.__doc__)
     def is_beh(self) -> bool:
         """{0}\n"""
-        return IsBeh(self)
+        return IsBeh(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsEvent.__doc__)
     def is_event(self) -> bool:
         """{0}\n"""
-        return IsEvent(self)
+        return IsEvent(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsFMRIPrepDerivatives.__doc__)
     def is_fmriprep_derivatives(self) -> bool:
         """{0}\n"""
-        return IsFMRIPrepDerivatives(self)
+        return IsFMRIPrepDerivatives(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsNifti.__doc__)
@@ -970,19 +1116,19 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(Is3D.__doc__)
     def is_3d(self) -> bool:
         """{0}\n"""
-        return Is3D(self)
+        return Is3D(self, root=self.declared_root)
 
     @property
     @docstring_parameter(Is4D.__doc__)
     def is_4d(self) -> bool:
         """{0}\n"""
-        return Is4D(self)
+        return Is4D(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsPhysio.__doc__)
     def is_physio(self) -> bool:
         """{0}\n"""
-        return IsPhysio(self)
+        return IsPhysio(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsSidecar.__doc__)
@@ -994,25 +1140,25 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(IsSubjectDir.__doc__)
     def is_subject(self) -> bool:
         """{0}\n"""
-        return IsSubjectDir(self)
+        return IsSubjectDir(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsSessionDir.__doc__)
     def is_session(self) -> bool:
         """{0}\n"""
-        return IsSessionDir(self)
+        return IsSessionDir(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsDerivatives.__doc__)
     def is_derivatives(self) -> bool:
         """{0}\n"""
-        return IsDerivatives(self)
+        return IsDerivatives(self, root=self.declared_root)
 
     @property
     @docstring_parameter(IsDatasetRoot.__doc__)
     def is_dataset_root(self) -> bool:
         """{0}\n"""
-        return IsDatasetRoot(self)
+        return IsDatasetRoot(self, root=self.declared_root)
 
     @property
     @docstring_parameter(GetEntities.__doc__)
@@ -1036,13 +1182,17 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(DatasetName.__doc__)
     def dataset_name(self):
         """{0}\n"""
-        return DatasetName(self)
+        if self.declared_root is not None:
+            return os.path.basename(str(self.bids_root))
+        return self.context.name if self.context is not None \
+            else DatasetName(self)
 
     @property
     @docstring_parameter(DatasetDescription.__doc__)
     def dataset_description(self) -> Dict:
         """{0}\n"""
-        return DatasetDescription(self)
+        return self.context.description if self.context is not None \
+            else DatasetDescription(self)
 
     @property
     @docstring_parameter(DatatypeModality.__doc__)
@@ -1054,7 +1204,7 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(RelativeToRoot.__doc__)
     def r2r(self) -> Union[Text, PathLike]:
         """{0}\n"""
-        return RelativeToRoot(self)
+        return RelativeToRoot(self, root=self.declared_root)
 
     @property
     @docstring_parameter(BIDSValidator.__doc__)
@@ -1076,19 +1226,26 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(BIDSRoot.__doc__)
     def bids_root(self) -> Union[Text, PathLike]:
         """{0}\n"""
-        return BIDSRoot(self)
+        return self.context.bids_root if self.context is not None \
+            else BIDSRoot(self, root=self.declared_root)
 
     @property
     @docstring_parameter(DatasetRoot.__doc__)
     def dataset_root(self) -> Union[Text, PathLike]:
         """{0}\n"""
-        return DatasetRoot(self)
+        if self.declared_root is not None:
+            return Path(str(self.declared_root))
+        return self.context.dataset_root if self.context is not None \
+            else DatasetRoot(self)
 
     @property
     @docstring_parameter(DerivativesRoot.__doc__)
     def derivatives_root(self) -> Union[Text, PathLike]:
         """{0}\n"""
-        return DerivativesRoot(self)
+        if self.declared_root is not None:
+            return Path(str(self.declared_root), 'derivatives')
+        return self.context.derivatives_root if self.context is not None \
+            else DerivativesRoot(self)
 
     @property
     @docstring_parameter(GetDerivativesNames.__doc__)
@@ -1100,10 +1257,10 @@ class BIDSPathAbstract(*(UserString, BIDSPathLike, ABC)):
     @docstring_parameter(SesDir.__doc__)
     def ses_dir(self) -> Union[Text, PathLike]:
         """{0}\n"""
-        return SesDir(self)
+        return SesDir(self, root=self.declared_root)
 
     @property
     @docstring_parameter(SubDir.__doc__)
     def sub_dir(self) -> Union[Text, PathLike]:
         """{0}\n"""
-        return SubDir(self)
+        return SubDir(self, root=self.declared_root)
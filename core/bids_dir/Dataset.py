@@ -1,15 +1,50 @@
 
-
 import os
 from typing import Union, Text
 
 from ..BIDSDirAbstract import BIDSDirAbstract
+from ...DatasetWatcher import DatasetWatcher
+from ...EntityIndex import EntityIndex
 
 __path__ = [os.path.join('..', '__init__.py')]
 
 
 class Dataset(BIDSDirAbstract):
-    __slots__ = ()
+    __slots__ = ('_index',)
 
     def __init__(self, src: Union[Text, os.PathLike], **kwargs):
         super().__init__(src, **kwargs)
+
+    @property
+    def index(self) -> EntityIndex:
+        """
+        In-memory columnar index of the dataset, built on first access.
+
+        Entity values are stored as dictionary-encoded integer columns,
+        so queries on "sub", "ses", "task", "run", "bids_suffix"
+        or "datatype" are vectorized.
+        See ``help(EntityIndex)`` for details.
+        """
+        try:
+            return object.__getattribute__(self, '_index')
+        except AttributeError:
+            _index = EntityIndex.build(self.path)
+            object.__setattr__(self, '_index', _index)
+            return _index
+
+    def watch(self, start: bool = True) -> DatasetWatcher:
+        """
+        Returns a watcher keeping ``Dataset.index`` current.
+
+        Args:
+            start: bool (Default = True)
+                Start reading events in a background thread.
+                Otherwise, call ``DatasetWatcher.poll`` to apply them.
+
+        Example:
+            >>> watcher = Dataset('/data/ds').watch()
+            >>> watcher.subscribe(print, 'created',
+            ...                   task='memory', bids_suffix='bold')
+        """
+        watcher = DatasetWatcher(self.path, index=self.index)
+        return watcher.start() if start else watcher
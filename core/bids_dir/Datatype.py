@@ -38,15 +38,7 @@ class Datatype(BIDSDirAbstract):
                   start: Optional[int] = 0,
                   stop: Optional[int] = 9223372036854775807,
                   ) -> int:
-        args = (value, start, stop)
-        try:
-            return tuple(self.iterdir()).index(*args)
-        except ValueError:
-            try:
-                _str_files = map(str, self._files)
-                return tuple(_str_files).index(*args)
-            except ValueError:
-                raise ValueError
+        return self._position(value, start, stop)
 
 
     def __init__(self, src: Union[Text, PathLike], **kwargs):
@@ -11,6 +11,7 @@ from typing import Dict, Union
 
 from ...core.BIDSDirAbstract import BIDSDirAbstract
 from ...core.bids_dir.Session import Session
+from ...general_methods import scandir_glob
 
 __path__ = [os.path.join('..', '__init__.py')]
 
@@ -59,7 +60,7 @@ class Subject(BIDSDirAbstract):
         Returns a ``Dict`` of a subject's sessions, if any.
 
         """
-        _ses_dirs = set(self.path.glob('ses-*'))
+        _ses_dirs = set(scandir_glob(self.path, 'ses-*'))
         return {self.find_ses_id(_s): Session(_s)
                 for _s in sorted(_ses_dirs)}
 
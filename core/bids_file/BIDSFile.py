@@ -15,9 +15,14 @@ to a different location on disk or in-memory stream.
 """
 
 import os
-from typing import Union, Text
+from pandas import Categorical, DataFrame
+from typing import Generator, Iterable, Optional, Union, Text
 
 from ..BIDSFileAbstract import BIDSFileAbstract
+from ...EntityIndex import EntityIndex
+from ...functions.BIDSFileID import FileClassName
+from ...functions.BIDSPathCoreFunctions import parse_many
+from ...general_methods import threaded_map
 
 __path__ = [os.path.join('..', '__init__.py')]
 
@@ -50,3 +55,85 @@ class BIDSFile(BIDSFileAbstract):
 
     def __init__(self, src: Union[Text, os.PathLike], **kwargs):
         super().__init__(src, **kwargs)
+
+    @staticmethod
+    def classify_many(paths: Iterable[Union[Text, os.PathLike]],
+                      workers: Optional[int] = None,
+                      root: Optional[Union[Text, os.PathLike]] = None,
+                      stream: bool = False
+                      ) -> Union[DataFrame, Generator]:
+        """
+        Classifies many files without instantiating them.
+
+        File checks and the Nifti header reads telling ``MRIFile``
+        from ``FMRIFile`` run concurrently on a pool of threads.
+
+        Args:
+            paths: Iterable[str or PathLike]
+                Paths of files.
+
+            workers: int, optional
+                Number of threads (see ``threaded_map``).
+
+            root: str or PathLike (optional)
+                Declared top-level directory of the dataset.
+                If provided, paths are classified without
+                accessing the file system.
+
+            stream: bool (Default = False)
+                Yield ``(path, class name)`` pairs in input order
+                instead of returning a ``DataFrame``.
+
+        Returns: DataFrame or Generator[Tuple[str, str]]
+            By default, a categorical "cls" column of ``BIDSFile``
+            subclass names followed by the columns of ``parse_many``,
+            indexed by path. Paths that are not files or match no
+            subclass have an empty class name.
+        """
+        def _classify(src: Text) -> tuple:
+            return src, FileClassName(src, root=root) \
+                if BIDSFileAbstract.isfile(src, root=root) else ''
+
+        pairs = threaded_map(_classify, map(str, paths), workers=workers)
+        if stream:
+            return pairs
+        pairs = tuple(pairs)
+        frame = parse_many(_path for _path, _ in pairs)
+        frame.insert(0, 'cls', Categorical([_cls for _, _cls in pairs]))
+        return frame
+
+    @staticmethod
+    def companions_many(paths: Iterable[Union[Text, os.PathLike]],
+                        kinds: Optional[Iterable[Text]] = None,
+                        index: Optional[EntityIndex] = None) -> DataFrame:
+        """
+        Returns the companion files of many runs as a table.
+
+        Bulk counterpart of ``get_sidecar``, ``get_events_file``,
+        ``get_beh_file``, ``get_anat_img`` and ``get_brain_mask``:
+        the dataset is listed once and companions are joined
+        to the runs on their entities (see ``EntityIndex.companions``).
+
+        Args:
+            paths: Iterable[str or PathLike]
+                Paths of runs (e.g. BOLD scans) of the same dataset.
+
+            kinds: Iterable[str], optional
+                "sidecar" or keys of ``EntityIndex.COMPANION_RULES``.
+                Defaults to all of them.
+
+            index: EntityIndex, optional
+                Index of the runs' dataset.
+                Built from the dataset of the first run by default.
+
+        Returns: DataFrame
+            One column per kind, indexed by run path: merged metadata
+            for "sidecar", paths for the others (see
+            ``EntityIndex.companions``).
+        """
+        paths = tuple(map(str, paths))
+        if index is None:
+            if not paths:
+                return EntityIndex.from_rows('', ()).companions((), kinds)
+            index = EntityIndex.build(paths[0])
+        return index.companions(paths, kinds=kinds)
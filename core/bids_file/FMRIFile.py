@@ -93,13 +93,13 @@ class FMRIFile(BIDSFileAbstract):
     @docstring_parameter(GetFrameTimes.__doc__)
     def frame_times(self) -> ArrayLike:
         """{0}\n"""
-        return GetFrameTimes(self.img)
+        return GetFrameTimes(self.path)
 
     @property
     @docstring_parameter(GetTR.__doc__)
     def t_r(self) -> float:
         """{0}\n"""
-        return GetTR(self.img)
+        return GetTR(self.path)
 
     @property
     @docstring_parameter(BIDSFileAbstract.get_anat_img.__doc__)
@@ -127,5 +127,6 @@ class FMRIFile(BIDSFileAbstract):
 
     @property
     def hardware_info(self) -> Tuple:
-        return BidsRecommended(**{field: self.sidecar.get(field, '')
+        sidecar = self.sidecar
+        return BidsRecommended(**{field: sidecar.get(field, '')
                                   for field in BIDS_RECOMMENDED})
@@ -92,10 +92,10 @@ class MRIFile(BIDSFileAbstract):
     @docstring_parameter(GetFrameTimes.__doc__)
     def frame_times(self) -> Iterable:
         """{0}\n"""
-        return GetFrameTimes(self.img)
+        return GetFrameTimes(self.path)
 
     @property
     @docstring_parameter(GetTR.__doc__)
     def t_r(self) -> float:
         """{0}\n"""
-        return GetTR(self.img)
+        return GetTR(self.path)
@@ -0,0 +1,53 @@
+"""
+Shared fixtures of the ``bidspathlib`` tests.
+
+"""
+
+import json
+import os
+
+import pytest
+
+
+def make_files(root, *rel_paths, content: str = '') -> None:
+    """
+    Creates empty (or ``content``) files ``rel_paths`` below ``root``.
+
+    """
+    for rel_path in rel_paths:
+        path = os.path.join(str(root), rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode='w') as file:
+            file.write(content)
+
+
+@pytest.fixture
+def bids_dataset(tmp_path):
+    """
+    Small raw BIDS dataset with a derivatives pipeline.
+
+    Two subjects with two sessions each, a resting-state and
+    a task run per session, and a '.bidsignore' file.
+    """
+    root = tmp_path / 'ds'
+    make_files(root, 'dataset_description.json',
+               content=json.dumps({'Name': 'ds'}))
+    make_files(root, '.bidsignore', content='**/*_physio.tsv.gz\nextra/\n')
+    make_files(root, 'participants.tsv',
+               content='participant_id\tage\nsub-01\t20\nsub-02\t21\n')
+    make_files(root, 'extra/notes.txt')
+    for sub in ('sub-01', 'sub-02'):
+        for ses in ('ses-1', 'ses-2'):
+            _dir = f'{sub}/{ses}'
+            make_files(root, f'{_dir}/anat/{sub}_{ses}_T1w.nii.gz')
+            for task in ('rest', 'memory'):
+                _base = f'{_dir}/func/{sub}_{ses}_task-{task}_run-1'
+                make_files(root, f'{_base}_bold.nii.gz',
+                           f'{_base}_events.tsv', f'{_base}_physio.tsv.gz')
+                make_files(root, f'{_base}_bold.json',
+                           content=json.dumps({'TaskName': task}))
+    _pipeline = 'derivatives/fmriprep'
+    make_files(root, f'{_pipeline}/dataset_description.json', content='{}')
+    make_files(root, f'{_pipeline}/sub-01/ses-1/func/'
+                     'sub-01_ses-1_task-rest_run-1_desc-brain_mask.nii.gz')
+    return root
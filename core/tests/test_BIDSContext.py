@@ -0,0 +1,49 @@
+"""
+Tests of ``bidspathlib.BIDSContext``.
+
+"""
+
+import json
+
+import pytest
+
+from ...BIDSContext import BIDSContext, _invalidate
+from .conftest import make_files
+
+
+def test_root_found_once_created(tmp_path):
+    src = tmp_path / 'ds/sub-01/anat/sub-01_T1w.nii.gz'
+    make_files(tmp_path, 'ds/sub-01/anat/sub-01_T1w.nii.gz')
+    assert BIDSContext.for_path(src) is None
+    make_files(tmp_path, 'ds/dataset_description.json', content='{}')
+    context = BIDSContext.for_path(src)
+    assert context is not None and context.root == str(tmp_path / 'ds')
+
+
+def test_context_shared_by_paths(bids_dataset):
+    anat = bids_dataset / 'sub-01/ses-1/anat/sub-01_ses-1_T1w.nii.gz'
+    func = bids_dataset / 'sub-02/ses-2/func'
+    assert BIDSContext.for_path(anat) is BIDSContext.for_path(func)
+
+
+def test_sidecar_cached_until_invalidated(bids_dataset):
+    src = bids_dataset / 'sub-01/ses-1/func' \
+        / 'sub-01_ses-1_task-rest_run-1_bold.nii.gz'
+    context = BIDSContext.for_path(src)
+    assert context.sidecar(src) == {'TaskName': 'rest'}
+    make_files(bids_dataset, 'task-rest_bold.json',
+               content=json.dumps({'RepetitionTime': 2}))
+    assert context.sidecar(src) == {'TaskName': 'rest'}
+    _invalidate(str(bids_dataset / 'task-rest_bold.json'))
+    assert context.sidecar(src) == {'RepetitionTime': 2, 'TaskName': 'rest'}
+
+
+def test_sidecar_read_only(bids_dataset):
+    func = bids_dataset / 'sub-01/ses-1/func'
+    src = func / 'sub-01_ses-1_task-rest_run-1_bold.nii.gz'
+    context = BIDSContext.for_path(src)
+    metadata = context.sidecar(src)
+    with pytest.raises(TypeError):
+        metadata['TaskName'] = 'memory'
+    sibling = func / 'sub-01_ses-1_task-rest_run-1_bold.json'
+    assert context.sidecar(sibling) == {'TaskName': 'rest'}
@@ -0,0 +1,147 @@
+"""
+Tests of ``bidspathlib.core.BIDSDirAbstract``.
+
+"""
+
+import asyncio
+import os
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from ..BIDSDirAbstract import BIDSDirAbstract
+from ..bids_dir.BIDSDir import BIDSDir
+from ..bids_dir.Datatype import Datatype
+from ...BIDSPath import BIDSPath
+from .conftest import make_files
+
+_FUNC = 'sub-01/ses-1/func'
+# Children of ``_FUNC``: physiological recordings are ignored and
+# the empty Nifti images of ``bids_dataset`` match no ``BIDSFile`` class
+_VISIBLE = tuple(f'sub-01_ses-1_task-{_task}_run-1_{_name}'
+                 for _task in ('memory', 'rest')
+                 for _name in ('bold.json', 'events.tsv'))
+
+
+@pytest.fixture
+def func(bids_dataset):
+    make_files(bids_dataset, f'{_FUNC}/.DS_Store')
+    return BIDSDir(bids_dataset / _FUNC)
+
+
+@pytest.fixture
+def constructed(monkeypatch):
+    calls, child = Counter(), BIDSDirAbstract._child
+
+    def _counted(self, path, is_dir):
+        calls[path] += 1
+        return child(self, path, is_dir)
+
+    monkeypatch.setattr(BIDSDirAbstract, '_child', _counted)
+    return calls
+
+
+def test_len_matches_iteration(func):
+    assert isinstance(func, Datatype)
+    assert len(func) == len(tuple(func)) == len(_VISIBLE)
+    assert sorted(os.path.basename(_child) for _child in func) \
+        == list(_VISIBLE)
+    assert tuple(func[:2]) == tuple(func)[:2]
+
+
+def test_listing_invalidated_on_mtime_change(func):
+    listed = func._listing()
+    assert func._listing() is listed
+    name = 'sub-01_ses-1_task-rest_run-2_events.tsv'
+    make_files(os.fspath(func), name)
+    mtime = os.stat(os.fspath(func)).st_mtime_ns
+    os.utime(os.fspath(func), ns=(mtime, listed.mtime + 10 ** 9))
+    assert func._listing() is not listed
+    assert len(func) == len(_VISIBLE) + 1
+    assert os.path.join(os.fspath(func), name) in func
+
+
+def test_contains(func, bids_dataset):
+    child = os.path.join(os.fspath(func), _VISIBLE[0])
+    assert child in func and Path(child) in func
+    assert BIDSPath(child) in func
+    physio = 'sub-01_ses-1_task-rest_run-1_physio.tsv.gz'
+    assert os.path.join(os.fspath(func), physio) not in func
+    assert str(bids_dataset / 'participants.tsv') not in func
+    assert 42 not in func
+
+
+def test_datatype_index(func):
+    children = tuple(func)
+    for _position, _child in enumerate(children):
+        assert func.__index__(_child) == _position
+        assert func.__index__(os.fspath(_child)) == _position
+    with pytest.raises(ValueError):
+        func.__index__(children[0], 1)
+    with pytest.raises(ValueError):
+        func.__index__(children[-1], 0, len(children) - 1)
+    with pytest.raises(ValueError):
+        func.__index__(os.path.join(os.fspath(func), '.DS_Store'))
+
+
+def test_iterdir_in_listing_order(func):
+    listed = [_entry.name for _entry in os.scandir(os.fspath(func))
+              if _entry.name in _VISIBLE]
+    assert [os.path.basename(_child) for _child in func.iterdir()] == listed
+
+
+def test_iterdir_scans_once(func, constructed, monkeypatch):
+    calls, scandir = [], os.scandir
+
+    def _counted(*args):
+        calls.append(args)
+        return scandir(*args)
+
+    monkeypatch.setattr(os, 'scandir', _counted)
+    children = tuple(func.iterdir())
+    assert len(calls) == 1
+    assert len(children) == len(_VISIBLE)
+    # Unclassified files are constructed, then skipped
+    assert set(constructed.values()) == {1}
+    assert all(not os.path.basename(_path).startswith('.')
+               and not _path.endswith('_physio.tsv.gz')
+               for _path in constructed)
+
+
+def test_glob_filters_hidden_and_ignored(bids_dataset, constructed):
+    make_files(bids_dataset, '.hidden.json', 'sub-01/.hidden.json',
+               '.git/config.json', 'extra/info.json')
+    dataset = BIDSDir(bids_dataset)
+    found = {os.path.relpath(_child, bids_dataset)
+             for _child in dataset.rglob('*.json')}
+    assert set(constructed.values()) == {1}
+    assert found == {
+        'dataset_description.json',
+        'derivatives/fmriprep/dataset_description.json',
+        *(f'sub-{_sub}/ses-{_ses}/func/sub-{_sub}_ses-{_ses}'
+          f'_task-{_task}_run-1_bold.json'
+          for _sub in ('01', '02') for _ses in ('1', '2')
+          for _task in ('memory', 'rest'))
+    }
+    found = {os.path.relpath(_child, bids_dataset)
+             for _child in dataset.glob('*.json')}
+    assert found == {'dataset_description.json'}
+    assert not tuple(dataset.rglob('*_physio.tsv.gz'))
+    assert not tuple(dataset.rglob('notes.txt'))
+
+
+def test_async_listings_match_sync(bids_dataset, func):
+    dataset = BIDSDir(bids_dataset)
+
+    async def _collect(agen):
+        return [os.fspath(_child) async for _child in agen]
+
+    def _paths(children):
+        return [os.fspath(_child) for _child in children]
+
+    assert asyncio.run(_collect(func.aiterdir())) == _paths(func.iterdir())
+    assert sorted(asyncio.run(_collect(dataset.aglob('*/*/func/*.json')))) \
+        == sorted(_paths(dataset.glob('*/*/func/*.json')))
+    assert sorted(asyncio.run(_collect(dataset.arglob('*_events.tsv')))) \
+        == sorted(_paths(dataset.rglob('*_events.tsv')))
@@ -0,0 +1,57 @@
+"""
+Tests of ``bidspathlib.core.bids_file.BIDSFile.BIDSFile.classify_many``.
+
+"""
+
+import os
+
+from ..bids_file.BIDSFile import BIDSFile
+from ...functions import BIDSFileID
+from ...functions.BIDSPathCoreFunctions import PARSED_COLUMNS, parse_many
+
+_NAMES = (
+    'sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_events.tsv',
+    'sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_bold.json',
+    'sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_physio.tsv.gz',
+    'sub-01/ses-1/func/sub-01_ses-1_task-rest_run-2_events.tsv',
+    'sub-01/ses-1/anat',
+    'participants.tsv',
+    'dataset_description.json',
+)
+_CLASSES = ('EventsFile', 'SideCarFile', 'PhysioFile', '', '', '',
+            'SideCarFile')
+
+
+def test_classify_many_frame(bids_dataset):
+    paths = tuple(str(bids_dataset / _name) for _name in _NAMES)
+    frame = BIDSFile.classify_many(paths, workers=4)
+    assert frame.shape == (len(paths), len(PARSED_COLUMNS) + 1)
+    assert tuple(frame.columns) == ('cls',) + PARSED_COLUMNS
+    assert str(frame['cls'].dtype) == 'category'
+    assert tuple(frame.index) == paths
+    assert tuple(frame['cls']) == _CLASSES
+    assert frame.drop(columns='cls').equals(parse_many(paths))
+
+
+def test_classify_many_stream_ordered(bids_dataset):
+    paths = [bids_dataset / _name for _name in _NAMES * 8]
+    pairs = BIDSFile.classify_many(iter(paths), workers=4, stream=True)
+    assert not isinstance(pairs, (list, tuple))
+    assert list(pairs) == [(str(_path), _cls) for _path, _cls
+                           in zip(paths, _CLASSES * 8)]
+
+
+def test_classify_many_offline(bids_dataset, monkeypatch):
+    def _no_io(*args, **kwargs):
+        raise AssertionError('file system accessed')
+
+    for _name in ('stat', 'lstat', 'scandir'):
+        monkeypatch.setattr(os, _name, _no_io)
+    monkeypatch.setattr(BIDSFileID, 'GetNiftiHeader', _no_io)
+    func = bids_dataset / 'sub-03/func'
+    paths = (func / 'sub-03_task-rest_bold.nii.gz',
+             bids_dataset / 'sub-03/anat/sub-03_T1w.nii.gz',
+             func / 'sub-03_task-rest_events.tsv')
+    pairs = BIDSFile.classify_many(paths, root=bids_dataset, stream=True)
+    assert [_cls for _, _cls in pairs] \
+        == ['FMRIFile', 'MRIFile', 'EventsFile']
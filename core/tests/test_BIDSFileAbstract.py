@@ -0,0 +1,45 @@
+"""
+Tests of ``bidspathlib.core.BIDSFileAbstract``.
+
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from ..BIDSFileAbstract import BIDSFileAbstract
+from .conftest import make_files
+
+_BOLD = 'sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_bold.nii.gz'
+
+
+def _outcome(call, *args):
+    try:
+        return call(*args)
+    except Exception as error:
+        return type(error)
+
+
+@pytest.mark.parametrize('name', ('sidecar', 'anat_img', 'beh_file',
+                                  'brain_mask'))
+def test_async_companion_matches_sync(bids_dataset, name):
+    src = str(bids_dataset / _BOLD)
+    sync = getattr(BIDSFileAbstract, f'get_{name}')
+    coroutine = getattr(BIDSFileAbstract, f'aget_{name}')
+    assert _outcome(lambda: asyncio.run(coroutine(src))) == _outcome(sync, src)
+
+
+def test_async_companions(bids_dataset):
+    src = str(bids_dataset / _BOLD)
+    assert asyncio.run(BIDSFileAbstract.aget_sidecar(src)) \
+        == {'TaskName': 'rest'}
+    assert asyncio.run(BIDSFileAbstract.aget_sidecar(src, root=bids_dataset)) \
+        == {'TaskName': 'rest'}
+    src = src.replace('task-rest', 'task-memory')
+    make_files(os.path.dirname(src),
+               os.path.basename(src).replace('_bold.nii.gz', '_events.tsv'),
+               content='onset\tduration\ttrial_type\n0.5\t2\tcue\n')
+    events = asyncio.run(BIDSFileAbstract.aget_events_file(src))
+    assert events.equals(BIDSFileAbstract.get_events_file(src))
+    assert tuple(events['trial_type']) == ('cue',)
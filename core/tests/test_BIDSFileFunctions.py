@@ -0,0 +1,67 @@
+"""
+Tests of ``bidspathlib.functions.BIDSFileFunctions``.
+
+"""
+
+import json
+
+import pytest
+
+from ...functions.BIDSFileFunctions import GetSidecar, SidecarChain
+from .conftest import make_files
+
+
+@pytest.fixture
+def inherited(tmp_path):
+    root = tmp_path / 'ds'
+    sidecars = {
+        'bold.json': {'RepetitionTime': 3, 'Level': 'top'},
+        'task-rest_bold.json': {'TaskName': 'rest', 'Level': 'task'},
+        'task-memory_bold.json': {'TaskName': 'memory'},
+        'task-rest_T1w.json': {'Level': 'other suffix'},
+        'sub-01/sub-01_task-rest_bold.json': {'Level': 'subject'},
+        'sub-01/func/sub-01_task-rest_run-1_bold.json': {'Level': 'run'},
+        'sub-01/func/sub-01_task-rest_bold.json': {'RepetitionTime': 2},
+        'sub-01/func/sub-01_task-rest_run-2_bold.json': {'Level': 'run-2'},
+    }
+    make_files(root, 'dataset_description.json', content='{}')
+    for rel_path, metadata in sidecars.items():
+        make_files(root, rel_path, content=json.dumps(metadata))
+    make_files(root, 'sub-01/func/sub-01_task-rest_run-1_bold.nii.gz')
+    return root
+
+
+def test_sidecar_chain_order(inherited):
+    src = inherited / 'sub-01/func/sub-01_task-rest_run-1_bold.nii.gz'
+    assert SidecarChain(src) == tuple(str(inherited / _rel) for _rel in (
+        'bold.json', 'task-rest_bold.json',
+        'sub-01/sub-01_task-rest_bold.json',
+        'sub-01/func/sub-01_task-rest_bold.json',
+        'sub-01/func/sub-01_task-rest_run-1_bold.json'))
+
+
+def test_get_sidecar_most_specific_wins(inherited):
+    src = inherited / 'sub-01/func/sub-01_task-rest_run-1_bold.nii.gz'
+    assert GetSidecar(src, root=inherited) == {
+        'RepetitionTime': 2, 'Level': 'run', 'TaskName': 'rest'}
+
+
+def test_sidecar_chain_listing(inherited):
+    src = inherited / 'sub-01/func/sub-01_task-rest_run-1_bold.nii.gz'
+    listed = []
+
+    def listing(directory):
+        listed.append(directory)
+        return ('task-rest_bold.json',) if directory == str(inherited) \
+            else ()
+
+    assert SidecarChain(src, root=inherited, listing=listing) == (
+        str(inherited / 'task-rest_bold.json'),)
+    assert listed == [str(inherited), str(inherited / 'sub-01'),
+                      str(inherited / 'sub-01/func')]
+
+
+def test_no_sidecar(inherited):
+    make_files(inherited, 'sub-01/anat/sub-01_T2w.nii.gz')
+    src = inherited / 'sub-01/anat/sub-01_T2w.nii.gz'
+    assert SidecarChain(src) == () and GetSidecar(src) == {}
@@ -0,0 +1,18 @@
+"""
+Tests of ``bidspathlib.functions.BIDSFileID``.
+
+"""
+
+from ...functions.BIDSFileID import _dispatch, _NAME_CLASSES, FileClassName
+
+
+def test_dispatch_cached_per_kind_not_per_name(tmp_path):
+    _dispatch.cache_clear()
+    for run in range(1, 33):
+        FileClassName(tmp_path / f'sub-01_task-rest_run-{run}_events.tsv')
+    assert _dispatch.cache_info().currsize == 1
+
+
+def test_name_classes_still_dispatched(tmp_path):
+    for name, class_name in _NAME_CLASSES.items():
+        assert FileClassName(tmp_path / name) == class_name
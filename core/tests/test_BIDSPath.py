@@ -0,0 +1,75 @@
+"""
+Tests of ``bidspathlib.BIDSPath.LazyBIDSPath``.
+
+"""
+
+import os
+
+import pytest
+
+from ...BIDSPath import BIDSPath, LazyBIDSPath
+
+_NAME = 'sub-01_ses-1_task-rest_run-1_bold.json'
+
+
+def _no_io(*args, **kwargs):
+    raise AssertionError('file system accessed')
+
+
+@pytest.fixture
+def sidecar_path(bids_dataset):
+    return str(bids_dataset / 'sub-01/ses-1/func' / _NAME)
+
+
+@pytest.fixture
+def prepared(monkeypatch):
+    calls, prepare = [], BIDSPath.__prepare__.__func__
+
+    def _counted(cls, *args, **kwargs):
+        calls.append(args)
+        return prepare(cls, *args, **kwargs)
+
+    monkeypatch.setattr(BIDSPath, '__prepare__', classmethod(_counted))
+    return calls
+
+
+def test_lazy_returned(sidecar_path, prepared):
+    lazy = BIDSPath(sidecar_path, lazy=True)
+    assert isinstance(lazy, LazyBIDSPath) and not lazy.is_classified
+
+
+def test_no_io_until_resolved(sidecar_path, prepared, monkeypatch):
+    for _name in ('stat', 'lstat', 'scandir', 'listdir'):
+        monkeypatch.setattr(os, _name, _no_io)
+    lazy = LazyBIDSPath(sidecar_path)
+    assert str(lazy) == os.fspath(lazy) == sidecar_path
+    assert lazy.entities.subject == '01' and lazy.entities.run == '1'
+    assert (lazy.sub, lazy.task) == ('sub-01', 'task-rest')
+    assert (lazy.bids_suffix, lazy.extension, lazy.datatype) \
+        == ('bold', '.json', 'func')
+    assert lazy.name == _NAME
+    assert not lazy.is_classified and not prepared
+
+
+def test_concrete_resolved_once(sidecar_path, prepared):
+    lazy = LazyBIDSPath(sidecar_path)
+    assert lazy.sidecar == {'TaskName': 'rest'}
+    assert lazy.sidecar == {'TaskName': 'rest'}
+    assert lazy.is_classified and lazy.concrete is lazy.concrete
+    assert len(prepared) == 1
+    assert not isinstance(lazy.concrete, LazyBIDSPath)
+    assert os.fspath(lazy.concrete) == sidecar_path
+
+
+def test_private_members_not_resolved(sidecar_path, prepared):
+    lazy = LazyBIDSPath(sidecar_path)
+    with pytest.raises(AttributeError):
+        getattr(lazy, '_missing')
+    assert not lazy.is_classified and not prepared
+
+
+def test_missing_path_raises(tmp_path):
+    lazy = LazyBIDSPath(str(tmp_path / 'sub-01_T1w.nii.gz'))
+    assert lazy.bids_suffix == 'T1w'
+    with pytest.raises(FileNotFoundError):
+        lazy.concrete
@@ -0,0 +1,88 @@
+"""
+Tests of ``bidspathlib.functions.BIDSPathCoreFunctions``.
+
+"""
+
+import warnings
+from pathlib import Path
+
+import pytest
+
+from ...constants.bidspathlib_docs import DEPRECATED_BIDS_SUFFIXES
+from ...functions import BIDSPathCoreFunctions
+from ...functions.BIDSPathCoreFunctions import (
+    PARSED_COLUMNS, find_bids_suffix, parse_many, pure_isdir, pure_isfile,
+    split_components
+)
+
+_PATHS = (
+    '/data/ds/sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_bold.nii.gz',
+    '/data/ds/sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_bold.json',
+    '/data/ds/sub-02/anat/sub-02_T1w.nii.gz',
+    '/data/ds/sub-02/anat/sub-02_acq-fast_notasuffix.nii.gz',
+    '/data/ds/sub-02/anat',
+    '/data/ds/participants.tsv',
+    '/data/ds/README',
+    '/data/ds',
+)
+
+
+@pytest.mark.parametrize('name', (
+    'sub-01_T1w.nii.gz', 'sub-01_task-rest_bold.json', 'participants.tsv',
+    'sub-01_hemi-L_midthickness.surf.gii', 'README', 'CHANGES',
+    '.bidsignore', 'sub-01_task-rest_physio.tsv.gz', 'sub-01.html'
+))
+def test_pure_isfile(name):
+    assert pure_isfile(f'/data/ds/{name}') and not pure_isdir(name)
+
+
+@pytest.mark.parametrize('name', (
+    'sub-01', 'anat', 'derivatives', 'fmriprep-20.2.1', '.git',
+    'sub-01_task-rest_meg.ds'
+))
+def test_pure_isdir(name):
+    assert pure_isdir(f'/data/ds/{name}') and not pure_isfile(name)
+
+
+@pytest.mark.parametrize('chunksize', (1, 3, 2 ** 16))
+def test_parse_many_matches_split_components(chunksize):
+    table = parse_many(_PATHS, chunksize=chunksize)
+    assert tuple(table.columns) == PARSED_COLUMNS
+    assert tuple(table.index) == _PATHS
+    assert all(str(table[_col].dtype) == 'category' for _col in table)
+    for _path, _row in zip(_PATHS, table.itertuples(index=False)):
+        _parsed = split_components(_path)
+        assert tuple(_row) == (*_parsed.entities, *_parsed[1:])
+
+
+def test_parse_many_empty_and_unknown_components():
+    table = parse_many(map(Path, _PATHS))
+    assert table.loc[_PATHS[3], 'bids_suffix'] == ''
+    assert table.loc[_PATHS[3], 'extension'] == '.nii.gz'
+    assert table.loc[_PATHS[4], 'datatype'] == 'anat'
+    assert (table.loc[_PATHS[-1]] == '').all()
+    assert parse_many(()).shape == (0, len(PARSED_COLUMNS))
+
+
+def test_split_components_cached():
+    cached = BIDSPathCoreFunctions._split_components_cached
+    cached.cache_clear()
+    first = split_components(_PATHS[0])
+    assert split_components(Path(_PATHS[0])) is first
+    assert cached.cache_info().hits == 1
+
+
+def test_unknown_suffix_not_reported():
+    assert find_bids_suffix(_PATHS[3]) == ''
+    assert find_bids_suffix(_PATHS[2]) == 'T1w'
+
+
+@pytest.mark.parametrize('suffix', tuple(DEPRECATED_BIDS_SUFFIXES))
+def test_deprecated_suffix_warned_once(suffix, monkeypatch):
+    monkeypatch.setattr(BIDSPathCoreFunctions, '_WARNED_SUFFIXES', set())
+    src = f'/data/ds/sub-01/anat/sub-01_{suffix}.nii.gz'
+    with pytest.warns(FutureWarning, match=suffix):
+        assert find_bids_suffix(src) == suffix
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert find_bids_suffix(src) == suffix
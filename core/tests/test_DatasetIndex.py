@@ -0,0 +1,94 @@
+"""
+Tests of ``bidspathlib.DatasetIndex``.
+
+"""
+
+import glob
+import os
+import shutil
+import sys
+import threading
+
+import pytest
+
+from ...DatasetIndex import DatasetIndex, MISSING_SIZE
+from .conftest import make_files
+
+
+@pytest.fixture
+def index(bids_dataset, tmp_path):
+    with DatasetIndex(bids_dataset, location=tmp_path / 'index.sqlite') \
+            as _index:
+        yield _index
+
+
+def _walked(root) -> set:
+    paths = set()
+    for _dir, _dirs, _files in os.walk(str(root)):
+        _dirs[:] = [_d for _d in _dirs if not _d.startswith('.')]
+        paths.update(os.path.join(_dir, _n) for _n in _dirs + _files)
+    return paths
+
+
+def test_build_indexes_every_path(index, bids_dataset):
+    assert set(index) == _walked(bids_dataset)
+
+
+def test_build_in_batches(index, bids_dataset, tmp_path, monkeypatch):
+    monkeypatch.setattr(sys.modules[DatasetIndex.__module__], '_BATCH_ROWS', 3)
+    with DatasetIndex(bids_dataset, location=tmp_path / 'batched.sqlite') \
+            as batched:
+        for _table in ('files', 'dirs'):
+            _sql = f'SELECT * FROM {_table} ORDER BY path'
+            assert batched._connection.execute(_sql).fetchall() \
+                == index._connection.execute(_sql).fetchall()
+
+
+def test_query_components(index, bids_dataset):
+    assert tuple(index.query(sub='02', ses='1', bids_suffix='T1w')) == (
+        str(bids_dataset / 'sub-02/ses-1/anat/sub-02_ses-1_T1w.nii.gz'),)
+
+
+def test_glob_mirrors_iglob(index, bids_dataset):
+    for pattern in ('sub-*/*/func/*_bold.nii.gz', '**/*.json', '*'):
+        expected = set(glob.iglob(os.path.join(str(bids_dataset), pattern),
+                                  recursive=True))
+        assert set(index.glob(bids_dataset, pattern)) == expected
+
+
+def test_refresh_rescans_changed_directories(index, bids_dataset):
+    make_files(bids_dataset, 'sub-03/anat/sub-03_T1w.nii.gz')
+    os.remove(bids_dataset / 'sub-01/ses-1/anat/sub-01_ses-1_T1w.nii.gz')
+    # The root, 'sub-03', 'sub-03/anat' and 'sub-01/ses-1/anat'
+    assert index.refresh() == 4
+    assert set(index) == _walked(bids_dataset)
+    assert index.refresh() == 0
+
+
+def test_broken_symlinks_flagged_missing(index, bids_dataset):
+    link = bids_dataset / 'sub-01/ses-2/anat/sub-01_ses-2_T2w.nii.gz'
+    os.symlink(bids_dataset / '.git/annex/objects/missing', link)
+    index.refresh()
+    assert str(link) in index
+    assert index.stat(link)['size'] == MISSING_SIZE
+    assert tuple(index.missing()) == (str(link),)
+
+
+def test_refresh_directory_replaced_by_file(index, bids_dataset):
+    anat = bids_dataset / 'sub-01/ses-1/anat'
+    shutil.rmtree(anat)
+    make_files(bids_dataset, 'sub-01/ses-1/anat')
+    index.refresh()
+    assert str(anat) in index
+    assert not index.stat(anat)['is_dir']
+    assert set(index) == _walked(bids_dataset)
+
+
+def test_readers_do_not_see_uncommitted_writes(index):
+    before, seen = set(index), []
+    index._connection.execute('DELETE FROM files')
+    reader = threading.Thread(target=lambda: seen.append(set(index)))
+    reader.start()
+    reader.join()
+    index._connection.rollback()
+    assert seen == [before] and set(index) == before
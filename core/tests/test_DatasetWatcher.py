@@ -0,0 +1,70 @@
+"""
+Tests of ``bidspathlib.DatasetWatcher``.
+
+"""
+
+import os
+import sys
+
+import pytest
+
+from ...DatasetWatcher import DatasetWatcher
+from ...EntityIndex import EntityIndex
+from .conftest import make_files
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith('linux'),
+                                reason='inotify is Linux only')
+
+
+def _poll(watcher: DatasetWatcher) -> int:
+    applied = 0
+    while watcher.poll(timeout=0.2):
+        applied += 1
+    return applied
+
+
+@pytest.fixture
+def watcher(bids_dataset):
+    with DatasetWatcher(bids_dataset) as _watcher:
+        _watcher.stop()
+        yield _watcher
+
+
+def test_index_built_from_watch_walk(watcher, bids_dataset):
+    assert sorted(watcher.index) == sorted(EntityIndex.build(bids_dataset))
+    assert len(watcher.index.select(bids_suffix='bold',
+                                    extension='.nii.gz')) == 8
+
+
+def test_apply_created(watcher, bids_dataset):
+    events = []
+    watcher.subscribe(events.append, 'created', bids_suffix='bold')
+    make_files(bids_dataset, 'sub-03/func/sub-03_task-rest_bold.nii.gz')
+    _poll(watcher)
+    path = str(bids_dataset / 'sub-03/func/sub-03_task-rest_bold.nii.gz')
+    assert watcher.index.select(sub='03', bids_suffix='bold') == (path,)
+    assert [(_e.event, _e.path) for _e in events] == [('created', path)]
+
+
+def test_apply_moved(watcher, bids_dataset):
+    events = []
+    watcher.subscribe(events.append, 'moved')
+    func = bids_dataset / 'sub-01/ses-1/func'
+    src = func / 'sub-01_ses-1_task-rest_run-1_events.tsv'
+    dst = func / 'sub-01_ses-1_task-rest_run-2_events.tsv'
+    os.rename(src, dst)
+    _poll(watcher)
+    found = watcher.index.select(sub='01', ses='1', task='rest',
+                                 bids_suffix='events')
+    assert found == (str(dst),)
+    assert [(_e.path, _e.src_path) for _e in events] == [(str(dst), str(src))]
+
+
+def test_apply_deleted(watcher, bids_dataset):
+    events = []
+    watcher.subscribe(events.append, 'deleted')
+    anat = bids_dataset / 'sub-02/ses-1/anat/sub-02_ses-1_T1w.nii.gz'
+    os.remove(anat)
+    _poll(watcher)
+    assert not watcher.index.select(sub='02', ses='1', bids_suffix='T1w')
+    assert [_e.path for _e in events] == [str(anat)]
@@ -0,0 +1,124 @@
+"""
+Tests of ``bidspathlib.EntityIndex``.
+
+"""
+
+import json
+import os
+
+from ...EntityIndex import ENTITY_INDEX_ROW, EntityIndex
+from .conftest import make_files
+
+
+def _dataset(root):
+    make_files(root, 'dataset_description.json', content='{}')
+    make_files(root, 'task-a_bold.json',
+               content=json.dumps({'TaskName': 'a', 'RepetitionTime': 2}))
+    make_files(root, 'sub-01/func/sub-01_task-a_run-1_bold.json',
+               content=json.dumps({'RepetitionTime': 1}))
+    make_files(root, 'sub-01/anat/sub-01_T1w.nii.gz',
+               'sub-01/func/sub-01_task-a_run-1_bold.nii.gz',
+               'sub-01/func/sub-01_task-a_run-2_bold.nii.gz',
+               'sub-01/func/sub-01_task-a_acq-x_run-1_bold.nii.gz',
+               'sub-01/func/sub-01_task-a_run-1_events.tsv',
+               'sub-01/func/sub-01_task-a_events.tsv')
+    return root
+
+
+def test_companions_events_fallback_keys(tmp_path):
+    root = _dataset(tmp_path / 'ds')
+    index = EntityIndex.build(root)
+    func = root / 'sub-01/func'
+    runs = tuple(str(func / f'sub-01_task-a_{_e}_bold.nii.gz')
+                 for _e in ('run-1', 'run-2', 'acq-x_run-1'))
+    events = index.companions(runs, kinds=('events',))['events']
+    assert tuple(events) == (str(func / 'sub-01_task-a_run-1_events.tsv'),
+                             str(func / 'sub-01_task-a_events.tsv'),
+                             str(func / 'sub-01_task-a_run-1_events.tsv'))
+
+
+def test_companions_anat_without_session(tmp_path):
+    root = _dataset(tmp_path / 'ds')
+    index = EntityIndex.build(root)
+    run = str(root / 'sub-01/func/sub-01_task-a_run-2_bold.nii.gz')
+    anat = index.companions((run,), kinds=('anat',))['anat']
+    assert tuple(anat) == (str(root / 'sub-01/anat/sub-01_T1w.nii.gz'),)
+
+
+def test_companions_sidecar_inherits_metadata(tmp_path):
+    root = _dataset(tmp_path / 'ds')
+    index = EntityIndex.build(root)
+    func = root / 'sub-01/func'
+    runs = (str(func / 'sub-01_task-a_run-1_bold.nii.gz'),
+            str(func / 'sub-01_task-a_run-2_bold.nii.gz'))
+    sidecars = index.companions(runs, kinds=('sidecar',))['sidecar']
+    assert tuple(sidecars) == ({'TaskName': 'a', 'RepetitionTime': 1},
+                               {'TaskName': 'a', 'RepetitionTime': 2})
+
+
+def test_companions_missing_are_empty(tmp_path):
+    root = _dataset(tmp_path / 'ds')
+    index = EntityIndex.build(root)
+    run = str(root / 'sub-01/func/sub-01_task-a_run-2_bold.nii.gz')
+    table = index.companions((run,), kinds=('beh', 'mask'))
+    assert tuple(table.loc[run]) == ('', '')
+
+
+def test_replace_keeps_views_unchanged(tmp_path):
+    root = _dataset(tmp_path / 'ds')
+    index = EntityIndex.build(root)
+    view = index._view()
+    run = root / 'sub-01/func/sub-01_task-a_run-2_bold.nii.gz'
+    removed, added = index.replace(
+        (run,), (('sub-01/func', 'sub-01_task-a_run-3_bold.nii.gz', False)
+                 + ('',) * (len(ENTITY_INDEX_ROW) - 3),))
+    assert (removed, added) == (1, 1)
+    assert str(run) in tuple(view) and str(run) not in tuple(index)
+    assert len(view) == len(index)
+
+
+def test_select_and_mask(bids_dataset):
+    index = EntityIndex.build(bids_dataset)
+    assert index.select(subject='sub-01', ses='2', task='rest',
+                        bids_suffix='bold', extension='.nii.gz') == (
+        str(bids_dataset / 'sub-01/ses-2/func/'
+                           'sub-01_ses-2_task-rest_run-1_bold.nii.gz'),)
+    both = index.mask(task=('rest', 'memory'), bids_suffix='events')
+    assert both.sum() == 8
+    assert not index.select(sub='03')
+
+
+def test_groupby(bids_dataset):
+    index = EntityIndex.build(bids_dataset)
+    groups = index.groupby('sub', 'ses', bids_suffix='T1w')
+    assert sorted(groups) == [('01', '1'), ('01', '2'),
+                              ('02', '1'), ('02', '2')]
+    assert tuple(index.paths(groups[('02', '1')])) == (
+        str(bids_dataset / 'sub-02/ses-1/anat/sub-02_ses-1_T1w.nii.gz'),)
+
+
+def test_discard_removes_subtrees(bids_dataset):
+    index = EntityIndex.build(bids_dataset)
+    # The 'sub-02' directory has sub-02 components as well
+    total, below = len(index), len(index.select(sub='02'))
+    assert index.discard(bids_dataset / 'sub-02') == below
+    assert len(index) == total - below
+    assert not index.select(sub='02')
+    assert all(os.path.exists(_path) for _path in index)
+
+
+def test_extend_then_discard(bids_dataset):
+    index = EntityIndex.build(bids_dataset)
+    total = len(index)
+    row = ('sub-03/anat', 'sub-03_T1w.nii.gz', False) \
+        + ('',) * (len(ENTITY_INDEX_ROW) - 3)
+    assert index.extend((row,)) == 1
+    assert index.path(total) == \
+        str(bids_dataset / 'sub-03/anat/sub-03_T1w.nii.gz')
+    assert index.discard('sub-03/anat/sub-03_T1w.nii.gz') == 1
+    assert len(index) == total
+
+
+def test_sharded_build_matches_walk(bids_dataset):
+    assert sorted(EntityIndex.build(bids_dataset, processes=2)) == \
+        sorted(EntityIndex.build(bids_dataset))
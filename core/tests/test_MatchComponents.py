@@ -0,0 +1,82 @@
+"""
+Tests of ``MatchComponents`` matching and ranking.
+
+"""
+
+import asyncio
+
+from ...MatchComponents import AMatchComponents, MatchComponents
+from .conftest import make_files
+
+
+def test_ties_ranked_by_descending_path(tmp_path):
+    # Both candidates share as many components with ``src``,
+    # and their reversed paths sort the other way around
+    make_files(tmp_path, 'sub-01/func/sub-01_task-ab_bold.json',
+               'sub-01/func/sub-01_task-ba_bold.json')
+    src = tmp_path / 'sub-01/func/sub-01_task-c_bold.nii.gz'
+    matches = tuple(MatchComponents(tmp_path, recursive=True, src=str(src),
+                                    task='', extension='.json'))
+    assert matches == (str(tmp_path / 'sub-01/func/sub-01_task-ba_bold.json'),
+                       str(tmp_path / 'sub-01/func/sub-01_task-ab_bold.json'))
+
+
+def test_higher_score_ranked_first(tmp_path):
+    make_files(tmp_path, 'sub-01/func/sub-01_task-a_run-1_bold.json',
+               'sub-01/func/sub-01_task-a_run-2_bold.json')
+    src = tmp_path / 'sub-01/func/sub-01_task-a_run-1_bold.nii.gz'
+    matches = tuple(MatchComponents(tmp_path, recursive=True, src=str(src),
+                                    run='', extension='.json'))
+    assert matches[0] == str(
+        tmp_path / 'sub-01/func/sub-01_task-a_run-1_bold.json')
+    assert len(matches) == 2
+
+
+def test_limit_keeps_best_candidates(tmp_path):
+    make_files(tmp_path, *(f'sub-01/func/sub-01_task-{_t}_bold.json'
+                           for _t in 'abcd'))
+    src = tmp_path / 'sub-01/func/sub-01_task-z_bold.nii.gz'
+    matches = tuple(MatchComponents(tmp_path, recursive=True, src=str(src),
+                                    task='', extension='.json', limit=2))
+    assert matches == tuple(
+        str(tmp_path / f'sub-01/func/sub-01_task-{_t}_bold.json')
+        for _t in 'dc')
+
+
+def test_entities_compared_exactly(tmp_path):
+    make_files(tmp_path, 'sub-1/anat/sub-1_T1w.nii.gz',
+               'sub-10/anat/sub-10_T1w.nii.gz',
+               'sub-100/anat/sub-100_T1w.nii.gz')
+    matches = tuple(MatchComponents(tmp_path, recursive=True, sub='sub-1',
+                                    bids_suffix='T1w'))
+    assert matches == (str(tmp_path / 'sub-1/anat/sub-1_T1w.nii.gz'),)
+
+
+def test_empty_component_is_dropped(tmp_path):
+    make_files(tmp_path, 'sub-01/ses-1/anat/sub-01_ses-1_T1w.nii.gz',
+               'sub-01/ses-2/anat/sub-01_ses-2_T1w.nii.gz')
+    src = tmp_path / 'sub-01/ses-1/func/sub-01_ses-1_task-a_bold.nii.gz'
+    matches = tuple(MatchComponents(tmp_path, recursive=True, src=str(src),
+                                    task='', ses='', datatype='anat',
+                                    bids_suffix='T1w'))
+    assert len(matches) == 2
+
+
+def test_nifti_extensions_match_each_other(tmp_path):
+    make_files(tmp_path, 'sub-01/anat/sub-01_T1w.nii.gz',
+               'sub-01/anat/sub-01_T1w.json')
+    src = tmp_path / 'sub-01/anat/sub-01_T1w.nii'
+    matches = tuple(MatchComponents(tmp_path, recursive=True, src=str(src)))
+    assert matches == (str(tmp_path / 'sub-01/anat/sub-01_T1w.nii.gz'),)
+
+
+def test_async_matches_sync(tmp_path):
+    make_files(tmp_path, *(f'sub-01/func/sub-01_task-{_t}_bold.json'
+                           for _t in 'abcd'))
+    src = str(tmp_path / 'sub-01/func/sub-01_task-b_bold.nii.gz')
+    kwargs = dict(recursive=True, src=src, task='', extension='.json')
+
+    async def _collect():
+        return [_p async for _p in AMatchComponents(tmp_path, **kwargs)]
+
+    assert asyncio.run(_collect()) == list(MatchComponents(tmp_path, **kwargs))
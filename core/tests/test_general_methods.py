@@ -0,0 +1,222 @@
+"""
+Tests of ``bidspathlib.general_methods``.
+
+"""
+
+import asyncio
+import gzip
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ...general_methods import (
+    GetNiftiHeader, GitIgnoreMatcher, StatCache, _walk_pool, aiter_thread,
+    get_stat_cache, scandir_walk, set_stat_cache, threaded_map
+)
+from .conftest import make_files
+
+
+def test_stat_cache_is_opt_in():
+    assert get_stat_cache() is None
+
+
+def test_stat_cache_sees_invalidated_changes(tmp_path):
+    cache = StatCache(ttl=60)
+    path = tmp_path / 'sub-01_T1w.nii.gz'
+    assert not cache.exists(path)
+    make_files(tmp_path, path.name)
+    assert not cache.exists(path)
+    cache.invalidate(path)
+    assert cache.isfile(path) and not cache.isdir(path)
+
+
+def test_stat_cache_bounded_under_threads(tmp_path):
+    cache = StatCache(ttl=60, maxsize=8)
+    make_files(tmp_path, *(f'{_i}.txt' for _i in range(64)))
+    previous = set_stat_cache(cache)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            found = tuple(executor.map(
+                cache.isfile, (os.path.join(tmp_path, f'{_i}.txt')
+                               for _i in range(64))))
+    finally:
+        set_stat_cache(previous)
+    assert all(found) and len(cache) <= 8
+
+
+def test_scandir_walk_follows_symlinks_without_cycles(tmp_path):
+    make_files(tmp_path, 'data/sub-01/anat/sub-01_T1w.nii.gz')
+    os.symlink(tmp_path / 'data/sub-01', tmp_path / 'data/sub-02')
+    os.symlink(tmp_path / 'data', tmp_path / 'data/sub-01/loop')
+    found = sorted(os.path.relpath(_e.path, tmp_path / 'data')
+                   for _e in scandir_walk(tmp_path / 'data'))
+    assert found == ['sub-01', 'sub-01/anat', 'sub-01/anat/sub-01_T1w.nii.gz',
+                     'sub-01/loop', 'sub-02', 'sub-02/anat',
+                     'sub-02/anat/sub-01_T1w.nii.gz', 'sub-02/loop']
+
+
+def test_scandir_walk_reuses_its_pool(tmp_path):
+    make_files(tmp_path, 'a/b/c.txt')
+    tuple(scandir_walk(tmp_path, workers=3))
+    pool = _walk_pool(3)
+    tuple(scandir_walk(tmp_path, workers=3, sort=True))
+    assert _walk_pool(3) is pool
+
+
+def test_threaded_map_ordered_on_shared_pool(monkeypatch):
+    pool = _walk_pool(4)
+    monkeypatch.setattr(ThreadPoolExecutor, '__init__', None)
+    found = threaded_map(lambda _i: _i * 2, iter(range(100)),
+                         workers=4, window=3)
+    assert tuple(found) == tuple(range(0, 200, 2))
+    assert _walk_pool(4) is pool
+    assert tuple(threaded_map(str, range(3), workers=1)) == ('0', '1', '2')
+
+
+async def _collect(agen, limit=None):
+    found = []
+    async for item in agen:
+        found.append(item)
+        if len(found) == limit:
+            break
+    await agen.aclose()
+    return found
+
+
+def test_aiter_thread_yields_in_order():
+    found = asyncio.run(_collect(aiter_thread(range, 1000, maxsize=8)))
+    assert found == list(range(1000))
+
+
+def test_aiter_thread_reraises():
+    def _failing():
+        yield 1
+        raise OSError('listing failed')
+
+    with pytest.raises(OSError, match='listing failed'):
+        asyncio.run(_collect(aiter_thread(_failing)))
+
+
+def test_aiter_thread_bounded():
+    produced = []
+
+    async def _slow_consumer():
+        agen = aiter_thread(lambda: (produced.append(_i) or _i
+                                     for _i in range(100)), maxsize=4)
+        assert await agen.__anext__() == 0
+        await asyncio.sleep(0.2)
+        ahead = len(produced)
+        found = [0] + await _collect(agen)
+        return ahead, found
+
+    ahead, found = asyncio.run(_slow_consumer())
+    # Queued items, plus the one awaiting room and the one yielded
+    assert ahead <= 4 + 2
+    assert found == list(range(100))
+
+
+def test_aiter_thread_stops_producer_when_closed():
+    done = threading.Event()
+
+    def _endless():
+        try:
+            while True:
+                yield time.monotonic()
+        finally:
+            done.set()
+
+    found = asyncio.run(_collect(aiter_thread(_endless, maxsize=2), limit=3))
+    assert len(found) == 3 and done.wait(timeout=5)
+
+
+def _nifti_header(version: int, order: str, dim: tuple, pixdim: tuple,
+                  datatype: int = 4, xyzt_units: int = 2 | 16) -> bytes:
+    dim = (len(dim),) + dim + (1,) * (7 - len(dim))
+    pixdim = (1.0,) + pixdim + (0.0,) * (7 - len(pixdim))
+    if version == 1:
+        head = bytearray(348)
+        struct.pack_into(order + 'i', head, 0, 348)
+        struct.pack_into(order + '8h', head, 40, *dim)
+        struct.pack_into(order + 'h', head, 70, datatype)
+        struct.pack_into(order + '8f', head, 76, *pixdim)
+        head[123] = xyzt_units
+        return bytes(head) + b'\0' * 4
+    head = bytearray(540)
+    struct.pack_into(order + 'i', head, 0, 540)
+    struct.pack_into(order + 'h', head, 12, datatype)
+    struct.pack_into(order + '8q', head, 16, *dim)
+    struct.pack_into(order + '8d', head, 104, *pixdim)
+    struct.pack_into(order + 'i', head, 500, xyzt_units)
+    return bytes(head) + b'\0' * 4
+
+
+@pytest.mark.parametrize('version', (1, 2))
+@pytest.mark.parametrize('order', ('<', '>'))
+@pytest.mark.parametrize('extension', ('.nii', '.nii.gz'))
+def test_nifti_header(tmp_path, version, order, extension):
+    head = _nifti_header(version, order, (64, 64, 32, 200),
+                         (3.0, 3.0, 3.5, 2000.0))
+    path = tmp_path / f'sub-01_task-rest_bold{extension}'
+    path.write_bytes(gzip.compress(head + b'\0' * 4096)
+                     if extension == '.nii.gz' else head)
+    header = GetNiftiHeader(path)
+    assert header.version == version and header.ndim == 4
+    assert header.shape == (64, 64, 32, 200)
+    assert header.pixdim == (3.0, 3.0, 3.5, 2000.0)
+    assert header.tr == pytest.approx(2.0)
+    assert header.units == ('mm', 'msec') and header.datatype == 'int16'
+
+
+def test_nifti_header_3d_has_no_tr(tmp_path):
+    path = tmp_path / 'sub-01_T1w.nii'
+    path.write_bytes(_nifti_header(1, '<', (176, 256, 256), (1.0, 1.0, 1.0),
+                                   datatype=16, xyzt_units=2))
+    header = GetNiftiHeader(path)
+    assert (header.ndim, header.tr, header.datatype) == (3, 0.0, 'float32')
+
+
+def test_nifti_header_rejects_other_files(tmp_path):
+    path = tmp_path / 'sub-01_T1w.nii.gz'
+    path.write_bytes(gzip.compress(b'not a nifti image'))
+    with pytest.raises(ValueError):
+        GetNiftiHeader(path)
+
+
+_IGNORE_LINES = ('# comment', '', '/extra', 'doc/*.md', '**/tmp/**', 'logs/',
+                 '*.log', '!keep.log', 'a/**/b', '[!]]x.tsv', '[]a]y.tsv')
+
+
+@pytest.mark.parametrize('rel_path, is_dir, expected', (
+    ('extra', False, True),
+    ('extra/notes.txt', False, True),
+    ('sub-01/extra', False, False),
+    ('doc/index.md', False, True),
+    ('sub-01/doc/index.md', False, False),
+    ('sub-01/tmp/scratch/a.nii', False, True),
+    ('logs', True, True),
+    ('logs', False, False),
+    ('sub-01/logs/run.txt', False, True),
+    ('sub-01/run.log', False, True),
+    ('sub-01/keep.log', False, False),
+    ('a/b', False, True),
+    ('a/x/y/b', False, True),
+    ('sub-01/anat/sub-01_T1w.nii.gz', False, False),
+    ('sub-01/ax.tsv', False, True),
+    ('sub-01/]x.tsv', False, False),
+    (']y.tsv', False, True),
+    ('by.tsv', False, False),
+))
+def test_gitignore_matcher(rel_path, is_dir, expected):
+    assert GitIgnoreMatcher(_IGNORE_LINES)(rel_path, is_dir=is_dir) \
+        is expected
+
+
+def test_gitignore_matcher_from_file(tmp_path):
+    make_files(tmp_path, '.bidsignore', content='\n'.join(_IGNORE_LINES))
+    matcher = GitIgnoreMatcher.from_file(tmp_path / '.bidsignore')
+    assert matcher and len(matcher.patterns) == 9
+    assert not GitIgnoreMatcher.from_file(tmp_path / 'missing')
@@ -9,37 +9,75 @@ New bids_path_functions should be independent of other ``BIDSPath`` files,
 except for those defined in the ``bidspathlib.constants.BIDSPathConstants``
 and ``bidspathlib.bids_path_functions.BIDSPathCoreFunctions`` modules.
 This is to avoid circular imports.
+
+Each function accepts an optional ``root`` keyword: the declared
+top-level directory of the dataset. When provided, the answer is
+inferred from path segments only, without any file system access
+(e.g. for listings of datasets that are not mounted locally).
 """
 
 import os
 import re
 from os import PathLike
-from os.path import basename, isdir
+from os.path import basename
 from pathlib import Path
-from typing import List, Union, Text, Tuple
+from typing import List, Optional, Union, Text, Tuple
 
 from ..constants.bidspathlib_docs import DATATYPE_STRINGS, DD_FILE
-from .BIDSPathCoreFunctions import find_entity
+from .BIDSPathCoreFunctions import find_entity, pure_isdir, relative_parts
+from ..general_methods import cached_exists, cached_isdir
+
+
+def _isdir(src: Union[Text, PathLike],
+           root: Optional[Union[Text, PathLike]] = None) -> bool:
+    """
+    Returns True if ``src`` is a directory.
+
+    If ``root`` is provided, it is inferred from the name of ``src``,
+    which must be ``root`` or below it, without accessing the file system.
+    """
+    if root is None:
+        return cached_isdir(src)
+    try:
+        relative_parts(src, root)
+    except ValueError:
+        return False
+    return pure_isdir(src)
 
 
-def IsBIDSRoot(src: Union[Text, PathLike]) -> bool:
+def IsBIDSRoot(src: Union[Text, PathLike],
+               root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a BIDS dataset's top-level directory.
 
     If ``src`` is in a derivatives sub dataset,
     returns this sub dataset's top-level directory.
+    If ``root`` (the dataset's top-level directory) is provided,
+    ``src`` must either be ``root`` or a 'derivatives/<pipeline>'
+    directory below it, inferred without accessing the file system.
     """
-    try:
-        return DD_FILE in os.listdir(str(src))
-    except NotADirectoryError:
-        return False
+    if root is not None:
+        try:
+            parts = relative_parts(src, root)
+        except ValueError:
+            return False
+        return not parts or all((len(parts) > 1,
+                                 parts[-2:-1] == ('derivatives',),
+                                 pure_isdir(src)))
+    return cached_exists(os.path.join(str(src), DD_FILE))
 
 
-def IsDatasetRoot(src: Union[Text, PathLike]) -> bool:
+def IsDatasetRoot(src: Union[Text, PathLike],
+                  root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to the BIDS dataset's topmost directory.
 
+    If ``root`` is provided, returns True if ``src`` is ``root``,
+    without accessing the file system.
     """
+    if root is not None:
+        return all((Path(str(src)) == Path(str(root)),
+                    'derivatives' not in str(src)))
     try:
         assert Path(src).is_dir()
         return all((DD_FILE in os.listdir(src),
@@ -48,31 +86,36 @@ def IsDatasetRoot(src: Union[Text, PathLike]) -> bool:
         return False
 
 
-def IsSubjectDir(src: Union[Text, PathLike]) -> bool:
+def IsSubjectDir(src: Union[Text, PathLike],
+                 root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a subject-level directory.
 
     """
-    return all((Path(src).name.startswith('sub-'), isdir(src)))
+    return all((Path(src).name.startswith('sub-'), _isdir(src, root)))
 
 
-def IsSessionDir(src: Union[Text, PathLike]) -> bool:
+def IsSessionDir(src: Union[Text, PathLike],
+                 root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a session-level directory.
 
     """
-    return all((Path(src).name == find_entity(src, 'ses'), isdir(src)))
+    return all((Path(src).name == find_entity(src, 'ses'),
+                _isdir(src, root)))
 
 
-def IsDatatypeDir(src: Union[Text, PathLike]) -> bool:
+def IsDatatypeDir(src: Union[Text, PathLike],
+                  root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a datatype-level directory.
 
     """
-    return all((Path(src).name in DATATYPE_STRINGS, isdir(src)))
+    return all((Path(src).name in DATATYPE_STRINGS, _isdir(src, root)))
 
 
-def IsDerivatives(src: Union[Text, PathLike]) -> bool:
+def IsDerivatives(src: Union[Text, PathLike],
+                  root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Indicates if the dataset is derived from another one or not.
 
@@ -80,15 +123,18 @@ def IsDerivatives(src: Union[Text, PathLike]) -> bool:
     return 'derivatives' in str(src)
 
 
-def IsDerivativesRoot(src: Union[Text, PathLike]) -> bool:
+def IsDerivativesRoot(src: Union[Text, PathLike],
+                      root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a derived dataset's root directory.
 
     """
-    return all((IsBIDSRoot(str(src)), IsDerivatives(str(src))))
+    return all((IsBIDSRoot(str(src), root=root), IsDerivatives(str(src))))
 
 
-def IsFMRIPrepDerivatives(src: Union[Text, PathLike]) -> bool:
+def IsFMRIPrepDerivatives(src: Union[Text, PathLike],
+                          root: Optional[Union[Text, PathLike]] = None
+                          ) -> bool:
     """
     Returns True if path ``src`` points to a file or directory made with FMRIPrep.
 
@@ -7,6 +7,7 @@ class methods of the ``BIDSPathBase.BIDSPathBase`` object.
 """
 
 import json
+import os
 
 from nibabel.nifti1 import Nifti1Image
 from nilearn.image import load_img
@@ -14,10 +15,10 @@ from os import PathLike
 from os.path import dirname
 from pandas import read_csv, Series
 from typing import (
-    Dict, Iterable, List, Optional, Text, Tuple, Union
+    Callable, Dict, Iterable, List, Optional, Text, Tuple, Union
 )
 
-from ..general_methods import GetHashCheckSum
+from ..general_methods import GetHashCheckSum, GetNiftiHeader
 from ..constants.bidspathlib_docs import (
     NIFTI_ERRORS, NIFTI_EXTENSIONS
 )
@@ -25,7 +26,7 @@ from .BIDSFileID import (
     IsNifti, IsEvent, IsBeh, IsSidecar
 )
 from .BIDSPathCoreFunctions import (
-    find_entity, find_extension
+    find_entity, find_extension, split_components
 )
 from .BIDSPathFunctions import BIDSRoot, SubDir
 
@@ -35,12 +36,15 @@ def ShapeLength(src: Union[Text, Nifti1Image, PathLike]
     """
     Returns the number of dimensions of a nifti image file.
 
+    Only the file's header is read.
     """
+    if isinstance(src, Nifti1Image):
+        return len(src.shape)
     if not find_extension(src) in NIFTI_EXTENSIONS:
         return 0
     try:
-        return len(load_img(str(src)).shape)
-    except NIFTI_ERRORS:
+        return GetNiftiHeader(str(src)).ndim
+    except NIFTI_ERRORS + (OSError, ValueError):
         return 0
 
 
@@ -71,37 +75,142 @@ def GetImgHeader(img: Nifti1Image) -> Dict:
         return {}
 
 
-def GetTR(img: Nifti1Image) -> float:
+def GetTR(img: Union[Text, PathLike, Nifti1Image]) -> float:
     """
     Returns a ``Nifti1Image`` scan's repetition time from its header.
 
+    If ``img`` is a path, only the file's header is read
+    and the repetition time is returned in seconds.
     """
+    if isinstance(img, (str, PathLike)):
+        try:
+            return GetNiftiHeader(str(img)).tr
+        except NIFTI_ERRORS + (OSError, ValueError):
+            return 0.0
     try:
         return float(img.header.get_zooms()[-1])
     except NIFTI_ERRORS:
         return 0.0
 
 
-def GetFrameTimes(img: Nifti1Image) -> Iterable:
+def GetFrameTimes(img: Union[Text, PathLike, Nifti1Image]) -> Iterable:
     """
     Returns scan frame onset times from the repetition time of ``img``.
 
+    If ``img`` is a path, only the file's header is read.
     """
     try:
-        _shape, tr, result, start = img.shape[-1], GetTR(img), [], 0
+        shape = GetNiftiHeader(str(img)).shape \
+            if isinstance(img, (str, PathLike)) else img.shape
+        _shape, tr, result, start = shape[-1], GetTR(img), [], 0
         for frame in range(_shape):
             start += tr
             result.append(start)
         return result
-    except NIFTI_ERRORS:
+    except NIFTI_ERRORS + (OSError, ValueError):
         return []
 
 
+def _json_names(directory: Text) -> Tuple:
+    """
+    Returns the sorted names of the JSON files in ``directory``.
+
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return tuple(sorted(_e.name for _e in entries
+                                if _e.name.endswith('.json')
+                                and _e.is_file()))
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return ()
+
+
+def _read_json(path: Text) -> Dict:
+    """
+    Returns the content of JSON file ``path``, or {} if unreadable.
+
+    """
+    try:
+        with open(path, mode='r') as jfile:
+            return json.load(jfile)
+    except (FileNotFoundError, TypeError, ValueError):
+        return {}
+
+
+def SidecarChain(src: Union[Text, PathLike],
+                 root: Optional[Union[Text, PathLike]] = None,
+                 listing: Optional[Callable] = None) -> Tuple:
+    """
+    Returns the paths of the JSON sidecars applying to file ``src``.
+
+    As per the BIDS inheritance principle, a sidecar applies to
+    ``src`` if it is in one of the directories from the dataset's
+    top-level directory down to the directory of ``src``, has the
+    same suffix, and each of its entities is also an entity of ``src``
+    with the same value. Sidecars are returned top-down; within a
+    directory, those with fewer entities come first.
+
+    Args:
+        src: str or PathLike
+            Path of a file within a BIDS dataset.
+
+        root: str or PathLike (optional)
+            Top-level directory of the dataset (see ``BIDSRoot``).
+
+        listing: Callable[[str], Tuple[str]] (optional)
+            Returns the sorted names of the JSON files in a directory
+            (e.g. from an index). Defaults to listing the file system.
+
+    References:
+        <https://bids-specification.readthedocs.io/en/stable/common-principles.html#the-inheritance-principle>
+    """
+    src = os.path.abspath(str(src))
+    _parsed = split_components(src)
+    if not _parsed.bids_suffix:
+        return ()
+    _root = os.path.abspath(str(BIDSRoot(src, root=root)))
+    _rel = os.path.relpath(os.path.dirname(src), _root)
+    directories = [_root]
+    for part in () if _rel == os.curdir else _rel.split(os.sep):
+        directories.append(os.path.join(directories[-1], part))
+    listing = listing or _json_names
+    chain = []
+    for directory in directories:
+        applicable = []
+        for name in listing(directory):
+            path = os.path.join(directory, name)
+            _candidate = split_components(path)
+            if _candidate.bids_suffix != _parsed.bids_suffix:
+                continue
+            if all(not _value or _value == _own for _value, _own
+                   in zip(_candidate.entities, _parsed.entities)):
+                applicable.append((sum(map(bool, _candidate.entities)), path))
+        chain.extend(_path for _, _path in sorted(applicable))
+    return tuple(chain)
+
+
+def GetSidecar(src: Union[Text, PathLike],
+               root: Optional[Union[Text, PathLike]] = None,
+               listing: Optional[Callable] = None) -> Dict:
+    """
+    Returns the metadata of file ``src`` merged along its sidecars.
+
+    Sidecars from ``SidecarChain`` are read top-down, so values
+    of the most specific ones take precedence.
+    Returns an empty dictionary if no sidecar applies.
+    """
+    metadata = {}
+    for path in SidecarChain(src, root=root, listing=listing):
+        metadata.update(_read_json(path))
+    return metadata
+
+
 __methods__: Tuple = (
-    ShapeLength, GetFrameTimes, GetImgHeader, GetNiftiImage, GetTR
+    ShapeLength, GetFrameTimes, GetImgHeader, GetNiftiImage, GetTR,
+    SidecarChain, GetSidecar
 )
 
 __all__: List = [
     "ShapeLength", "GetFrameTimes", "GetImgHeader", "GetNiftiImage", "GetTR",
-    "__methods__"
+    "SidecarChain", "GetSidecar", "__methods__"
 ]
@@ -9,20 +9,60 @@ New bids_path_functions should be independent of other ``BIDSPath`` files,
 except for those defined in the ``bidspathlib.constants.BIDSPathConstants``
 and ``bidspathlib.bids_path_functions.BIDSPathCoreFunctions`` modules.
 This is to avoid circular imports.
+
+Each function accepts an optional ``root`` keyword: the declared
+top-level directory of the dataset. When provided, the answer is
+inferred from path segments only, without any file system access.
 """
 
+from functools import lru_cache
 from os import PathLike
-from os.path import isfile
-from typing import List, Union, Text, Tuple
+from os.path import basename
+from typing import Dict, FrozenSet, List, Optional, Union, Text, Tuple
 
 from nibabel import Nifti1Image
-from nilearn.image import load_img
 
 from ..constants.bidspathlib_docs import NIFTI_EXTENSIONS, NIFTI_ERRORS
-from .BIDSPathCoreFunctions import find_extension, find_bids_suffix
+from .BIDSPathCoreFunctions import (
+    find_extension, find_bids_suffix, pure_isfile, relative_parts
+)
+from ..general_methods import cached_isfile, GetNiftiHeader
+
+# BIDS suffixes of 4-dimensional images (i.e. time series, volumes)
+_4D_SUFFIXES: FrozenSet = frozenset(('bold', 'cbv', 'phase', 'dwi',
+                                     'asl', 'pet'))
+
+# ``BIDSFile`` subclass names of files identified by name, suffix
+# or extension, in order of precedence
+_NAME_CLASSES: Dict = {'CHANGES': 'ChangesFile', 'README': 'ReadMeFile',
+                       'LICENSE': 'LicenseFile',
+                       '.gitattributes': 'GitAttributesFile'}
+_SUFFIX_CLASSES: Dict = {'events': 'EventsFile', 'beh': 'BehFile',
+                         'physio': 'PhysioFile'}
+_EXTENSION_CLASSES: Dict = {'.json': 'SideCarFile'}
+
+# ``BIDSFile`` subclass names of 3D and 4D Nifti images
+_NDIM_CLASSES: Dict = {3: 'MRIFile', 4: 'FMRIFile'}
+
+
+def _isfile(src: Union[Text, PathLike],
+            root: Optional[Union[Text, PathLike]] = None) -> bool:
+    """
+    Returns True if ``src`` is a file.
+
+    If ``root`` is provided, it is inferred from the name of ``src``,
+    which must be below ``root``, without accessing the file system.
+    """
+    if root is None:
+        return cached_isfile(src)
+    try:
+        return all((relative_parts(src, root), pure_isfile(src)))
+    except ValueError:
+        return False
 
 
-def IsNifti(src: Union[Text, PathLike]) -> bool:
+def IsNifti(src: Union[Text, PathLike],
+            root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if the path ``src`` points to a Nifti file.
     """
@@ -30,60 +70,73 @@ def IsNifti(src: Union[Text, PathLike]) -> bool:
     return find_extension(src) in NIFTI_EXTENSIONS
 
 
-def Is4D(src: Union[Text, Nifti1Image, PathLike]
-         ) -> bool:
+def Is4D(src: Union[Text, Nifti1Image, PathLike],
+         root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a 4-dimensional Nifti file.
 
+    Only the file's header is read.
+    If ``root`` is provided, the number of dimensions is inferred
+    from the BIDS suffix (e.g. 'bold', 'dwi') instead of the image.
     """
     if not find_extension(src) in NIFTI_EXTENSIONS:
         return False
+    if root is not None:
+        return find_bids_suffix(src) in _4D_SUFFIXES
     try:
-        return len(load_img(str(src)).shape) == 4
-    except NIFTI_ERRORS:
+        return GetNiftiHeader(str(src)).ndim == 4
+    except NIFTI_ERRORS + (OSError, ValueError):
         return False
 
 
-def Is3D(src: Union[Text, Nifti1Image, PathLike]
-         ) -> bool:
+def Is3D(src: Union[Text, Nifti1Image, PathLike],
+         root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a 3-dimensional Nifti file.
 
+    Only the file's header is read.
+    If ``root`` is provided, the number of dimensions is inferred
+    from the BIDS suffix (e.g. 'T1w', 'mask') instead of the image.
     """
     if not find_extension(src) in NIFTI_EXTENSIONS:
         return False
+    if root is not None:
+        return find_bids_suffix(src) not in _4D_SUFFIXES
     try:
-        return len(load_img(str(src)).shape) == 3
-    except NIFTI_ERRORS:
+        return GetNiftiHeader(str(src)).ndim == 3
+    except NIFTI_ERRORS + (OSError, ValueError):
         return False
 
 
-def IsEvent(src: Union[Text, PathLike]
-            ) -> bool:
+def IsEvent(src: Union[Text, PathLike],
+            root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if path ``src`` points to a task events file.
 
     """
-    return all((isfile(src), find_bids_suffix(src) == 'events'))
+    return all((_isfile(src, root), find_bids_suffix(src) == 'events'))
 
 
-def IsBeh(src: Union[Text, PathLike]) -> bool:
+def IsBeh(src: Union[Text, PathLike],
+          root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if path ``src`` points to behavioural recordings file.
 
     """
-    return all((isfile(str(src)), find_bids_suffix(src) == 'beh'))
+    return all((_isfile(str(src), root), find_bids_suffix(src) == 'beh'))
 
 
-def IsPhysio(src: Union[Text, PathLike]) -> bool:
+def IsPhysio(src: Union[Text, PathLike],
+             root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if path ``src`` points to physiological recordings file.
 
     """
-    return all((isfile(str(src)), find_bids_suffix(src) == 'physio'))
+    return all((_isfile(str(src), root), find_bids_suffix(src) == 'physio'))
 
 
-def IsSidecar(src: Union[Text, PathLike]) -> bool:
+def IsSidecar(src: Union[Text, PathLike],
+              root: Optional[Union[Text, PathLike]] = None) -> bool:
     """
     Returns True if ``src`` points to a .json sidecar file.
 
@@ -91,11 +144,65 @@ def IsSidecar(src: Union[Text, PathLike]) -> bool:
     return find_extension(src) == '.json'
 
 
+@lru_cache(maxsize=1024)
+def _dispatch(extension: Text, bids_suffix: Text, name: Text) -> Tuple:
+    """
+    Returns the candidate ``BIDSFile`` subclass names of a file.
+
+    Candidates are ordered by precedence. A Nifti image's dimensionality
+    is unknown from its name, so its candidates start with None,
+    standing for "``MRIFile`` or ``FMRIFile``, as per its header".
+    """
+    candidates = (None,) if extension in NIFTI_EXTENSIONS else ()
+    candidates += tuple(filter(None, (
+        _SUFFIX_CLASSES.get(bids_suffix),
+        _EXTENSION_CLASSES.get(extension),
+        _NAME_CLASSES.get(name))))
+    return candidates
+
+
+def FileClassName(src: Union[Text, PathLike],
+                  root: Optional[Union[Text, PathLike]] = None) -> Text:
+    """
+    Returns the name of the ``BIDSFile`` subclass matching file ``src``.
+
+    The class is looked up from the file's extension, BIDS suffix
+    and name. Only Nifti images are opened, to read the number of
+    dimensions from their header (once per file).
+    Returns an empty string if no subclass matches.
+
+    Args:
+        src: str or PathLike
+            Path of an existing file.
+
+        root: str or PathLike (optional)
+            Declared top-level directory of the dataset.
+            If provided, Nifti images are never opened and their
+            dimensionality is inferred from their BIDS suffix.
+    """
+    extension, bids_suffix = find_extension(src), find_bids_suffix(src)
+    name = basename(src)
+    # Names only matter for a few files: keep the cache key small
+    for candidate in _dispatch(extension, bids_suffix,
+                               name if name in _NAME_CLASSES else ''):
+        if candidate is not None:
+            return candidate
+        if root is not None:
+            return _NDIM_CLASSES[4 if bids_suffix in _4D_SUFFIXES else 3]
+        try:
+            ndim = GetNiftiHeader(str(src)).ndim
+        except NIFTI_ERRORS + (OSError, ValueError):
+            continue
+        if ndim in _NDIM_CLASSES:
+            return _NDIM_CLASSES[ndim]
+    return ''
+
+
 __methods__: Tuple = (
-    IsBeh, IsEvent, IsNifti, IsPhysio, IsSidecar, Is3D, Is4D
+    IsBeh, IsEvent, IsNifti, IsPhysio, IsSidecar, Is3D, Is4D, FileClassName
 )
 
 __all__: List = [
     "IsBeh", "IsEvent", "IsNifti", "IsPhysio", "IsSidecar", "Is3D", "Is4D",
-    "__methods__"
+    "FileClassName", "__methods__"
 ]
@@ -6,18 +6,151 @@ Each function defined here acts as the base of
 other classes and methods in the ``bidspathlib`` package.
 """
 
+import os
 import re
 import warnings
+from collections import namedtuple
+from functools import lru_cache
+from itertools import islice
 from os import PathLike
-from pathlib import Path
+from pandas import Categorical, DataFrame, Index
+from pandas.api.types import union_categoricals
+from pathlib import PurePath
 from typing import (
-    Dict, Generator, List, Optional, Pattern, Text, Tuple, Union
+    Dict, FrozenSet, Generator, Iterable, List,
+    Optional, Pattern, Set, Text, Tuple, Type, Union
 )
 
 from ..constants.bidspathlib_docs import (
     DATATYPE_STRINGS, DEPRECATED_BIDS_SUFFIXES, ENTITIES_ORDER,
-    ENTITY_STRINGS, SUFFIX_PATTERNS
+    ENTITY_STRINGS, SUFFIX_STRINGS
 )
+from ..general_methods import cached_isdir, scandir_walk
+
+PARSED_COLUMNS: Tuple = ENTITIES_ORDER + ('bids_suffix', 'extension', 'datatype')
+
+ParsedComponents: Type[Tuple] = namedtuple(
+    'ParsedComponents',
+    field_names=('entities', 'bids_suffix', 'extension', 'datatype')
+)
+
+_ENTITY_INDEX: Dict = {_e: _i for _i, _e in enumerate(ENTITY_STRINGS)}
+_DATATYPE_KEYS: FrozenSet = frozenset(DATATYPE_STRINGS)
+_SUFFIX_KEYS: FrozenSet = frozenset(SUFFIX_STRINGS)
+_WARNED_SUFFIXES: Set = set()
+_VALUE_PATTERN: Pattern = re.compile(r"[a-zA-Z\d]*")
+_NO_ENTITIES: Tuple = ('',) * len(ENTITY_STRINGS)
+# Top-level BIDS files without extension
+_NO_EXTENSION_NAMES: FrozenSet = frozenset(('CHANGES', 'README', 'LICENSE',
+                                            '.bidsignore', '.gitattributes',
+                                            '.gitignore'))
+# Extensions of files in BIDS datasets and common derivatives
+# (directory-based formats like '.ds' or '.ome.zarr' are excluded)
+_FILE_EXTENSIONS: FrozenSet = frozenset((
+    '.ave', '.bdf', '.bval', '.bvec', '.chn', '.con', '.csv', '.dat',
+    '.edf', '.eeg', '.fdt', '.fif', '.gii', '.gz', '.h5', '.html', '.jpg',
+    '.json', '.kdf', '.lta', '.mat', '.md', '.mgz', '.mhd', '.mrk', '.nii',
+    '.nii.gz', '.nwb', '.png', '.pos', '.raw', '.rst', '.set', '.snirf',
+    '.sqd', '.svg', '.tif', '.trg', '.tsv', '.tsv.gz', '.txt', '.vhdr',
+    '.vmrk', '.x5'
+))
+
+
+@lru_cache(maxsize=2 ** 16)
+def _entity_pattern(entity: Text) -> Pattern:
+    """
+    Returns the compiled lookbehind pattern of a non-indexed ``entity``.
+
+    """
+    return re.compile(fr"(?<={entity}-)[a-zA-Z\d]*")
+
+
+def _fill_entities(values: List, name: Text) -> None:
+    """
+    Fills the empty slots of ``values`` from the key-value chunks of ``name``.
+
+    Entities already found are kept, so the leftmost occurrence wins.
+    """
+    for chunk in name.split('_'):
+        key, hyphen, value = chunk.partition('-')
+        if hyphen:
+            index = _ENTITY_INDEX.get(key)
+            if index is not None and not values[index]:
+                values[index] = _VALUE_PATTERN.match(value).group()
+
+
+@lru_cache(maxsize=2 ** 16)
+def _split_parents(parents: Text) -> Tuple:
+    """
+    Returns the entities and datatype found in directory names of ``parents``.
+
+    Cached since sibling files share the same parent directories.
+    """
+    values, datatype = list(_NO_ENTITIES), ''
+    for segment in parents.split(os.sep):
+        if not datatype and segment in _DATATYPE_KEYS:
+            datatype = segment
+        if '-' in segment:
+            _fill_entities(values, segment)
+    return tuple(values), datatype
+
+
+def _split_components(src: Text) -> Tuple:
+    """
+    Uncached body of ``split_components``.
+
+    """
+    if os.altsep:
+        src = src.replace(os.altsep, os.sep)
+    parents, _, name = src.rstrip(os.sep).rpartition(os.sep)
+    stem, dot, extension = name.partition('.')
+    values, datatype = _split_parents(parents)
+    if '-' in stem:
+        values = list(values)
+        _fill_entities(values, stem)
+        values = tuple(values)
+    if not datatype and stem in _DATATYPE_KEYS:
+        datatype = stem
+    bids_suffix = stem.rpartition('_')[2]
+    bids_suffix = bids_suffix if bids_suffix in _SUFFIX_KEYS else ''
+    return ParsedComponents(values, bids_suffix, dot + extension, datatype)
+
+
+_split_components_cached = lru_cache(maxsize=2 ** 16)(_split_components)
+
+
+def split_components(src: Union[Text, PathLike]) -> Tuple:
+    """
+    Returns all BIDS components of path ``src`` in a single pass.
+
+    The file name is split once into its '_'-separated
+    key-value chunks, its suffix and its extension.
+    Entities missing from the file name are looked up
+    in the parent directory names (e.g. 'sub-<label>/ses-<label>').
+
+    ``BIDSPath`` objects are parsed once per instance
+    and their stored record is returned as-is.
+
+    Args:
+        src: str, os.PathLike or type(Path)
+            Path to the BIDS dataset file or directory.
+
+    Returns: ParsedComponents
+        ``namedtuple`` with fields:
+            entities: Tuple[str]
+                Entity values (key excluded) in ``ENTITY_STRINGS`` order,
+                empty strings standing for missing entities.
+            bids_suffix: str
+            extension: str
+            datatype: str
+
+    References:
+        <https://bids-specification.readthedocs.io/en/stable/02-common-principles.html#file-name-structure>
+    """
+    _get_components = getattr(src, '__get_components__', None)
+    if _get_components is not None:
+        return _get_components()
+    return _split_components_cached(str(src))
 
 
 def find_datatype(src: Union[Text, PathLike],
@@ -43,13 +176,8 @@ def find_datatype(src: Union[Text, PathLike],
         <https://bids-specification.readthedocs.io/en/stable/schema/index.html#datatypesyaml>
         Bullet-point 6.
     """
-    to_compile = '|'.join(DATATYPE_STRINGS) \
-        if datatype is None else datatype
-    pattern: Pattern = re.compile(to_compile)
-    try:
-        return pattern.search(str(src)).group()
-    except AttributeError:
-        return ''
+    _datatype = split_components(src).datatype
+    return _datatype if datatype in (None, _datatype) else ''
 
 
 def find_entity(src: Union[Text, PathLike], entity: Text,
@@ -79,19 +207,23 @@ def find_entity(src: Union[Text, PathLike], entity: Text,
         <https://bids-specification.readthedocs.io/en/stable/schema/index.html#modalitiesyaml_1>
     """
 
-    pat: Pattern = re.compile(fr"(?<={entity}-)[a-zA-Z\d]*")
-    try:
-        value = pat.search(str(src)).group()
-        value = f'{entity}-' + value if keep_key else value
-    except AttributeError:
-        value: Text = ''
-    return value
+    index = _ENTITY_INDEX.get(entity)
+    if index is None:
+        match = _entity_pattern(entity).search(str(src))
+        value = match.group() if match else ''
+    else:
+        value = split_components(src).entities[index]
+    return f'{entity}-' + value if all((value, keep_key)) else value
 
 
 def find_bids_suffix(src: Union[Text, PathLike]) -> Text:
     """
     Returns a file's BIDS suffix, if any.
 
+    The suffix is the last '_'-separated chunk of the file name
+    (extension excluded), provided it is a supported BIDS suffix.
+    Deprecated suffixes raise a ``FutureWarning`` once per process.
+
     Args:
         src: str, os.PathLike or type(Path)
 
@@ -105,17 +237,16 @@ def find_bids_suffix(src: Union[Text, PathLike]) -> Text:
         <https://bids-specification.readthedocs.io/en/stable/02-common-principles.html>
         Bullet-point 13.
     """
-    try:
-        _suf = SUFFIX_PATTERNS.search(str(src)).group()
-        if _suf in DEPRECATED_BIDS_SUFFIXES.keys():
-            _msg = DEPRECATED_BIDS_SUFFIXES[_suf]
-            warnings.warn('\n'.join((f"{_suf} ({_msg['long_name']}) is deprecated.",
-                                     f"{_msg['change']}",
-                                     f"{_msg['description']}")),
-                          FutureWarning)
-        return _suf
-    except AttributeError:
-        return ''
+    _suf = split_components(src).bids_suffix
+    if _suf in DEPRECATED_BIDS_SUFFIXES.keys() \
+            and _suf not in _WARNED_SUFFIXES:
+        _WARNED_SUFFIXES.add(_suf)
+        _msg = DEPRECATED_BIDS_SUFFIXES[_suf]
+        warnings.warn('\n'.join((f"{_suf} ({_msg['long_name']}) is deprecated.",
+                                 f"{_msg['change']}",
+                                 f"{_msg['description']}")),
+                      FutureWarning)
+    return _suf
 
 
 def find_extension(src: Union[Text, PathLike]) -> Text:
@@ -131,11 +262,7 @@ def find_extension(src: Union[Text, PathLike]) -> Text:
 
     Returns: str
     """
-    try:
-        split_name = str(src).split('.', maxsplit=1)
-        return '.' + split_name[1]
-    except IndexError:
-        return ''
+    return split_components(src).extension
 
 
 def EntityGen(src: Union[Text, PathLike]) -> Generator:
@@ -153,9 +280,7 @@ def EntityGen(src: Union[Text, PathLike]) -> Generator:
             {<entity name>: <entity value>}
             - i.e.: {subject: <entity value>}
     """
-    yield from ((ENTITIES_ORDER[e[0]],
-                 find_entity(src, e[1], keep_key=False))
-                for e in enumerate(ENTITY_STRINGS))
+    yield from zip(ENTITIES_ORDER, split_components(src).entities)
 
 
 def EntityStringGen(src: Union[Text, PathLike]) -> Generator:
@@ -173,9 +298,9 @@ def EntityStringGen(src: Union[Text, PathLike]) -> Generator:
             {<entity string>: <entity string>-<entity value>}
             - i.e.: {sub: sub-<entity value>}
     """
-    yield from ((ENTITY_STRINGS[e[0]],
-                 find_entity(src, e[1], keep_key=True))
-                for e in enumerate(ENTITY_STRINGS))
+    yield from ((_key, f'{_key}-{_value}' if _value else '')
+                for _key, _value in zip(ENTITY_STRINGS,
+                                        split_components(src).entities))
 
 
 def ComponentsGen(src: Union[Text, PathLike], **kwargs) -> Generator:
@@ -216,6 +341,98 @@ def ComponentsGen(src: Union[Text, PathLike], **kwargs) -> Generator:
     yield from (item for item in entity_dict.items())
 
 
+def _encode_columns(chunks: Iterable[Tuple], width: int) -> Tuple:
+    """
+    Dictionary-encodes chunks of ``width`` columns and concatenates them.
+
+    """
+    encoded = [tuple(map(Categorical, _chunk)) for _chunk in chunks]
+    if not encoded:
+        return tuple(Categorical([]) for _ in range(width))
+    return tuple(map(union_categoricals, zip(*encoded))) \
+        if len(encoded) > 1 else encoded[0]
+
+
+def parse_many(paths: Iterable[Union[Text, PathLike]],
+               chunksize: int = 2 ** 16) -> DataFrame:
+    """
+    Returns the BIDS components of many paths as columns.
+
+    Paths are parsed ``chunksize`` at a time and each column is
+    dictionary-encoded (``pandas.Categorical``), so memory grows with
+    the number of distinct values rather than with the number of paths.
+    Missing components are encoded as empty strings.
+
+    Args:
+        paths: Iterable[str or PathLike]
+            Paths of files or directories (e.g. a file system listing
+            or a ``numpy`` array of strings).
+
+        chunksize: int (Default = 65536)
+            Number of paths parsed before being encoded.
+
+    Returns: DataFrame
+        One categorical column per entity in ``ENTITIES_ORDER``
+        followed by "bids_suffix", "extension" and "datatype",
+        indexed by the path strings.
+    """
+    paths, index = iter(paths), []
+
+    def _chunks() -> Generator:
+        while True:
+            _paths = list(map(str, islice(paths, chunksize)))
+            if not _paths:
+                return
+            index.extend(_paths)
+            rows = tuple(map(_split_components, _paths))
+            yield (*zip(*(_row.entities for _row in rows)),
+                   *tuple(zip(*rows))[1:])
+
+    columns = _encode_columns(_chunks(), len(PARSED_COLUMNS))
+    return DataFrame(dict(zip(PARSED_COLUMNS, columns)),
+                     index=Index(index, name='path'))
+
+
+def relative_parts(src: Union[Text, PathLike],
+                   root: Union[Text, PathLike]) -> Tuple:
+    """
+    Returns the segments of path ``src`` relative to directory ``root``.
+
+    Pure string operation, without any file system access.
+
+    Raises:
+        ValueError: If ``src`` is not ``root`` nor below it.
+    """
+    return PurePath(str(src)).relative_to(PurePath(str(root))).parts
+
+
+def pure_isfile(src: Union[Text, PathLike]) -> bool:
+    """
+    Returns True if path ``src`` names a file, judging by its name only.
+
+    In a BIDS dataset, files have a known extension (whole, e.g.
+    '.nii.gz', or its last part, e.g. '.gii' of '.surf.gii'), with the
+    exception of top-level 'CHANGES', 'README', 'LICENSE' and
+    '.bidsignore' files. Directory names (e.g. 'sub-01', 'anat',
+    'fmriprep-20.2.1', '.git') have none.
+    """
+    name = PurePath(str(src)).name
+    if name in _NO_EXTENSION_NAMES:
+        return True
+    extension = find_extension(name)
+    return extension in _FILE_EXTENSIONS \
+        or extension[extension.rfind('.'):] in _FILE_EXTENSIONS
+
+
+def pure_isdir(src: Union[Text, PathLike]) -> bool:
+    """
+    Returns True if path ``src`` names a directory, judging by its name only.
+
+    See ``pure_isfile``.
+    """
+    return not pure_isfile(src)
+
+
 ########################################################################
 # For directories
 ########################################################################
@@ -233,9 +450,8 @@ def ExtensionGen(src: Union[Text, PathLike]) -> Generator:
         Yields strings corresponding to the whole extension
         of files in the directory ``src``.
     """
-    src = Path(src)
-    filtered = filter(Path.is_file, src.rglob('*')) \
-        if src.is_dir() else [src]
+    filtered = (_entry.path for _entry in scandir_walk(src)
+                if _entry.is_file()) if cached_isdir(src) else [src]
     files = set(map(lambda p: find_extension(p), filtered))
     yield from (_ for _ in files)
 
@@ -251,22 +467,24 @@ def SuffixGen(src: Union[Text, PathLike]) -> Generator:
     Returns: Generator[str]
         Yields BIDS ``suffix`` strings of files in directory ``src``.
     """
-    src = Path(src)
-    filtered = filter(Path.is_file, src.rglob('*')) \
-        if src.is_dir() else [src]
+    filtered = (_entry.path for _entry in scandir_walk(src)
+                if _entry.is_file()) if cached_isdir(src) else [src]
     files = set(map(lambda p: find_bids_suffix(p), filtered))
     yield from (_ for _ in files)
 
 
 __methods__: Tuple = (
-    find_datatype, find_entity, find_extension,
+    split_components, parse_many, find_datatype, find_entity, find_extension,
     find_bids_suffix, EntityGen, EntityStringGen,
-    ComponentsGen, ExtensionGen, SuffixGen
+    ComponentsGen, relative_parts, pure_isfile, pure_isdir,
+    ExtensionGen, SuffixGen
 )
 
 __all__: List = [
+    "ParsedComponents", "PARSED_COLUMNS", "split_components", "parse_many",
     "find_datatype", "find_entity", "find_extension",
     "find_bids_suffix", "EntityGen", "EntityStringGen", "ComponentsGen",
+    "relative_parts", "pure_isfile", "pure_isdir",
     "ExtensionGen", "SuffixGen",
     "__methods__"
 ]
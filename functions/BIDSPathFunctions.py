@@ -15,10 +15,9 @@ import json
 import os
 import warnings
 from datetime import datetime as dt
-from glob import iglob
-from more_itertools import flatten
+from functools import partial
 from os import PathLike
-from os.path import basename, exists, getctime
+from os.path import basename
 from pathlib import Path
 from typing import (
     Dict, Generator, Iterable, Iterator,
@@ -38,16 +37,22 @@ from ..constants.DataModality import DataModalities, DataModality
 from .BIDSPathCoreFunctions import (
     find_datatype, ComponentsGen, EntityGen, EntityStringGen
 )
-from ..general_methods import flatten, root_path, _add_root
+from ..general_methods import (
+    cached_exists, cached_getctime, root_path, scandir_walk,
+    GitIgnoreMatcher, _add_root
+)
 
 
-def RelativeToRoot(src: Union[Text, PathLike]) -> Union[Text, PathLike]:
+def RelativeToRoot(src: Union[Text, PathLike],
+                   root: Optional[Union[Text, PathLike]] = None
+                   ) -> Union[Text, PathLike]:
     """
     Returns ``self`` to be relative to the dataset's root.
 
     Allows ``BIDSValidator`` to perform its tasks.
+    If ``root`` is provided, see ``BIDSRoot``.
     """
-    return _add_root(Path(str(src)).relative_to(BIDSRoot(src)))
+    return _add_root(Path(str(src)).relative_to(BIDSRoot(src, root=root)))
 
 
 def Validate(src: Union[Text, PathLike]) -> bool:
@@ -68,45 +73,58 @@ def Validate(src: Union[Text, PathLike]) -> bool:
     return BIDSValidator().is_bids(str(_src))
 
 
-def SubDir(src: Union[Text, PathLike]
+def SubDir(src: Union[Text, PathLike],
+           root: Optional[Union[Text, PathLike]] = None
            ) -> Union[Text, PathLike]:
     """
     Returns the subject-level directory path of ``src``, if any.
 
     If ``src`` points to either a modality agnostic file or to
     a dataset's top-level directory, returns an empty string ``''``.
+    If ``root`` (the dataset's top-level directory) is provided,
+    the hierarchy is inferred from path segments only.
     """
     try:
-        return src if IsSubjectDir(src) else\
-            next(filter(IsSubjectDir, Path(str(src)).parents))
+        return src if IsSubjectDir(src, root=root) else \
+            next(filter(partial(IsSubjectDir, root=root),
+                        Path(str(src)).parents))
     except StopIteration:
         return ''
 
 
-def SesDir(src: Union[Text, PathLike]) -> Union[Text, PathLike]:
+def SesDir(src: Union[Text, PathLike],
+           root: Optional[Union[Text, PathLike]] = None
+           ) -> Union[Text, PathLike]:
     """
     Returns the session-level directory path of ``src``, if any.
 
     If ``src`` points to either a modality agnostic file,
     to a dataset's top-level directory or to a subject-level directory,
     returns an empty string ``''``.
+    If ``root`` (the dataset's top-level directory) is provided,
+    the hierarchy is inferred from path segments only.
     """
     try:
-        return src if IsSessionDir(src) else \
-            next(filter(IsSessionDir, Path(str(src)).parents))
+        return src if IsSessionDir(src, root=root) else \
+            next(filter(partial(IsSessionDir, root=root),
+                        Path(str(src)).parents))
     except StopIteration:
         return ''
 
 
-def BIDSRoot(src: Union[Text, PathLike]) -> PathLike:
+def BIDSRoot(src: Union[Text, PathLike],
+             root: Optional[Union[Text, PathLike]] = None) -> PathLike:
     """
     Returns a BIDS dataset's top-level directory.
 
     If the current dataset is in the derivatives sub dataset,
     returns the top directory of this sub dataset.
+    If ``root`` (the topmost directory) is provided, returns either
+    ``root`` or the nearest 'derivatives/<pipeline>' directory
+    containing ``src``, without accessing the file system.
     """
-    return src if IsBIDSRoot(src) else \
-        next(filter(IsBIDSRoot, Path(str(src)).parents))
+    return src if IsBIDSRoot(src, root=root) else \
+        next(filter(partial(IsBIDSRoot, root=root), Path(str(src)).parents))
 
 
 def DatasetRoot(src: Union[Text, PathLike]) -> Union[Text, PathLike]:
@@ -131,7 +149,7 @@ def DerivativesRoot(src: Union[Text, PathLike]
 
     """
     _d_dir = os.path.join(DatasetRoot(str(src)), 'derivatives')
-    return Path(_d_dir) if exists(_d_dir) else ''
+    return Path(_d_dir) if cached_exists(_d_dir) else ''
 
 
 def DatasetName(src: Union[Text, PathLike]) -> Text:
@@ -190,7 +208,7 @@ def FormattedCtime(src: Union[Text, PathLike],
             Formatting string passed to the
             ``time.strftime`` function.
     """
-    file_time = dt.fromtimestamp(getctime(src))
+    file_time = dt.fromtimestamp(cached_getctime(src))
     return file_time.strftime(time_fmt)
 
 
@@ -220,32 +238,74 @@ def GetComponents(src: Union[Text, PathLike]) -> Tuple:
 
 
 def PathsByPatterns(src: Union[Text, PathLike],
-                    patterns: Iterable[Text],
-                    ) -> Iterator:
+                    patterns: Union[Iterable[Text], GitIgnoreMatcher],
+                    **kwargs) -> Iterator:
     """
     Returns an iterator of paths matching the provided patterns.
 
-    Patterns should match the '.gitignore' syntax.
+    Patterns should match the '.gitignore' syntax and are compiled
+    into a single matcher. The directory tree below ``src`` is walked
+    once, and matched directories are yielded without their contents.
+
+    Args:
+        src: str or PathLike
+            Directory the patterns are relative to.
+
+        patterns: Iterable[str] or GitIgnoreMatcher
+            Pattern lines or their compiled matcher.
+
+        kwargs: Dict
+            Passed to ``scandir_walk`` (e.g. ``workers``, ``sort``).
+    """
+    _type, top = type(src), os.fspath(src).rstrip(os.sep) or os.sep
+    matcher = patterns if isinstance(patterns, GitIgnoreMatcher) \
+        else GitIgnoreMatcher(patterns)
+    if not matcher:
+        return
+    _start = len(top) + (not top.endswith(os.sep))
+    _matched = lambda _e: matcher(_e.path[_start:],
+                                  is_dir=_e.is_dir(follow_symlinks=False))
+    yield from (_type(_e.path) for _e in scandir_walk(
+        top, descend=lambda _e: not _matched(_e), **kwargs) if _matched(_e))
+
+
+def BidsignoreMatcher(src: Union[Text, PathLike]) -> GitIgnoreMatcher:
     """
-    _type, _pathlist = type(src), []
-    patterns = [patterns] if isinstance(patterns, str) else patterns
-    _paths = flatten(iglob(os.path.join(src, _pat), recursive=True)
-                     for _pat in patterns)
-    tuple(map(_pathlist.extend, _paths))
-    yield from (_type(_p) for _p in _pathlist)
+    Returns the compiled patterns of the dataset's '.bidsignore' file.
+
+    The matcher answers whether a path relative to the
+    dataset's topmost-level directory is ignored.
+    """
+    return GitIgnoreMatcher.from_file(
+        os.path.join(DatasetRoot(src), '.bidsignore'))
+
+
+def GitAttributesMatcher(src: Union[Text, PathLike]) -> GitIgnoreMatcher:
+    """
+    Returns the compiled patterns of the dataset's '.gitattributes' file.
+
+    Attributes are discarded: the matcher answers whether a path
+    relative to the dataset's topmost-level directory has any.
+    """
+    try:
+        _lines = Path(DatasetRoot(src), '.gitattributes').read_text()
+    except FileNotFoundError:
+        return GitIgnoreMatcher()
+    return GitIgnoreMatcher(_line.split()[0]
+                            for _line in _lines.splitlines()
+                            if _line.strip() and not _line.startswith('#'))
 
 
 def GetGitAttributes(src: Union[Text, PathLike]) -> Generator:
     """
-    Yields paths matching patterns defined in the '.bidsignore' file.
+    Yields paths matching patterns defined in the '.gitattributes' file.
 
     """
     try:
         assert src
         _ds_root = DatasetRoot(src)
-        _ignore_path = os.path.join(_ds_root, '.gitattributes')
-        _lines = Path(_ignore_path).read_text().splitlines()
-        yield from PathsByPatterns(_ds_root, _lines)
+        yield from PathsByPatterns(_ds_root, GitAttributesMatcher(_ds_root),
+                                   sort=True)
     except AssertionError:
         pass
     except FileNotFoundError:
@@ -260,9 +320,8 @@ def GetBidsignore(src: Union[Text, PathLike]) -> Generator:
     try:
         assert src
         _ds_root = DatasetRoot(src)
-        _ignore_path = os.path.join(_ds_root, '.bidsignore')
-        _lines = Path(_ignore_path).read_text().splitlines()
-        yield from PathsByPatterns(_ds_root, _lines)
+        yield from PathsByPatterns(_ds_root, BidsignoreMatcher(_ds_root),
+                                   sort=True)
     except AssertionError:
         pass
     except FileNotFoundError:
@@ -283,10 +342,14 @@ def GetDerivativesNames(src: Union[Text, PathLike],
             Paths of files and directories to ignore
             (as defined in '.bidsignore').
     """
-    _ignore = set(ignore) if ignore else GetBidsignore(src)
     _d_root = Path(DerivativesRoot(src))
-    _d_paths = set(_d_root.iterdir()).difference(_ignore)
-    return tuple(map(lambda p: p.name, _d_paths))
+    if ignore:
+        _ignore = {ignore} if isinstance(ignore, str) else set(ignore)
+        _d_paths = set(_d_root.iterdir()).difference(map(Path, _ignore))
+        return tuple(map(lambda p: p.name, _d_paths))
+    matcher, _ds_root = BidsignoreMatcher(src), DatasetRoot(src)
+    return tuple(_p.name for _p in _d_root.iterdir()
+                 if not matcher(_p.relative_to(_ds_root), is_dir=_p.is_dir()))
 
 
 
@@ -296,7 +359,8 @@ __methods__: Tuple = (
     DerivativesRoot, DatasetName, DatasetDescription,
     DatatypeModality, FormattedCtime, GetComponents,
     GetEntities, GetEntityStrings, PathsByPatterns,
-    GetBidsignore, GetDerivativesNames
+    BidsignoreMatcher, GitAttributesMatcher,
+    GetBidsignore, GetGitAttributes, GetDerivativesNames
 )
 __all__: List = (
     "RelativeToRoot",
@@ -304,6 +368,7 @@ __all__: List = (
     "DerivativesRoot", "DatasetName", "DatasetDescription",
     "DatatypeModality", "FormattedCtime", "GetComponents",
     "GetEntities", "GetEntityStrings", "PathsByPatterns",
-    "GetBidsignore", "GetDerivativesNames",
+    "BidsignoreMatcher", "GitAttributesMatcher",
+    "GetBidsignore", "GetGitAttributes", "GetDerivativesNames",
     "__methods__"
 )
@@ -24,20 +24,24 @@ __all__ = [
     "bids_path_functions", "file_functions", "general_methods",
     "dir_id_functions", "file_id_functions", "general_methods",
     # BIDSPathCoreFunctions
+    "ParsedComponents", "PARSED_COLUMNS", "split_components", "parse_many",
     "find_datatype", "find_entity", "find_extension", "find_bids_suffix",
     "EntityGen", "EntityStringGen", "ComponentsGen", "ExtensionGen", "SuffixGen",
+    "relative_parts", "pure_isfile", "pure_isdir",
     # BIDSPathFunctions
     "RelativeToRoot",
     "Validate", "SubDir", "SesDir", "BIDSRoot", "DatasetRoot",
     "DerivativesRoot", "DatasetName", "DatasetDescription",
     "DatatypeModality", "FormattedCtime", "GetComponents",
     "GetEntities", "GetEntityStrings", "PathsByPatterns",
-    "GetBidsignore", "GetDerivativesNames",
+    "BidsignoreMatcher", "GitAttributesMatcher",
+    "GetBidsignore", "GetGitAttributes", "GetDerivativesNames",
     # BIDSFileFunctions
-    "ShapeLength", "GetSidecar", "GetFMRI", "GetEvents", "GetBeh",
+    "ShapeLength", "SidecarChain", "GetSidecar", "GetFMRI", "GetEvents", "GetBeh",
     "GetBrainMask", "GetAnat", "GetFrameTimes", "GetImgHeader", "GetNiftiImage", "GetTR",
     # BIDSFileID
     "IsNifti", "Is4D", "Is3D", "IsEvent", "IsBeh", "IsPhysio", "IsSidecar",
+    "FileClassName",
     # BIDSDirID
     "IsBIDSRoot", "IsDatasetRoot", "IsSubjectDir", "IsSessionDir",
     "IsDatatypeDir", "IsDerivatives", "IsDerivativesRoot", "IsFMRIPrepDerivatives",
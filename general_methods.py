@@ -3,20 +3,61 @@
 General purpose methods that can work independently of ``bidspathlib``.
 
 """
+import asyncio
+import errno
 import hashlib
 import inspect
 import os
 import re
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import (
+    CancelledError, Executor, FIRST_COMPLETED, ThreadPoolExecutor, wait
+)
+from collections import deque, namedtuple
+from functools import lru_cache, partial
 from gzip import decompress
+from itertools import islice
 from os import PathLike
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
 from typing import (
-    Any, Dict, Iterable, List, MutableMapping,
-    NoReturn, Optional, Text, Tuple, Union
+    Any, AsyncGenerator, Callable, Dict, Generator, Iterable, List, MutableMapping,
+    NoReturn, Optional, Pattern, Text, Tuple, Union
 )
 
 __path__ = [os.path.join('..', '__init__.py')]
 
+# Default number of threads listing directories in ``scandir_walk``
+SCANDIR_WORKERS: int = min(32, (os.cpu_count() or 1) + 4)
+
+# Items produced ahead of the consumer of ``aiter_thread``
+AITER_MAXSIZE: int = 256
+
+# Seconds during which cached file system metadata is trusted
+STAT_CACHE_TTL: float = 5.0
+
+# Values read from a NIfTI-1 or NIfTI-2 file header
+NiftiHeader = namedtuple('NiftiHeader', ('version', 'ndim', 'shape', 'pixdim',
+                                         'tr', 'units', 'datatype'))
+
+# NIfTI data type codes
+_NIFTI_DTYPES: Dict = {
+    2: 'uint8', 4: 'int16', 8: 'int32', 16: 'float32', 32: 'complex64',
+    64: 'float64', 128: 'RGB24', 256: 'int8', 512: 'uint16',
+    768: 'uint32', 1024: 'int64', 1280: 'uint64', 1536: 'float128',
+    1792: 'complex128', 2048: 'complex256', 2304: 'RGBA32'
+}
+
+# NIfTI 'xyzt_units' codes (spatial, temporal)
+_NIFTI_UNITS: Dict = {
+    0: 'unknown', 1: 'meter', 2: 'mm', 3: 'micron', 8: 'sec',
+    16: 'msec', 24: 'usec', 32: 'hz', 40: 'ppm', 48: 'rads'
+}
+_TO_SECONDS: Dict = {'sec': 1.0, 'msec': 1e-3, 'usec': 1e-6}
+
 
 # def dotted(inpt: MutableMapping, *args, **kwargs) -> Bunch:
 #     """
@@ -63,6 +104,744 @@ def is_hidden(src: Union[Text, os.PathLike]) -> bool:
     return os.path.basename(src).startswith('.')
 
 
+def _translate_segment(segment: Text) -> Text:
+    """
+    Translates a single glob path segment into a regular expression.
+
+    """
+    i, n, regex = 0, len(segment), []
+    while i < n:
+        char = segment[i]
+        i += 1
+        if char == '*':
+            while i < n and segment[i] == '*':
+                i += 1
+            regex.append('[^/]*')
+        elif char == '?':
+            regex.append('[^/]')
+        elif char == '[':
+            # As in ``fnmatch``, a leading ']' (after '!') is a member
+            j = i + (segment[i:i + 1] == '!')
+            j = segment.find(']', j + (segment[j:j + 1] == ']'))
+            if j == -1:
+                regex.append(re.escape(char))
+                continue
+            _class = segment[i:j].replace('\\', '\\\\')
+            if _class.startswith('!'):
+                _class = '^' + _class[1:]
+            elif _class.startswith('^'):
+                _class = '\\' + _class
+            regex.append(f'[{_class}]')
+            i = j + 1
+        else:
+            regex.append(re.escape(char))
+    return ''.join(regex)
+
+
+def glob_to_regex(pattern: Text) -> Pattern:
+    """
+    Compiles a glob ``pattern`` into a regular expression.
+
+    The expression is meant to be matched (``fullmatch``) against
+    '/'-separated relative paths.
+    Wildcards '*', '?' and '[...]' never match the separator, while
+    a '**' path segment matches any number of directories, none included.
+
+    Args:
+        pattern: str
+            Glob pattern (e.g. 'sub-*/**/*_bold.nii.gz').
+
+    Returns: Pattern
+    """
+    segments = pattern.replace(os.sep, '/').strip('/').split('/')
+    regex = []
+    for index, segment in enumerate(segments, start=1):
+        if segment == '**':
+            regex.append('.*' if index == len(segments) else '(?:.*/)?')
+        else:
+            regex.append(_translate_segment(segment))
+            regex.append('' if index == len(segments) else '/')
+    return re.compile(''.join(regex), flags=re.DOTALL)
+
+
+def _gitignore_rule(line: Text) -> Optional[Tuple]:
+    """
+    Returns the regular expression and negation flag of a pattern line.
+
+    Returns None for blank lines and comments.
+    """
+    line = re.sub(r'(?<!\\) +$', '', line.rstrip('\r\n'))
+    if not line or line.startswith('#'):
+        return None
+    negated = line.startswith('!')
+    line = line[1:] if negated or line.startswith(('\\!', '\\#')) else line
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # Patterns without an inner separator match at any depth
+    prefix = '' if '/' in line else '(?:.*/)?'
+    # Directory contents are matched along with the directory
+    suffix = '/.*' if dir_only else '(?:/.*)?'
+    return prefix + glob_to_regex(line).pattern + suffix, negated
+
+
+class GitIgnoreMatcher:
+    """
+    Patterns of a '.gitignore'-style file compiled into one expression.
+
+    Follows the '.gitignore' syntax: blank lines and '#' comments are
+    skipped, '!' negates a pattern, a trailing '/' only matches
+    directories and patterns without an inner '/' match at any depth.
+    Paths below a matched directory are matched as well.
+    The last matching pattern wins.
+
+    All patterns are alternatives of a single regular expression,
+    so a path is tested in one pass instead of one pass per pattern.
+
+    Args:
+        lines: Iterable[str]
+            Lines of the file (e.g. '.bidsignore', '.gitattributes').
+
+    Example:
+        >>> matcher = GitIgnoreMatcher(['**/*_physio.tsv.gz', 'extra/'])
+        >>> matcher('sub-01/func/sub-01_task-rest_physio.tsv.gz')
+        True
+        >>> matcher('extra', is_dir=True), matcher('extra')
+        (True, False)
+    """
+    __slots__ = ('patterns', '_regex', '_negated')
+
+    def __init__(self, lines: Iterable[Text] = ()):
+        lines = (lines,) if isinstance(lines, str) else tuple(lines)
+        rules = tuple(filter(None, map(_gitignore_rule, lines)))
+        self.patterns = tuple(_line for _line in lines
+                              if _gitignore_rule(_line) is not None)
+        # Alternatives are tried in order: the last pattern comes first
+        self._negated = tuple(_negated for _, _negated in reversed(rules))
+        self._regex = re.compile('|'.join(f'({_regex})' for _regex, _
+                                          in reversed(rules)),
+                                 flags=re.DOTALL) if rules else None
+
+    @classmethod
+    def from_file(cls, src: Union[Text, PathLike]):
+        """
+        Returns the matcher of file ``src`` (empty if it does not exist).
+
+        """
+        try:
+            with open(src, mode='r') as file:
+                return cls(file.read().splitlines())
+        except FileNotFoundError:
+            return cls()
+
+    def __bool__(self) -> bool:
+        return self._regex is not None
+
+    def __repr__(self) -> Text:
+        return f"{type(self).__name__}({list(self.patterns)})"
+
+    def __call__(self, rel_path: Union[Text, PathLike],
+                 is_dir: bool = False) -> bool:
+        return self.match(rel_path, is_dir=is_dir)
+
+    def match(self, rel_path: Union[Text, PathLike],
+              is_dir: bool = False) -> bool:
+        """
+        Returns True if ``rel_path`` is matched by the patterns.
+
+        Args:
+            rel_path: str or PathLike
+                Path relative to the directory of the patterns' file.
+
+            is_dir: bool (Default = False)
+                Whether ``rel_path`` is a directory.
+        """
+        if self._regex is None:
+            return False
+        rel_path = os.fspath(rel_path).replace(os.sep, '/').strip('/')
+        matched = self._regex.fullmatch(rel_path + '/' if is_dir
+                                        else rel_path)
+        return matched is not None and not self._negated[matched.lastindex - 1]
+
+
+class StatCache:
+    """
+    File system metadata cache with a time-to-live.
+
+    Answers ``stat``, ``exists``, ``isfile``, ``isdir`` and ``getctime``
+    queries with at most one system call per path every ``ttl`` seconds.
+    Missing paths are cached as well.
+    Entries listed by ``scandir_walk`` are fed to the cache in use,
+    their file types coming at no additional cost.
+
+    Caching is opt-in: the cache in use is set with ``set_stat_cache``
+    and any object implementing the same methods can be plugged in.
+    ``DatasetWatcher`` objects invalidate the paths they see change;
+    without one, changes made by other processes are only seen
+    once entries expire. Entries are guarded by a lock, as
+    ``scandir_walk`` feeds the cache from worker threads.
+
+    Args:
+        ttl: float (Default = STAT_CACHE_TTL)
+            Seconds during which a cached entry is valid.
+
+        maxsize: int (Default = 2 ** 20)
+            Maximum number of cached paths.
+            The oldest entries are dropped first.
+
+    Example:
+        >>> previous = set_stat_cache(StatCache(ttl=60))
+    """
+    __slots__ = ('ttl', 'maxsize', '_entries', '_lock')
+
+    def __init__(self, ttl: float = STAT_CACHE_TTL, maxsize: int = 2 ** 20):
+        self.ttl, self.maxsize, self._entries = ttl, maxsize, {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, src: Union[Text, PathLike]) -> Tuple:
+        """
+        Returns the normalized path of ``src`` and its valid entry.
+
+        Entries are lists of [expiry time, is_dir, is_file, stat, lstat],
+        where None is unknown and False is a missing path's ``stat``.
+        """
+        key = os.path.normpath(os.fspath(src))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                self._entries.pop(key, None)
+                if len(self._entries) >= self.maxsize:
+                    self._entries.pop(next(iter(self._entries), None), None)
+                entry = self._entries[key] = [now + self.ttl] + [None] * 4
+        return key, entry
+
+    def stat(self, src: Union[Text, PathLike],
+             follow_symlinks: bool = True) -> os.stat_result:
+        """
+        Returns the cached ``os.stat`` (or ``os.lstat``) result of ``src``.
+
+        Raises:
+            FileNotFoundError: if ``src`` does not exist.
+        """
+        key, entry = self._entry(src)
+        slot = 3 if follow_symlinks else 4
+        result = entry[slot]
+        if result is None:
+            try:
+                result = os.stat(key, follow_symlinks=follow_symlinks)
+            except (FileNotFoundError, NotADirectoryError):
+                result = False
+            entry[slot] = result
+            if follow_symlinks:
+                entry[1], entry[2] = (S_ISDIR(result.st_mode),
+                                      S_ISREG(result.st_mode)) \
+                    if result else (False, False)
+        if result is False:
+            raise FileNotFoundError(errno.ENOENT,
+                                    os.strerror(errno.ENOENT), key)
+        return result
+
+    def _type(self, src: Union[Text, PathLike], slot: int) -> bool:
+        known = self._entry(src)[1][slot]
+        if known is not None:
+            return known
+        try:
+            mode = self.stat(src).st_mode
+        except (OSError, ValueError):
+            return False
+        return S_ISDIR(mode) if slot == 1 else S_ISREG(mode)
+
+    def isdir(self, src: Union[Text, PathLike]) -> bool:
+        """
+        Returns True if ``src`` refers to an existing directory.
+
+        """
+        return self._type(src, 1)
+
+    def isfile(self, src: Union[Text, PathLike]) -> bool:
+        """
+        Returns True if ``src`` refers to an existing regular file.
+
+        """
+        return self._type(src, 2)
+
+    def exists(self, src: Union[Text, PathLike]) -> bool:
+        """
+        Returns True if ``src`` refers to an existing path.
+
+        """
+        entry = self._entry(src)[1]
+        if entry[1] or entry[2]:
+            return True
+        try:
+            self.stat(src)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def getctime(self, src: Union[Text, PathLike]) -> float:
+        """
+        Returns the metadata change time of ``src``.
+
+        """
+        return self.stat(src).st_ctime
+
+    def feed(self, entry: os.DirEntry, stat: bool = False) -> None:
+        """
+        Caches what ``os.DirEntry`` object ``entry`` already knows.
+
+        Args:
+            entry: os.DirEntry
+                Entry yielded by ``os.scandir``.
+
+            stat: bool (Default = False)
+                Whether ``entry.stat()`` was already called.
+        """
+        try:
+            is_dir, is_file = entry.is_dir(), entry.is_file()
+            _stat = entry.stat() if stat else None
+        except OSError:
+            return
+        _entry = self._entry(entry.path)[1]
+        _entry[1], _entry[2] = is_dir, is_file
+        if _stat is not None:
+            _entry[3] = _stat
+
+    def invalidate(self, *paths: Union[Text, PathLike],
+                   recursive: bool = False) -> None:
+        """
+        Drops the entries of ``paths`` (all entries by default).
+
+        Args:
+            paths: str or PathLike
+                Paths whose metadata changed.
+
+            recursive: bool (Default = False)
+                Also drop the entries of the paths below ``paths``.
+        """
+        if not paths:
+            self.clear()
+            return
+        keys = tuple(os.path.normpath(os.fspath(_p)) for _p in paths)
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+            if recursive:
+                prefixes = tuple(os.path.join(key, '') for key in keys)
+                for key in tuple(self._entries):
+                    if key.startswith(prefixes):
+                        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drops all entries.
+
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# File system metadata is not cached unless set with ``set_stat_cache``
+_STAT_CACHE: Optional[StatCache] = None
+
+
+def get_stat_cache() -> Optional[StatCache]:
+    """
+    Returns the file system metadata cache in use, if any.
+
+    """
+    return _STAT_CACHE
+
+
+def set_stat_cache(cache: Optional[StatCache]) -> Optional[StatCache]:
+    """
+    Sets the file system metadata cache used package-wide.
+
+    Args:
+        cache: StatCache, optional
+            Any object implementing the ``StatCache`` methods.
+            None disables caching.
+
+    Returns: the previous cache.
+    """
+    global _STAT_CACHE
+    previous, _STAT_CACHE = _STAT_CACHE, cache
+    return previous
+
+
+def cached_stat(src: Union[Text, PathLike],
+                follow_symlinks: bool = True) -> os.stat_result:
+    """
+    ``os.stat`` answered from the metadata cache in use.
+
+    """
+    if _STAT_CACHE is None:
+        return os.stat(src, follow_symlinks=follow_symlinks)
+    return _STAT_CACHE.stat(src, follow_symlinks=follow_symlinks)
+
+
+def cached_isdir(src: Union[Text, PathLike]) -> bool:
+    """
+    ``os.path.isdir`` answered from the metadata cache in use.
+
+    """
+    return os.path.isdir(src) if _STAT_CACHE is None \
+        else _STAT_CACHE.isdir(src)
+
+
+def cached_isfile(src: Union[Text, PathLike]) -> bool:
+    """
+    ``os.path.isfile`` answered from the metadata cache in use.
+
+    """
+    return os.path.isfile(src) if _STAT_CACHE is None \
+        else _STAT_CACHE.isfile(src)
+
+
+def cached_exists(src: Union[Text, PathLike]) -> bool:
+    """
+    ``os.path.exists`` answered from the metadata cache in use.
+
+    """
+    return os.path.exists(src) if _STAT_CACHE is None \
+        else _STAT_CACHE.exists(src)
+
+
+def cached_getctime(src: Union[Text, PathLike]) -> float:
+    """
+    ``os.path.getctime`` answered from the metadata cache in use.
+
+    """
+    return os.path.getctime(src) if _STAT_CACHE is None \
+        else _STAT_CACHE.getctime(src)
+
+
+def _list_dir(path: Text, stat: bool = False) -> List:
+    """
+    Returns the entries of directory ``path``, or an empty list.
+
+    Entry types (and ``stat`` results if ``stat`` is True) are fetched
+    here, so file systems without ``d_type`` support are queried
+    by the calling thread. Entries are fed to the metadata cache.
+    """
+    try:
+        with os.scandir(path) as entries:
+            entries = list(entries)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return []
+    cache = _STAT_CACHE
+    for entry in entries:
+        try:
+            entry.is_dir(), entry.is_symlink()
+            if stat:
+                entry.stat()
+        except OSError:
+            pass
+        if cache is not None:
+            cache.feed(entry, stat=stat)
+    return entries
+
+
+# Thread pools of ``scandir_walk``, shared across calls, keyed by size
+_WALK_POOLS: Dict = {}
+_WALK_POOLS_LOCK: threading.Lock = threading.Lock()
+
+
+def _reset_walk_pools() -> None:
+    """
+    Forgets the pools inherited by a forked child, whose threads are gone.
+
+    """
+    global _WALK_POOLS_LOCK
+    _WALK_POOLS.clear()
+    _WALK_POOLS_LOCK = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_walk_pools)
+
+
+def _walk_pool(workers: int) -> ThreadPoolExecutor:
+    """
+    Returns the shared pool of ``workers`` threads.
+
+    Used by ``scandir_walk`` and ``threaded_map``, whose tasks
+    never wait on other tasks of the pool.
+    """
+    with _WALK_POOLS_LOCK:
+        executor = _WALK_POOLS.get(workers)
+        if executor is None:
+            executor = _WALK_POOLS[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='scandir_walk')
+        return executor
+
+
+def scandir_walk(top: Union[Text, PathLike],
+                 workers: Optional[int] = None,
+                 sort: bool = False,
+                 max_depth: Optional[int] = None,
+                 descend: Optional[Callable] = None,
+                 stat: bool = False) -> Generator:
+    """
+    Yields an ``os.DirEntry`` for every path below directory ``top``.
+
+    Directories are listed by a bounded pool of threads, one
+    ``os.scandir`` task per directory, so that the round trips of
+    network file systems (e.g. NFS, Lustre) overlap.
+    Pools are shared by calls with the same number of workers.
+    Symbolic links to directories are followed, like ``glob.iglob``,
+    unless they point to one of their ancestors (i.e. a cycle),
+    as identified by device and inode numbers.
+
+    Args:
+        top: str or PathLike
+            Directory where the walk starts.
+
+        workers: int, optional
+            Number of threads. Defaults to ``SCANDIR_WORKERS``.
+
+        sort: bool (Default = False)
+            Yield entries in depth-first order, sorted by name within
+            each directory. Otherwise, entries are yielded as soon as
+            their directory is listed, in no particular order.
+
+        max_depth: int, optional
+            Number of directory levels listed (1 lists ``top`` only).
+            Unlimited by default.
+
+        descend: Callable, optional
+            Called with each directory entry, returns whether
+            to list it. All directories are listed by default.
+
+        stat: bool (Default = False)
+            Fetch each entry's ``stat`` result in the pool,
+            so that ``DirEntry.stat`` does not block afterwards.
+
+    Returns: Generator[os.DirEntry]
+    """
+    executor = _walk_pool(workers or SCANDIR_WORKERS)
+    depths: Dict = {}
+    keys: Dict = {}
+
+    def _key(path: Text) -> Optional[Tuple]:
+        if path not in keys:
+            try:
+                _stat = os.stat(path)
+                keys[path] = (_stat.st_dev, _stat.st_ino)
+            except OSError:
+                keys[path] = None
+        return keys[path]
+
+    def _cycles(entry: os.DirEntry) -> bool:
+        # Only symbolic links can lead back to an ancestor
+        key, path = _key(entry.path), entry.path
+        while key is not None and os.path.dirname(path) != path:
+            path = os.path.dirname(path)
+            if _key(path) == key:
+                return True
+        return key is None
+
+    def _submit(path: Text, depth: int):
+        future = executor.submit(_list_dir, path, stat)
+        depths[future] = depth
+        return future
+
+    def _subdirs(entries: List, depth: int) -> Tuple:
+        if max_depth is not None and depth >= max_depth:
+            return ()
+        return tuple(_e for _e in entries if _e.is_dir()
+                     and not (_e.is_symlink() and _cycles(_e))
+                     and (descend is None or descend(_e)))
+
+    def _sorted(future) -> Generator:
+        depth, entries = depths.pop(future), future.result()
+        entries.sort(key=lambda _e: _e.name)
+        # Subdirectories are all listed ahead of being yielded
+        futures = {_e.name: _submit(_e.path, depth + 1)
+                   for _e in _subdirs(entries, depth)}
+        for entry in entries:
+            yield entry
+            if entry.name in futures:
+                yield from _sorted(futures[entry.name])
+
+    try:
+        first = _submit(os.fspath(top), 1)
+        if sort:
+            yield from _sorted(first)
+            return
+        while depths:
+            done, _ = wait(tuple(depths), return_when=FIRST_COMPLETED)
+            for future in done:
+                depth, entries = depths.pop(future), future.result()
+                for entry in _subdirs(entries, depth):
+                    _submit(entry.path, depth + 1)
+                yield from entries
+    finally:
+        for future in depths:
+            future.cancel()
+
+
+def scandir_glob(top: Union[Text, PathLike], pattern: Text,
+                 recursive: bool = True, **kwargs) -> Generator:
+    """
+    Yields paths below directory ``top`` matching glob ``pattern``.
+
+    Mirrors ``glob.iglob(os.path.join(top, pattern), recursive=recursive)``
+    on top of ``scandir_walk``. Directories are only listed as deep as
+    ``pattern`` can match. Hidden paths are only yielded if ``pattern``
+    explicitly targets them.
+
+    Args:
+        top: str or PathLike
+            Directory where the search starts.
+
+        pattern: str
+            Glob pattern relative to ``top``.
+
+        recursive: bool (Default = True)
+            Whether '**' matches any number of directories.
+
+        kwargs: Dict
+            Passed to ``scandir_walk`` (e.g. ``workers``, ``sort``).
+            A ``descend`` predicate further prunes the directories
+            listed, on top of hidden ones.
+
+    Returns: Generator[str]
+    """
+    descend = kwargs.pop('descend', None)
+    pattern = pattern if recursive else pattern.replace('**', '*')
+    regex = glob_to_regex(pattern)
+    segments = pattern.replace(os.sep, '/').strip('/').split('/')
+    hidden = pattern.startswith('.') or '/.' in pattern
+    top = os.fspath(top).rstrip(os.sep) or os.sep
+    _start = len(top) + (not top.endswith(os.sep))
+    for entry in scandir_walk(
+            top, max_depth=None if '**' in segments else len(segments),
+            descend=descend if hidden else lambda _e: all((
+                not is_hidden(_e.name), descend is None or descend(_e))),
+            **kwargs):
+        if not hidden and is_hidden(entry.name):
+            continue
+        if regex.fullmatch(entry.path[_start:].replace(os.sep, '/')):
+            yield entry.path
+
+
+def threaded_map(func: Callable, iterable: Iterable,
+                 workers: Optional[int] = None,
+                 window: Optional[int] = None) -> Generator:
+    """
+    Yields ``func(item)`` for each item of ``iterable``, in order.
+
+    Calls run on the pool of threads shared with ``scandir_walk``,
+    so that blocking I/O (e.g. file header reads) overlaps. At most ``window`` calls
+    are submitted ahead of the consumer, so ``iterable`` may be
+    a lazy stream of any length.
+
+    Args:
+        func: Callable
+            Function of a single item.
+
+        iterable: Iterable
+            Items passed to ``func``.
+
+        workers: int, optional
+            Number of threads. Defaults to ``SCANDIR_WORKERS``.
+            With a single worker, calls run in the calling thread.
+
+        window: int, optional
+            Maximum number of pending calls.
+            Defaults to four times the number of workers.
+
+    Returns: Generator
+    """
+    workers = workers or SCANDIR_WORKERS
+    items = iter(iterable)
+    if workers == 1:
+        yield from map(func, items)
+        return
+    executor = _walk_pool(workers)
+    pending = deque(executor.submit(func, _item)
+                    for _item in islice(items, window or 4 * workers))
+    try:
+        while pending:
+            result = pending.popleft().result()
+            pending.extend(executor.submit(func, _item)
+                           for _item in islice(items, 1))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def to_thread(func: Callable, *args,
+                    executor: Optional[Executor] = None, **kwargs) -> Any:
+    """
+    Returns ``func(*args, **kwargs)``, computed in ``executor``.
+
+    Uses the running event loop's default executor unless specified.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor,
+                                      partial(func, *args, **kwargs))
+
+
+async def aiter_thread(func: Callable, *args,
+                       executor: Optional[Executor] = None,
+                       maxsize: int = AITER_MAXSIZE,
+                       **kwargs) -> AsyncGenerator:
+    """
+    Asynchronously yields the items of iterable ``func(*args, **kwargs)``.
+
+    The iterable is consumed in ``executor`` (the running event loop's
+    default executor unless specified) and each item is passed to the
+    event loop as soon as it is produced. At most ``maxsize`` items
+    wait for the consumer: the producing thread blocks until there is
+    room, so memory stays bounded on large listings. Exceptions raised
+    while iterating are re-raised in the event loop. Iteration stops
+    at the next item if the async generator is closed early.
+    """
+    loop, queue = asyncio.get_running_loop(), asyncio.Queue(maxsize=maxsize)
+    stopped, end = threading.Event(), object()
+
+    def _put(item: Any, error: Optional[BaseException] = None) -> None:
+        try:
+            asyncio.run_coroutine_threadsafe(
+                queue.put((item, error)), loop).result()
+        except (CancelledError, RuntimeError):  # Event loop closed
+            stopped.set()
+
+    def _produce() -> None:
+        try:
+            for item in func(*args, **kwargs):
+                if stopped.is_set():
+                    return
+                _put(item)
+        except BaseException as error:
+            _put(end, error)
+        else:
+            _put(end)
+
+    loop.run_in_executor(executor, _produce)
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is end:
+                return
+            yield item
+    finally:
+        stopped.set()
+        # Wakes up the producer if it is waiting for room
+        while not queue.empty():
+            queue.get_nowait()
+
+
 def get_default_args(func: callable) -> Dict:
     """
     Return a dict containing the default arguments of ``func``.
@@ -273,15 +1052,116 @@ def GetHashCheckSum(src: Union[Text, PathLike],
     return m.hexdigest()
 
 
+def _read_head(src: Union[Text, PathLike], size: int) -> bytes:
+    """
+    Returns the first ``size`` bytes of a file, decompressed if gzipped.
+
+    Only the compressed blocks holding these bytes are read.
+    """
+    with open(src, mode='rb') as file:
+        head = file.read(2)
+        if head != b'\x1f\x8b':
+            return head + file.read(size - 2)
+        file.seek(0)
+        stream, head = zlib.decompressobj(16 + zlib.MAX_WBITS), b''
+        while len(head) < size and not stream.eof:
+            chunk = file.read(1024)
+            if not chunk:
+                break
+            head += stream.decompress(chunk, size - len(head))
+            while stream.unconsumed_tail and len(head) < size:
+                head += stream.decompress(stream.unconsumed_tail,
+                                          size - len(head))
+        return head
+
+
+@lru_cache(maxsize=4096)
+def _nifti_header(src: Text, mtime_ns: int, size: int) -> NiftiHeader:
+    """
+    Parses the header of NIfTI file ``src`` of a given version.
+
+    Cached by file path, modification time and size.
+    """
+    head = _read_head(src, 540)
+    for order in '<>':
+        sizeof_hdr = struct.unpack_from(order + 'i', head)[0] \
+            if len(head) >= 4 else 0
+        if sizeof_hdr == 348 and len(head) >= 348:
+            version = 1
+            dim = struct.unpack_from(order + '8h', head, 40)
+            datatype = struct.unpack_from(order + 'h', head, 70)[0]
+            pixdim = struct.unpack_from(order + '8f', head, 76)
+            xyzt_units = head[123]
+            break
+        if sizeof_hdr == 540 and len(head) >= 540:
+            version = 2
+            datatype = struct.unpack_from(order + 'h', head, 12)[0]
+            dim = struct.unpack_from(order + '8q', head, 16)
+            pixdim = struct.unpack_from(order + '8d', head, 104)
+            xyzt_units = struct.unpack_from(order + 'i', head, 500)[0]
+            break
+    else:
+        raise ValueError(f'Not a NIfTI-1 or NIfTI-2 file: {src}')
+    ndim = dim[0]
+    if not 0 < ndim < 8:
+        raise ValueError(f'Invalid NIfTI dimensions in: {src}')
+    units = (_NIFTI_UNITS.get(xyzt_units & 0x07, 'unknown'),
+             _NIFTI_UNITS.get(xyzt_units & 0x38, 'unknown'))
+    tr = float(pixdim[4]) * _TO_SECONDS.get(units[1], 1.0) \
+        if ndim > 3 else 0.0
+    return NiftiHeader(version, ndim, tuple(dim[1:ndim + 1]),
+                       tuple(map(float, pixdim[1:ndim + 1])), tr, units,
+                       _NIFTI_DTYPES.get(datatype, str(datatype)))
+
+
+def GetNiftiHeader(src: Union[Text, PathLike]) -> NiftiHeader:
+    """
+    Returns the dimensions, voxel sizes and data type of a NIfTI file.
+
+    Only the 348 (NIfTI-1) or 540 (NIfTI-2) header bytes are read,
+    so 4D images are never loaded nor fully decompressed.
+    Results are cached until the file changes.
+
+    Args:
+        src: Text or PathLike
+            Path of a '.nii' or '.nii.gz' file.
+
+    Returns: NiftiHeader
+        Named tuple of the NIfTI version (1 or 2), number of dimensions,
+        shape, voxel sizes ('pixdim'), repetition time in seconds
+        (0.0 for images with fewer than 4 dimensions), spatial and
+        temporal units, and data type name (e.g. 'int16').
+
+    Raises:
+        FileNotFoundError: if ``src`` does not exist.
+        ValueError: if ``src`` has no valid NIfTI header.
+    """
+    src = os.fspath(src)
+    _stat = cached_stat(src)
+    try:
+        return _nifti_header(src, _stat.st_mtime_ns, _stat.st_size)
+    except (struct.error, zlib.error, EOFError) as error:
+        raise ValueError(f'Invalid NIfTI header in: {src}') from error
+
+
 __methods__: Tuple = (
-    docstring_parameter, GetHashCheckSum, is_hidden, flatten, get_default_args,
+    docstring_parameter, GetHashCheckSum, GetNiftiHeader, is_hidden, glob_to_regex,
+    scandir_walk, scandir_glob, threaded_map, to_thread, aiter_thread, flatten, get_default_args,
+    get_stat_cache, set_stat_cache, cached_stat, cached_isdir,
+    cached_isfile, cached_exists, cached_getctime,
     camel_to_snake, Snake2Camel, SetFromDict,
     _add_root, root_path,
     SubclassesRecursive, rev_dict
 )
 
 __all__: List = [
-    "docstring_parameter", "GetHashCheckSum", "is_hidden", "flatten",
+    "docstring_parameter", "GetHashCheckSum", "GetNiftiHeader", "NiftiHeader",
+    "is_hidden", "glob_to_regex", "GitIgnoreMatcher",
+    "scandir_walk", "scandir_glob", "threaded_map", "SCANDIR_WORKERS",
+    "StatCache", "STAT_CACHE_TTL", "get_stat_cache", "set_stat_cache",
+    "cached_stat", "cached_isdir", "cached_isfile", "cached_exists",
+    "cached_getctime",
+    "to_thread", "aiter_thread", "AITER_MAXSIZE", "flatten",
     "get_default_args", "camel_to_snake", "Snake2Camel",
     "SetFromDict", "SubclassesRecursive", "rev_dict",
     '_add_root', 'root_path',